@@ -0,0 +1,340 @@
+# benchmarks/bench.py
+"""
+Benchmark suite for the generator, converter and viewer hot paths.
+
+Every case runs in a fresh Python process, so peak RSS (ru_maxrss of that
+process, setup included) is measured per case and imports do not leak
+between cases. Inputs are generated locally with DataGenerator. The startup/* cases time
+each CLI's --help and fail when importing the CLI module loads a heavy
+dependency or exceeds STARTUP_BUDGET_MS.
+
+Usage:
+    python benchmarks/bench.py                          # run everything, print a table
+    python benchmarks/bench.py --quick -k convert       # smaller sizes, cases matching 'convert'
+    python benchmarks/bench.py --save baseline.json     # write results as JSON
+    python benchmarks/bench.py --baseline baseline.json --threshold 0.2
+                                                        # exit 1 on a >20% time/RSS regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+GEN_TYPES = ["pk", "fk", "name", "email", "address", "name_pool", "date", "number", "float", "boolean",
+             "choice", "nullable"]
+FAKER_ROWS = 5_000          # per-call Faker types run at a few thousand rows/s
+FORMATS = ["csv", "parquet", "xlsx"]
+SIZES = [10_000, 100_000]
+XLSX_MAX_ROWS = 10_000      # Excel read/write is slow; keep its cases small
+CLI_MODULES = ["fake_data_generator.cli", "file_converter.cli", "visualize_file.cli"]
+STARTUP_BUDGET_MS = 150     # import time of a CLI module; typer itself takes ~60 ms
+HEAVY_MODULES = {"pandas", "pyarrow", "numpy", "faker", "rich", "openpyxl"}    # must load lazily
+
+CASES: Dict[str, Callable[[int, Path], dict]] = {}     # name -> case(size, workdir) -> result
+CASE_SIZES: Dict[str, List[int]] = {}
+
+
+def register(name: str, sizes: List[int]):
+    def decorator(fn):
+        CASES[name] = fn
+        CASE_SIZES[name] = sizes
+        return fn
+    return decorator
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+# ---- generator cases
+
+def _column(col_type: str):
+    from datetime import datetime as dt
+    from fake_data_generator.schema import ColumnConfig
+
+    if col_type == "pk":
+        return ColumnConfig("id", "pk")
+    if col_type == "fk":
+        return ColumnConfig("parent_id", "fk", ref_table="parent", ref_column="id")
+    if col_type == "date":
+        return ColumnConfig("day", "date", date_start=dt(2020, 1, 1), date_end=dt(2024, 12, 31))
+    if col_type == "number":
+        return ColumnConfig("qty", "number", num_min=1, num_max=1000)
+    if col_type == "float":
+        return ColumnConfig("price", "float", float_min=0.0, float_max=999.0)
+    if col_type == "choice":
+        return ColumnConfig("status", "choice", choices=["new", "paid", "shipped", "returned"])
+    if col_type == "nullable":
+        return ColumnConfig("qty", "number", num_min=1, num_max=1000, nullable=True, null_prob=0.2)
+    if col_type == "name_pool":
+        return ColumnConfig("name", "name", pool_size=10_000)
+    return ColumnConfig(col_type, col_type)
+
+
+def _generator(workdir: Path, col_type: str):
+    from fake_data_generator.generator import DataGenerator
+    from fake_data_generator.schema import ColumnConfig, TableConfig
+
+    dg = DataGenerator(str(workdir), seed=42)
+    if col_type == "fk":
+        dg.generate_columns(TableConfig("parent", [ColumnConfig("id", "pk")], 10_000))
+    return dg
+
+
+def bench_generate(col_type: str, engine: str, size: int, workdir: Path) -> dict:
+    """rows/sec for one column type, per-row (generate_table) or columnar (generate_columns)."""
+    from fake_data_generator.schema import TableConfig
+
+    dg = _generator(workdir, col_type)
+    config = TableConfig("bench", [_column(col_type)], size)
+    run = dg.generate_table if engine == "rowwise" else dg.generate_columns
+    return {"rows": size, "seconds": _timed(lambda: run(config))}
+
+
+def bench_gen_value(col_type: str, size: int, workdir: Path) -> dict:
+    """rows/sec through the single-value DataGenerator._gen_value path."""
+    dg = _generator(workdir, col_type)
+    col = _column(col_type)
+    if col_type == "pk":
+        dg.keys.pop("bench", None)
+    return {"rows": size, "seconds": _timed(lambda: [dg._gen_value(col, "bench") for _ in range(size)])}
+
+
+def _orders_config(size: int):
+    from datetime import datetime as dt
+    from fake_data_generator.schema import ColumnConfig, TableConfig
+
+    return TableConfig("orders", [
+        ColumnConfig("order_id", "pk"),
+        ColumnConfig("customer", "name", pool_size=1000),
+        ColumnConfig("quantity", "number", num_min=1, num_max=5),
+        ColumnConfig("price", "float", float_min=1.0, float_max=500.0, nullable=True, null_prob=0.1),
+        ColumnConfig("order_date", "date", date_start=dt(2023, 1, 1), date_end=dt(2023, 12, 31)),
+        ColumnConfig("status", "choice", choices=["new", "paid", "shipped"]),
+    ], size)
+
+
+def bench_write_csv(engine: str, size: int, workdir: Path) -> dict:
+    """write_csv throughput for per-row dicts or a column batch."""
+    from fake_data_generator.generator import DataGenerator
+
+    dg = DataGenerator(str(workdir), seed=42)
+    config = _orders_config(size)
+    data = dg.generate_table(config) if engine == "rowwise" else dg.generate_columns(config)
+    seconds = _timed(lambda: dg.write_csv(config, data))
+    return {"rows": size, "seconds": seconds, "bytes": os.path.getsize(workdir / "orders.csv")}
+
+
+# ---- converter and viewer cases
+
+def _input_file(fmt: str, size: int, workdir: Path) -> Path:
+    """A synthetic orders file of the given format and size, generated by the project."""
+    from fake_data_generator.generator import DataGenerator
+    from file_converter.reader import read_table
+    from file_converter.writer import write_table
+
+    csv_path = workdir / f"orders-{size}.csv"
+    if not csv_path.exists():
+        dg = DataGenerator(str(workdir), seed=42)
+        config = _orders_config(size)
+        dg.write_csv_stream(config, dg.iter_columns(config), str(csv_path))
+    if fmt == "csv":
+        return csv_path
+    path = csv_path.with_suffix(f".{fmt}")
+    if not path.exists():
+        write_table(path, read_table(csv_path))
+    return path
+
+
+def bench_convert(src: str, dst: str, engine: str, size: int, workdir: Path) -> dict:
+    """file_converter read + write for one format pair, as convertfile does it."""
+    from file_converter.reader import read_file, read_table
+    from file_converter.writer import write_file, write_table
+
+    source = _input_file(src, size, workdir)
+    target = workdir / f"out-{size}.{dst}"
+    read, write = (read_table, write_table) if engine == "arrow" else (read_file, write_file)
+    seconds = _timed(lambda: write(target, read(source)))
+    return {"rows": size, "seconds": seconds, "bytes": source.stat().st_size}
+
+
+def bench_first_render(fmt: str, size: int, workdir: Path) -> dict:
+    """End-to-end time until 'visualize view' has printed its first page, process start included."""
+    source = _input_file(fmt, size, workdir)
+    command = [sys.executable, "-c", "from visualize_file.cli import app; app()", str(source)]
+    seconds = _timed(lambda: subprocess.run(command, check=True, capture_output=True))
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {"rows": size, "seconds": seconds, "peak_rss_mb": _rss_mb(child_rss)}
+
+
+# ---- startup cases
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module loaded by `import module` (-X importtime)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_startup(module: str, size: int, workdir: Path) -> dict:
+    """
+    `<cli> --help` wall time, process start included. Fails if importing the
+    CLI module loads a heavy dependency or takes longer than STARTUP_BUDGET_MS.
+    """
+    times = _import_times(module)
+    heavy = sorted({name.split(".")[0] for name in times} & HEAVY_MODULES)
+    if heavy:
+        raise RuntimeError(f"importing {module} loads {', '.join(heavy)}")
+    import_ms = times[module] / 1000
+    if import_ms > STARTUP_BUDGET_MS:
+        raise RuntimeError(f"importing {module} takes {import_ms:.0f} ms (budget {STARTUP_BUDGET_MS} ms)")
+    command = [sys.executable, "-c", f"from {module} import app; app()", "--help"]
+    seconds = _timed(lambda: subprocess.run(command, check=True, capture_output=True))
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {"rows": size, "seconds": seconds, "import_ms": import_ms, "peak_rss_mb": _rss_mb(child_rss)}
+
+
+for _type in GEN_TYPES:
+    _faker = _type in ("name", "email", "address", "name_pool")     # per-row paths call Faker
+    _rowwise = [FAKER_ROWS if _faker else 20_000]
+    _columnar = [FAKER_ROWS if _faker and _type != "name_pool" else 200_000]
+    register(f"generate/rowwise/{_type}", _rowwise)(partial(bench_generate, _type, "rowwise"))
+    register(f"generate/columnar/{_type}", _columnar)(partial(bench_generate, _type, "columnar"))
+    register(f"gen_value/{_type}", _rowwise)(partial(bench_gen_value, _type))
+for _engine in ("rowwise", "columnar"):
+    register(f"write_csv/{_engine}", [50_000])(partial(bench_write_csv, _engine))
+for _src in FORMATS:
+    for _dst in FORMATS:
+        if _src != _dst:
+            _sizes = [XLSX_MAX_ROWS] if "xlsx" in (_src, _dst) else SIZES
+            register(f"convert/{_src}->{_dst}", _sizes)(partial(bench_convert, _src, _dst, "pandas"))
+register("convert/csv->parquet/arrow", SIZES)(partial(bench_convert, "csv", "parquet", "arrow"))
+for _fmt in FORMATS:
+    _sizes = [XLSX_MAX_ROWS] if _fmt == "xlsx" else [100_000]
+    register(f"visualize/first_render/{_fmt}", _sizes)(partial(bench_first_render, _fmt))
+for _module in CLI_MODULES:
+    register(f"startup/{_module.split('.')[0]}", [1])(partial(bench_startup, _module))
+
+
+# ---- runner
+
+def _rss_mb(ru_maxrss: int) -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(name: str, size: int, workdir: Path) -> dict:
+    """Run one case in this process (called in the child) and add throughput and RSS."""
+    result = CASES[name](size, workdir)
+    result.setdefault("peak_rss_mb", 0.0)
+    result["peak_rss_mb"] = max(result["peak_rss_mb"],
+                                _rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    result["rows_per_sec"] = result["rows"] / result["seconds"] if result["seconds"] else 0.0
+    if "bytes" in result:
+        result["mb_per_sec"] = result["bytes"] / 1e6 / result["seconds"] if result["seconds"] else 0.0
+    return result
+
+
+def run_isolated(name: str, size: int, workdir: Path) -> dict:
+    command = [sys.executable, __file__, "--run-case", name, "--size", str(size), "--workdir", str(workdir)]
+    proc = subprocess.run(command, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Regressions of seconds or peak RSS beyond threshold (a fraction) against the baseline."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base or "error" in current or "error" in base:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            if base.get(metric) and current[metric] > base[metric] * (1 + threshold):
+                change = (current[metric] / base[metric] - 1) * 100
+                regressions.append(f"{key}: {metric} {base[metric]:.3f} → {current[metric]:.3f} (+{change:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FakeDataForge benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="smallest size of each case only")
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.size, Path(args.workdir))))
+        return 0
+
+    names = [n for n in CASES if args.filter in n]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="fakegen-bench-") as tmp:
+        for name in names:
+            sizes = CASE_SIZES[name][:1] if args.quick else CASE_SIZES[name]
+            for size in sizes:
+                key = f"{name}@{size}"
+                result = run_isolated(name, size, Path(tmp))
+                results[key] = result
+                if "error" in result:
+                    print(f"{key:<45} ERROR {result['error']}")
+                else:
+                    print(f"{key:<45} {result['seconds']:9.3f}s {result['rows_per_sec']:>14,.0f} rows/s "
+                          f"{result['peak_rss_mb']:8.1f} MB")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"✅ Results saved to {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"✅ No regressions above {args.threshold:.0%} against {args.baseline}")
+    return 1 if any("error" in r for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
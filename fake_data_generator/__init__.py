@@ -13,5 +13,11 @@ Modules:
 
 __version__ = "0.1.0"
 
-# Optional: expose the CLI app for setuptools entry point
-from .cli import app
+
+def __getattr__(name):
+    # The CLI app is imported on first access only, so importing the
+    # package (or schema/generator) does not pay for Typer and the CLI
+    if name == "app":
+        from .cli import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
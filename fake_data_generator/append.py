@@ -0,0 +1,173 @@
+# fake_data_generator/append.py
+"""
+Incremental appends to existing output.
+
+To add rows to tables that were generated earlier, only the PK column of
+each existing table is read back, streamed batch by batch:
+- csv (plain, gzip, zstd) and Postgres COPY text files: Arrow's streaming
+  CSV reader, converting just that column
+- parquet datasets: that column of each file listed in the manifest
+- sqlite: one SELECT of that column
+
+Keys go into the table's KeyStore (see keys.py), so new rows continue the
+int keys and draw uuid keys distinct from the existing ones, and child
+tables can reference old and new parent rows alike. The new rows are then
+appended in place: CSV files get more lines (gzip a new member, zstd a
+new frame), SQLite tables more inserts, dataset folders new files added
+to the manifest. Existing rows are never rewritten.
+
+Single Parquet and Feather files cannot be extended without rewriting
+them: write those tables as datasets (split_rows/split_files) to append.
+Excel workbooks cannot be appended to either.
+"""
+
+from __future__ import annotations
+import os
+import sqlite3
+from typing import Iterator, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from .keys import KeyStore, pack_uuids
+from .schema import CSV_COMPRESSION, OutputConfig, TableConfig
+from .sql import quote_ident
+
+READ_BLOCK_SIZE = 16 << 20     # bytes per block of the streaming CSV reader
+
+
+def check_appendable(output: OutputConfig):
+    """Raise ValueError if output in this configuration cannot be appended to."""
+    if output.is_dataset():
+        if output.fmt == "csv" and output.compression in CSV_COMPRESSION:
+            raise ValueError("Dataset output writes uncompressed CSV files: use parquet to compress")
+        return
+    if output.fmt == "xlsx":
+        raise ValueError("An Excel workbook cannot be appended to without rewriting it")
+    if output.fmt in ("parquet", "feather"):
+        raise ValueError(f"A single {output.fmt} file cannot be appended to without rewriting it: "
+                         f"write the tables as datasets (split rows or files) to append")
+    if output.fmt == "pgcopy" and output.copy_format != "text":
+        raise ValueError("Only text COPY files can be appended to")
+
+
+def output_exists(path: str, output: OutputConfig, config: TableConfig) -> bool:
+    """True if a table already has output at path."""
+    if output.is_dataset():
+        from file_converter.dataset import MANIFEST_FILE
+        return os.path.exists(os.path.join(path, MANIFEST_FILE))
+    if output.fmt == "sqlite":
+        if not os.path.exists(path):
+            return False
+        with sqlite3.connect(path) as conn:
+            found = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                 (config.name,)).fetchone()
+        return found is not None
+    return os.path.exists(path)
+
+
+# ---- column readers
+
+def _csv_column(path: str, column: str, arrow_type: pa.DataType, compression: Optional[str] = None,
+                column_names=None, copy_text: bool = False) -> Iterator[pa.Array]:
+    """Stream one column of a CSV (or COPY text) file."""
+    import pyarrow.csv as pacsv
+    read_options = pacsv.ReadOptions(block_size=READ_BLOCK_SIZE, column_names=column_names)
+    parse_options = pacsv.ParseOptions(delimiter="\t", quote_char=False) if copy_text else None
+    convert_options = pacsv.ConvertOptions(include_columns=[column], column_types={column: arrow_type},
+                                           null_values=["\\N"] if copy_text else None)
+    with pa.input_stream(path, compression=compression) as stream:
+        reader = pacsv.open_csv(stream, read_options=read_options, parse_options=parse_options,
+                                convert_options=convert_options)
+        for batch in reader:
+            yield batch.column(0)
+
+
+def _dataset_column(root: str, column: str, arrow_type: pa.DataType) -> Iterator[pa.Array]:
+    """Stream one column of the files listed in a dataset manifest."""
+    from file_converter.dataset import read_manifest
+    manifest = read_manifest(root)
+    for entry in manifest["files"]:
+        path = os.path.join(root, *entry["path"].split("/"))
+        if column in entry.get("partition", {}):
+            # Partitioned by the column itself: the value is in the folder name
+            yield pa.array([entry["partition"][column]] * entry["rows"]).cast(arrow_type)
+        elif manifest["format"] == "parquet":
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(columns=[column]):
+                yield batch.column(0).cast(arrow_type)
+        else:
+            yield from _csv_column(path, column, arrow_type)
+
+
+def _sqlite_column(path: str, table: str, column: str, arrow_type: pa.DataType,
+                   batch_rows: int = 1_000_000) -> Iterator[pa.Array]:
+    """Stream one column of a SQLite table."""
+    with sqlite3.connect(path) as conn:
+        cursor = conn.execute(f"SELECT {quote_ident(column)} FROM {quote_ident(table)}")
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            yield pa.array([r[0] for r in rows], type=arrow_type)
+
+
+def iter_column(path: str, output: OutputConfig, config: TableConfig, column: str,
+                arrow_type: pa.DataType) -> Iterator[pa.Array]:
+    """Stream one column of a table's existing output as Arrow arrays."""
+    if output.is_dataset():
+        return _dataset_column(path, column, arrow_type)
+    if output.fmt == "sqlite":
+        return _sqlite_column(path, config.name, column, arrow_type)
+    if output.fmt == "pgcopy":
+        return _csv_column(path, column, arrow_type, column_names=config.column_names(), copy_text=True)
+    if output.fmt == "csv":
+        compression = output.compression if output.compression in CSV_COMPRESSION else None
+        return _csv_column(path, column, arrow_type, compression)
+    raise ValueError(f"Cannot read back {output.fmt} output")
+
+
+# ---- existing keys
+
+def count_rows(path: str, output: OutputConfig, config: TableConfig) -> int:
+    """Row count of a table's existing output."""
+    if output.is_dataset():
+        from file_converter.dataset import read_manifest
+        return read_manifest(path)["total_rows"]
+    if output.fmt == "sqlite":
+        with sqlite3.connect(path) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {quote_ident(config.name)}").fetchone()[0]
+    first = config.columns[0].name
+    return sum(len(a) for a in iter_column(path, output, config, first, pa.string()))
+
+
+def load_keys(path: str, output: OutputConfig, config: TableConfig) -> KeyStore:
+    """
+    Read the PK column of a table's existing output into a KeyStore.
+    Int keys must be 1..n, as this generator writes them.
+    """
+    pk_col = config.pk_column()
+    store = KeyStore(pk_col.name, pk_col.key_format)
+    if pk_col.key_format == "int":
+        n, low, high = 0, None, None
+        for array in iter_column(path, output, config, pk_col.name, pa.int64()):
+            if array.null_count:
+                raise ValueError(f"'{config.name}.{pk_col.name}' has empty keys")
+            if len(array):
+                values = array.to_numpy()
+                low = values.min() if low is None else min(low, values.min())
+                high = values.max() if high is None else max(high, values.max())
+                n += len(array)
+        if n and (low != 1 or high != n):
+            raise ValueError(f"'{config.name}.{pk_col.name}' does not hold the keys 1..{n}: "
+                             f"found {low}..{high}")
+        store.add_range(n)
+        return store
+    packed = []
+    for array in iter_column(path, output, config, pk_col.name, pa.string()):
+        if array.null_count:
+            raise ValueError(f"'{config.name}.{pk_col.name}' has empty keys")
+        packed.append(pack_uuids(array.to_pylist()))
+    if packed:
+        store.add_existing(np.concatenate(packed))
+    return store
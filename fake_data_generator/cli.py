@@ -4,14 +4,8 @@ CLI entrypoint for Fake Data Generator using Typer.
 """
 
 import typer
-from datetime import datetime
-from typing import List
 
-from .schema import TableConfig, ColumnConfig
-from .generator import DataGenerator
 from . import prompts
-from .prebuilt import run_prebuilt as prebuilt_flow
-from .custom import run_custom as custom_flow
 
 app = typer.Typer(help="Generate fake CSV datasets with PK/FK relationships.")
 
@@ -30,10 +24,13 @@ def main():
     print("3) Exit")
 
     choice = prompts.input_with_default("Enter choice", "1")
+    # The flows pull in NumPy, Faker and the writers: import them only once chosen
     if choice == "1":
-        prebuilt_flow()
+        from .prebuilt import run_prebuilt
+        run_prebuilt()
     elif choice == "2":
-        custom_flow()
+        from .custom import run_custom
+        run_custom()
     elif choice == "3":
         print("Goodbye!")
     else:
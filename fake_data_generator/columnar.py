@@ -0,0 +1,79 @@
+# fake_data_generator/columnar.py
+"""
+Column batches for the columnar generation engine.
+
+A ColumnBatch holds one NumPy array per column plus an optional boolean
+null mask per column, so whole columns can be generated and written
+without building a dict per row.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .keys import format_uuids
+
+
+@dataclass
+class ColumnBatch:
+    columns: Dict[str, np.ndarray]                            # column name -> values
+    nulls: Dict[str, np.ndarray] = field(default_factory=dict)  # column name -> mask (True = null)
+
+    def __len__(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    # Helper: get column names in order
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    # Helper: get the null mask of a column (None if it has no nulls)
+    def null_mask(self, name: str) -> Optional[np.ndarray]:
+        return self.nulls.get(name)
+
+    def to_pylist(self, name: str) -> list:
+        """Return a column as a Python list, with nulls as None."""
+        values = self.columns[name]
+        if values.dtype.kind == "V":
+            out = format_uuids(values)
+        else:
+            if values.dtype.kind == "M":
+                values = values.astype(object)
+            out = values.tolist()
+        mask = self.nulls.get(name)
+        if mask is not None:
+            for i in np.flatnonzero(mask).tolist():
+                out[i] = None
+        return out
+
+    def format_column(self, name: str) -> List[str]:
+        """Return a column as CSV text, with nulls as empty strings."""
+        values = self.columns[name]
+        mask = self.nulls.get(name)
+        kind = values.dtype.kind
+        if kind in "OV":
+            # Python strings (or packed UUIDs): skip the fixed-width unicode round trip
+            out = format_uuids(values) if kind == "V" else values.tolist()
+            if mask is not None:
+                for i in np.flatnonzero(mask).tolist():
+                    out[i] = ""
+            return out
+        if kind == "M":
+            text = np.datetime_as_string(values, unit="D")
+        elif kind == "b":
+            text = np.where(values, "True", "False")
+        else:
+            text = values.astype(str)
+        if mask is not None:
+            text = np.where(mask, "", text)
+        return text.tolist()
+
+    def rows(self) -> Iterator[dict]:
+        """Iterate the batch as row dicts (compatibility with the per-row path)."""
+        names = self.column_names()
+        cols = [self.to_pylist(n) for n in names]
+        for values in zip(*cols):
+            yield dict(zip(names, values))
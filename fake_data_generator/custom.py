@@ -3,9 +3,14 @@
 Custom schema generator.
 """
 
+import os
 from datetime import datetime
 from .schema import TableConfig, ColumnConfig
 from .generator import DataGenerator
+from .instrument import REPORT_FILE, make_instrumentation, summary
+from .plan import SchemaError, compile_schema
+from .prebuilt import check_append, print_appended, print_saved
+from .scheduler import build_dag, run_schema, topological_order
 from . import prompts
 
 def run_custom():
@@ -14,6 +19,7 @@ def run_custom():
     """
     print("\n--- Custom Schema ---")
     out_dir = prompts.input_with_default("Enter output folder path", "./fake_data")
+    append = prompts.input_append(out_dir)
     table_configs = []
     existing_tables = {}
 
@@ -50,11 +56,13 @@ def run_custom():
                     )
                 else:
                     has_pk = True
-                    columns.append(ColumnConfig(col_name, "pk"))
+                    key_format = prompts.input_choice("Key format", ["uuid", "int"])
+                    columns.append(ColumnConfig(col_name, "pk", key_format=key_format))
                     continue
 
             # Nullable support
             nullable = prompts.input_nullable("Allow null values?", default=False)
+            unique = prompts.input_unique()
 
             # FK handling
             if col_type == "fk":
@@ -71,7 +79,8 @@ def run_custom():
                         print(f"{idx}. {tn}.{cn}")
                     target_idx = prompts.input_int("Select target by number", default=1, min_val=1, max_val=len(pk_targets))
                     ref_table, ref_column = pk_targets[target_idx-1]
-                    columns.append(ColumnConfig(col_name, "fk", nullable=nullable, ref_table=ref_table, ref_column=ref_column))
+                    dist = {} if unique else prompts.input_distribution()
+                    columns.append(ColumnConfig(col_name, "fk", nullable=nullable, unique=unique, ref_table=ref_table, ref_column=ref_column, **dist))
                     continue
 
             # Date type
@@ -81,37 +90,41 @@ def run_custom():
                 while end < start:
                     print("End date cannot be before start date.")
                     end = prompts.input_date("End date")
-                columns.append(ColumnConfig(col_name, "date", nullable=nullable, date_start=start, date_end=end))
+                columns.append(ColumnConfig(col_name, "date", nullable=nullable, unique=unique, date_start=start, date_end=end))
                 continue
 
             # Number type
             if col_type == "number":
                 min_v = prompts.input_int("Min value", 0)
                 max_v = prompts.input_int("Max value", max(1, min_v))
-                columns.append(ColumnConfig(col_name, "number", nullable=nullable, num_min=min_v, num_max=max_v))
+                dist = {} if unique else prompts.input_distribution()
+                columns.append(ColumnConfig(col_name, "number", nullable=nullable, unique=unique, num_min=min_v, num_max=max_v, **dist))
                 continue
 
             # Float type
             if col_type == "float":
                 min_f = prompts.input_float("Min value", 0.0)
                 max_f = prompts.input_float("Max value", 1.0)
-                columns.append(ColumnConfig(col_name, "float", nullable=nullable, float_min=min_f, float_max=max_f))
+                dist = {} if unique else prompts.input_distribution()
+                columns.append(ColumnConfig(col_name, "float", nullable=nullable, unique=unique, float_min=min_f, float_max=max_f, **dist))
                 continue
 
             # Boolean type
             if col_type == "boolean":
-                columns.append(ColumnConfig(col_name, "boolean", nullable=nullable))
+                columns.append(ColumnConfig(col_name, "boolean", nullable=nullable, unique=unique))
                 continue
 
             # Choice type
             if col_type == "choice":
                 choices = prompts.input_comma_separated("Enter comma-separated choices")
-                columns.append(ColumnConfig(col_name, "choice", nullable=nullable, choices=choices))
+                dist = {} if unique else prompts.input_distribution(choices)
+                columns.append(ColumnConfig(col_name, "choice", nullable=nullable, unique=unique, choices=choices, **dist))
                 continue
 
             # Faker-backed types
             if col_type in ("name", "email", "address"):
-                columns.append(ColumnConfig(col_name, col_type, nullable=nullable))
+                pool_size = prompts.input_pool_size()
+                columns.append(ColumnConfig(col_name, col_type, nullable=nullable, unique=unique, pool_size=pool_size or None))
 
         n_rows = prompts.input_int(f"Number of rows for '{table_name}'", default=100, min_val=0)
         tcfg = TableConfig(name=table_name, columns=columns, n_rows=n_rows)
@@ -123,8 +136,28 @@ def run_custom():
         print("No tables defined.")
         return
 
-    dg = DataGenerator(out_dir)
-    for cfg in table_configs:
-        rows = dg.generate_table(cfg)
-        path = dg.write_csv(cfg, rows)
-        print(f"✅ {cfg.name}.csv saved with {len(rows)} rows at {path}")
+    try:
+        compile_schema(table_configs)
+        topological_order(build_dag(table_configs))
+    except SchemaError as e:
+        print(f"❌ {e}")
+        return
+
+    output = prompts.input_output_config()
+    if append and not check_append(output):
+        return
+    chunk_size = prompts.input_chunk_size()
+    workers = 0 if append else prompts.input_workers(output=output)
+    seed = prompts.input_seed()
+    profiling = prompts.input_profiling()
+    dg = DataGenerator(out_dir, seed=seed, output=output)
+    instrument = None
+    if profiling:
+        # Report next to the output, in the folder the generator resolved (e.g. '~' expanded)
+        instrument = dg.instrument = make_instrumentation(os.path.join(dg.output_dir, REPORT_FILE))
+    report = run_schema(dg, table_configs, chunk_size=chunk_size, workers=workers, append=append,
+                        on_table_done=print_appended if append else print_saved)
+    print(report.summary())
+    if instrument is not None:
+        print(summary(list(instrument.tables.values())))
+        print(f"✅ Timing report saved at {os.path.join(dg.output_dir, REPORT_FILE)}")
@@ -0,0 +1,193 @@
+# fake_data_generator/distributions.py
+"""
+Skewed value distributions for fk, number, float and choice columns.
+
+A distribution draws indexes 0..size-1 into a column's domain: the parent
+key store for FKs, num_min..num_max for numbers, the 0.01 grid between
+the bounds for floats and the choices for choice columns. Index 0 is the
+low end of the domain (the first parent key, num_min, float_min, the first
+choice), which is also the most frequent value for 'zipf' and
+'exponential'.
+
+- uniform     : every index equally likely (the default; the generators
+                keep their original sampling code for it)
+- zipf        : P(k) ~ 1 / (k + 1) ** s, by rejection-inversion
+                (Hörmann & Derflinger), exact and O(1) per value
+                without any per-key table
+- normal      : bell curve centred on the domain, resampled until inside it
+- exponential : decaying from the low end, by truncated inverse CDF
+- weighted    : one weight per choice, by Vose's alias method
+
+Every sampler needs O(1) setup (O(choices) for 'weighted') and O(1) work
+per value, so skew over millions of parent keys costs the same per value
+as over ten.
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .schema import ColumnConfig
+
+DISTRIBUTIONS = ("uniform", "zipf", "normal", "exponential", "weighted")
+DISTRIBUTION_TYPES = ("fk", "number", "float", "choice")
+# dist_param defaults: zipf exponent s; normal standard deviation and
+# exponential mean, both as a fraction of the domain width
+DEFAULT_PARAMS = {"zipf": 1.2, "normal": 0.15, "exponential": 0.2}
+
+
+def is_skewed(col: ColumnConfig) -> bool:
+    """True if the column samples from a non-uniform distribution."""
+    return col.distribution not in (None, "uniform")
+
+
+def distribution_errors(col: ColumnConfig) -> List[str]:
+    """Problems with a column's distribution settings (empty if valid)."""
+    if col.weights is not None and col.distribution != "weighted":
+        return [f"Weights are only used by the 'weighted' distribution (column '{col.name}')"]
+    if not is_skewed(col):
+        return []
+    if col.distribution not in DISTRIBUTIONS:
+        return [f"Unknown distribution '{col.distribution}' for column '{col.name}'. Supported: {list(DISTRIBUTIONS)}"]
+    if col.col_type not in DISTRIBUTION_TYPES:
+        return [f"Column '{col.name}' ({col.col_type}) does not support distributions"]
+    if col.unique:
+        return [f"Unique column '{col.name}' cannot use the '{col.distribution}' distribution"]
+    if col.distribution == "weighted":
+        if col.col_type != "choice":
+            return [f"The 'weighted' distribution needs a choice column (column '{col.name}')"]
+        weights = col.weights or []
+        if len(weights) != len(col.choices or []):
+            return [f"Column '{col.name}' needs one weight per choice"]
+        if any(w < 0 for w in weights) or sum(weights) <= 0:
+            return [f"Weights of column '{col.name}' must be >= 0 with a positive sum"]
+        return []
+    if col.dist_param is not None and col.dist_param <= 0:
+        return [f"Distribution parameter of column '{col.name}' must be positive"]
+    return []
+
+
+# ---- samplers
+
+class Sampler:
+    """Draws indexes 0..size-1 of a domain."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def indexes(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class AliasSampler(Sampler):
+    """Vose's alias method: O(size) table, then one uniform index and one coin per value."""
+
+    def __init__(self, weights: Sequence[float]):
+        super().__init__(len(weights))
+        p = np.asarray(weights, dtype=np.float64)
+        p = p * (len(p) / p.sum())
+        self.prob = np.ones(len(p))
+        self.alias = np.arange(len(p), dtype=np.int64)
+        small = [i for i in range(len(p)) if p[i] < 1.0]
+        large = [i for i in range(len(p)) if p[i] >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self.prob[s], self.alias[s] = p[s], g
+            p[g] -= 1.0 - p[s]
+            (small if p[g] < 1.0 else large).append(g)
+        # Entries left over are 1 up to rounding: keep prob 1
+
+    def indexes(self, rng, n):
+        idx = rng.integers(0, self.size, size=n)
+        return np.where(rng.random(n) < self.prob[idx], idx, self.alias[idx])
+
+
+class ZipfSampler(Sampler):
+    """
+    Zipf over ranks 1..size with exponent s, by rejection-inversion: invert
+    the integral of the density x ** -s, and accept the rounded rank unless
+    it falls in the small gap between the integral and the true
+    probability. Over 90% of draws are accepted; rejected ones are redrawn.
+    """
+
+    def __init__(self, size: int, s: float):
+        super().__init__(size)
+        self.s = s
+        self._h_x1 = self._h_integral(np.array(1.5)) - 1.0
+        self._h_n = self._h_integral(np.array(size + 0.5))
+        self._sq = 2.0 - self._h_integral_inverse(self._h_integral(np.array(2.5)) - self._h(np.array(2.0)))
+
+    def _h(self, x):
+        return np.exp(-self.s * np.log(x))
+
+    def _h_integral(self, x):
+        # Integral of x ** -s: (x ** (1 - s) - 1) / (1 - s), or log(x) for s = 1
+        if abs(1.0 - self.s) < 1e-9:
+            return np.log(x)
+        return np.expm1((1.0 - self.s) * np.log(x)) / (1.0 - self.s)
+
+    def _h_integral_inverse(self, u):
+        if abs(1.0 - self.s) < 1e-9:
+            return np.exp(u)
+        return np.exp(np.log1p(np.maximum(u * (1.0 - self.s), -1.0)) / (1.0 - self.s))
+
+    def indexes(self, rng, n):
+        out = np.empty(n, dtype=np.int64)
+        todo = np.arange(n)
+        while len(todo):
+            u = self._h_n + rng.random(len(todo)) * (self._h_x1 - self._h_n)
+            x = self._h_integral_inverse(u)
+            k = np.clip(np.floor(x + 0.5), 1, self.size)
+            ok = k - x <= self._sq
+            check = np.flatnonzero(~ok)     # the exact test is needed for few draws only
+            kc = k[check]
+            ok[check] = u[check] >= self._h_integral(kc + 0.5) - self._h(kc)
+            out[todo[ok]] = k[ok].astype(np.int64) - 1
+            todo = todo[~ok]
+        return out
+
+
+class NormalSampler(Sampler):
+    """Normal centred on the domain, std = param * size; draws outside the domain are redrawn."""
+
+    def __init__(self, size: int, param: float):
+        super().__init__(size)
+        self.std = param * size
+
+    def indexes(self, rng, n):
+        out = np.empty(n, dtype=np.int64)
+        todo = np.arange(n)
+        while len(todo):
+            x = np.floor(rng.normal(self.size / 2.0, self.std, size=len(todo)))
+            ok = (x >= 0) & (x < self.size)
+            out[todo[ok]] = x[ok].astype(np.int64)
+            todo = todo[~ok]
+        return out
+
+
+class ExponentialSampler(Sampler):
+    """Exponential from the low end, mean = param * size, truncated to the domain by inverse CDF."""
+
+    def __init__(self, size: int, param: float):
+        super().__init__(size)
+        self.scale = param * size
+        self._mass = -np.expm1(-size / self.scale)      # CDF at the end of the domain
+
+    def indexes(self, rng, n):
+        x = -self.scale * np.log1p(-rng.random(n) * self._mass)
+        return np.minimum(x.astype(np.int64), self.size - 1)
+
+
+def make_sampler(col: ColumnConfig, size: int) -> Optional[Sampler]:
+    """The sampler of a skewed column over a domain of size values (None for uniform)."""
+    if not is_skewed(col) or size < 1:
+        return None
+    param = col.dist_param if col.dist_param is not None else DEFAULT_PARAMS.get(col.distribution)
+    if col.distribution == "zipf":
+        return ZipfSampler(size, param)
+    if col.distribution == "normal":
+        return NormalSampler(size, param)
+    if col.distribution == "exponential":
+        return ExponentialSampler(size, param)
+    return AliasSampler(col.weights)
@@ -4,116 +4,648 @@ DataGenerator for Fake Data Generator.
 
 Generates rows for tables based on TableConfig and ColumnConfig,
 handles PK/FK relationships, nullable columns, and CSV export.
+
+Only PK values of generated tables are kept (see keys.KeyStore); row data
+is handed to the caller and can be dropped once written.
+
+Tables are compiled once into validated plans (see plan.py); two engines
+then run them:
+- generate_columns(): columnar engine, fills whole columns with NumPy
+- generate_table()  : per-row engine, one dict per row (fallback)
 """
 
 from __future__ import annotations
 import csv
+import dataclasses
+import io
 import os
 import random
-import uuid
-from datetime import timedelta
-from typing import Dict, List
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from .columnar import ColumnBatch
+from .instrument import Instrumentation
+from .keys import KeyStore
+from .plan import ColumnPlan, TablePlan, compile_table
+from .pipeline import DEFAULT_QUEUE_DEPTH, write_pipelined
+from .pools import POOL_CACHE_ENV
+from .schema import CSV_COMPRESSION, TableConfig, ColumnConfig, OutputConfig
+
+DEFAULT_CHUNK_SIZE = 100_000   # rows per batch in streaming mode
+DEFAULT_SHARD_ROWS = 1_000_000   # rows per shard (fixed, so output never depends on workers)
+APPEND_MANIFEST = "_manifest-append.json"   # manifest of the files added by an append, merged afterwards
+
+
+def derive_seed(master_seed: int, *keys: Union[int, str]) -> int:
+    """Derive an independent seed from a master seed and keys (table names, shard indexes)."""
+    entropy = [master_seed] + [zlib.crc32(k.encode("utf-8")) if isinstance(k, str) else k for k in keys]
+    return int(np.random.SeedSequence(entropy).generate_state(1, np.uint64)[0])
+
+
+def shard_seed(master_seed: int, table_name: str, shard_index: int) -> int:
+    """Derive the seed of one shard from the master seed."""
+    return derive_seed(master_seed, table_name, shard_index)
+
+
+def shard_manifest(index: int) -> str:
+    """Name of the partial dataset manifest written by one shard."""
+    return f"_manifest-{index:05d}.json"
 
-from faker import Faker
-from .schema import TableConfig, ColumnConfig
 
-fake = Faker()
+def open_csv(path: str, output: OutputConfig, append: bool = False):
+    """
+    Open a CSV output file for text writing, compressed on the fly if output
+    asks for it. With append, writing continues at the end of the file
+    (compressed files get a new gzip member or zstd frame).
+    """
+    if output.compression not in CSV_COMPRESSION:
+        return open(path, "a" if append else "w", newline="", encoding="utf-8")
+    if output.compression == "gzip":
+        import gzip
+        # Level 1: ~3x faster than the default for a few % more bytes; mtime=0 and no file name
+        # in the header keep output reproducible (shards write to part files merged afterwards)
+        raw = open(path, "ab" if append else "wb")
+        stream = gzip.GzipFile(filename="", mode="wb", compresslevel=1, fileobj=raw, mtime=0)
+        stream.myfileobj = raw      # closed with the stream, as when GzipFile opens the file itself
+    else:
+        import pyarrow as pa
+        stream = pa.CompressedOutputStream(pa.OSFile(path, "ab") if append else path, output.compression)
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
 
 
 class DataGenerator:
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, seed: Optional[int] = None,
+                 locale: str = "en_US", pool_cache_dir: Optional[str] = None,
+                 output: Optional[OutputConfig] = None,
+                 instrument: Optional[Instrumentation] = None,
+                 write_queue: int = DEFAULT_QUEUE_DEPTH):
         self.output_dir = os.path.abspath(os.path.expanduser(output_dir))
         os.makedirs(self.output_dir, exist_ok=True)
-        self.generated: Dict[str, List[dict]] = {}   # table_name -> list of rows
+        self.output = output or OutputConfig()
+        self.keys: Dict[str, KeyStore] = {}          # table_name -> PK key store
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.locale = locale
+        self.pool_cache_dir = pool_cache_dir or os.environ.get(POOL_CACHE_ENV)
+        self.random = random.Random(seed)            # per-row engine
+        self._fake = None                            # Faker, created on first use (see fake)
+        self._plans: Dict[str, TablePlan] = {}       # table_name -> compiled plan
+        # Key of the permutations behind unique columns; shards of a table share it
+        self.unique_seed = derive_seed(seed, "unique") if seed is not None else int(self.rng.integers(2**63))
+        self.instrument = instrument                 # timing/progress collector (None = off)
+        self.write_queue = write_queue               # batches buffered for the writer thread (0 = no thread)
+        self.workbook = None                         # open file_converter.excel.ExcelWriter (see open_workbook)
 
-    # ---- generic helpers
+    def for_table(self, table_name: str) -> "DataGenerator":
+        """
+        A generator for one table that shares this generator's key stores and
+        output settings but has its own random state (seeded from
+        (seed, table_name) when a seed is set), so tables can be generated
+        concurrently and reproducibly.
+        """
+        return self._with_seed(derive_seed(self.seed, table_name) if self.seed is not None else None)
+
+    def _with_seed(self, seed: Optional[int]) -> "DataGenerator":
+        """A generator sharing this one's key stores and output, with the random state of seed."""
+        dg = DataGenerator(self.output_dir, seed=seed, locale=self.locale,
+                           pool_cache_dir=self.pool_cache_dir, output=self.output,
+                           instrument=self.instrument, write_queue=self.write_queue)
+        dg.keys = self.keys
+        dg.workbook = self.workbook
+        return dg
+
+    @property
+    def fake(self):
+        """
+        This generator's Faker instance for its locale, seeded like the
+        generator. Built on first use: importing Faker and loading a locale
+        costs far more than a run of non-Faker columns (or pooled ones
+        whose pools are cached).
+        """
+        if self._fake is None:
+            from faker import Faker
+            self._fake = Faker(self.locale)
+            if self.seed is not None:
+                self._fake.seed_instance(self.seed)
+        return self._fake
+
+    # ---- plans
+
+    def compile(self, config: TableConfig) -> TablePlan:
+        """Compile (and cache) the validated generation plan of a table."""
+        plan = self._plans.get(config.name)
+        if plan is None or plan.config is not config:
+            plan = compile_table(config)
+            self._plans[config.name] = plan
+        return plan
 
     def _gen_value(self, col: ColumnConfig, current_table: str):
         """Generate a value for a column, respecting nullable and type."""
-        if col.nullable and random.random() < col.null_prob:
+        plan = self._plans.get(current_table)
+        cp = next((c for c in plan.columns if c.col is col), None) if plan else None
+        if cp is None:
+            cp = compile_table(TableConfig(current_table, [col], 0)).columns[0]
+        if cp.null_prob and self.random.random() < cp.null_prob:
             return None
+        return cp.generator.value(self)
 
-        if col.col_type == 'pk' or col.col_type == 'fk':
-            return str(uuid.uuid4())
-        elif col.col_type == 'name':
-            return fake.name()
-        elif col.col_type == 'email':
-            return fake.email()
-        elif col.col_type == 'address':
-            return fake.address().replace("\n", ", ")
-        elif col.col_type == 'date':
-            start, end = col.date_start, col.date_end
-            if not start or not end or start > end:
-                raise ValueError(f"Invalid date bounds for column '{col.name}'")
-            delta_days = (end - start).days
-            offset = random.randint(0, max(0, delta_days))
-            return (start + timedelta(days=offset)).strftime("%Y-%m-%d")
-        elif col.col_type == 'number':
-            if col.num_min is None or col.num_max is None or col.num_min > col.num_max:
-                raise ValueError(f"Invalid number bounds for column '{col.name}'")
-            return random.randint(col.num_min, col.num_max)
-        elif col.col_type == 'float':
-            if col.float_min is None or col.float_max is None or col.float_min > col.float_max:
-                raise ValueError(f"Invalid float bounds for column '{col.name}'")
-            return round(random.uniform(col.float_min, col.float_max), 2)
-        elif col.col_type == 'boolean':
-            return random.choice([True, False])
-        elif col.col_type == 'choice':
-            if not col.choices:
-                raise ValueError(f"No choices provided for column '{col.name}'")
-            return random.choice(col.choices)
-        else:
-            return None
+    def _table_size(self, table_name: str) -> int:
+        """Number of generated rows of a table (0 if it has no key store)."""
+        store = self.keys.get(table_name)
+        return len(store) if store is not None else 0
 
-    # ---- table generation
-
-    def generate_table(self, config: TableConfig) -> List[dict]:
-        """Generate rows for a table respecting PK/FK and nullable rules."""
+    def _check_fk_refs(self, config: TableConfig):
+        """Validate FK references; zero the row count if a parent is empty."""
         fk_columns = [c for c in config.columns if c.col_type == 'fk']
         for fk in fk_columns:
             if not fk.ref_table or not fk.ref_column:
                 raise ValueError(f"FK column '{fk.name}' must reference a table.column")
-            if fk.ref_table not in self.generated or len(self.generated[fk.ref_table]) == 0:
+            store = self.keys.get(fk.ref_table)
+            if store is not None and store.column != fk.ref_column:
+                raise ValueError(
+                    f"FK column '{fk.name}' must reference the PK of '{fk.ref_table}' ('{store.column}')"
+                )
+            if self._table_size(fk.ref_table) == 0:
                 if config.n_rows > 0:
                     print(f"Warning: '{config.name}' references '{fk.ref_table}' with 0 rows. Setting row count to 0.")
                     config.n_rows = 0
 
-        rows: List[dict] = []
+    def logical_types(self, config: TableConfig) -> Dict[str, str]:
+        """Logical output type of every column of a table (see plan.ColumnGenerator)."""
+        key_formats = {name: store.key_format for name, store in self.keys.items()}
+        return self.compile(config).logical_types(key_formats)
+
+    def table_path(self, config: TableConfig, suffix: str = "") -> str:
+        """
+        Output path of a table in the configured format (the shared database
+        file for SQLite, the shared workbook for Excel, the table's folder for
+        dataset output).
+        """
+        if self.output.is_dataset():
+            return os.path.join(self.output_dir, f"{config.name}{suffix}")
+        if self.output.fmt == "sqlite":
+            return os.path.join(self.output_dir, self.output.database)
+        if self.output.fmt == "xlsx":
+            return os.path.join(self.output_dir, self.output.workbook)
+        return os.path.join(self.output_dir, f"{config.name}{suffix}{self.output.extension()}")
+
+    def _start_keys(self, config: TableConfig) -> Optional[KeyStore]:
+        """Create a fresh key store for the table's PK (replacing any earlier one)."""
         pk_col = config.pk_column()
+        if pk_col is None:
+            self.keys.pop(config.name, None)
+            return None
+        store = KeyStore(pk_col.name, pk_col.key_format)
+        self.keys[config.name] = store
+        return store
+
+    # ---- columnar generation
+
+    def _unique_values(self, config: TableConfig, cp: ColumnPlan, start: int, n: int) -> np.ndarray:
+        """Values of a unique column for rows start..start+n-1 of the table (see unique.py)."""
+        size = cp.generator.domain(self)
+        if size is not None and config.n_rows > size:
+            raise ValueError(f"Unique column '{cp.name}' has only {size} distinct values for {config.n_rows} rows")
+        idx = cp.generator.unique_indexes(self, np.arange(start, start + n, dtype=np.uint64),
+                                          derive_seed(self.unique_seed, config.name, cp.name))
+        return cp.generator.take(self, idx)
+
+    def _gen_batch(self, config: TableConfig, n: int, start: int = 0) -> ColumnBatch:
+        """Generate n rows of a table as a single column batch; start is the table row of the first one."""
+        columns: Dict[str, np.ndarray] = {}
+        nulls: Dict[str, np.ndarray] = {}
+        inst = self.instrument
+        for cp in self.compile(config).columns:
+            t0 = time.perf_counter() if inst is not None else 0.0
+            if cp.unique:
+                columns[cp.name] = self._unique_values(config, cp, start, n)
+            else:
+                columns[cp.name] = cp.generator.generate(self, n)
+            if cp.null_prob:
+                nulls[cp.name] = self.rng.random(n) < cp.null_prob
+            if inst is not None:
+                inst.column_time(config.name, cp.name, time.perf_counter() - t0)
+        if inst is not None:
+            inst.progress(config.name, n)
+        return ColumnBatch(columns, nulls)
+
+    def generate_columns(self, config: TableConfig) -> ColumnBatch:
+        """Generate a table column by column, with one batched call per column."""
+        self.compile(config)
+        self._check_fk_refs(config)
+        self._start_keys(config)
+        return self._gen_batch(config, config.n_rows)
+
+    def iter_columns(self, config: TableConfig, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ColumnBatch]:
+        """
+        Generate a table as a stream of column batches of at most chunk_size rows.
+
+        Only the PK values are retained (in the table's key store, for FK
+        lookups by child tables), so memory stays bounded by chunk_size
+        whatever config.n_rows is.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.compile(config)
+        self._check_fk_refs(config)
+        self._start_keys(config)
+
+        for start in range(0, config.n_rows, chunk_size):
+            yield self._gen_batch(config, min(chunk_size, config.n_rows - start), start)
+
+    def shard_bounds(self, config: TableConfig, shard_rows: int = DEFAULT_SHARD_ROWS) -> List[Tuple[int, int]]:
+        """
+        (first row, row count) of each shard of a table. Dataset shards are
+        aligned to whole files when the files have a fixed row count.
+        """
+        if self.output.is_dataset():
+            max_rows = self.dataset_options(config).max_rows
+            if max_rows:
+                shard_rows = max(shard_rows // max_rows, 1) * max_rows
+        n = config.n_rows
+        return [(s, min(shard_rows, n - s)) for s in range(0, n, shard_rows)] or [(0, 0)]
+
+    def iter_shards(self, config: TableConfig, chunk_size: int = 0,
+                    shard_rows: int = DEFAULT_SHARD_ROWS) -> Iterator[ColumnBatch]:
+        """
+        Generate a table shard by shard, as parallel.export_sharded does in
+        worker processes: each shard with the random state of
+        shard_seed(seed, table, index), in batches of at most chunk_size rows
+        (0 = one batch per shard). The rows are the same whatever the number
+        of workers.
+        """
+        for shard in self._shards(config, chunk_size, shard_rows):
+            yield from shard
+
+    def _shards(self, config: TableConfig, chunk_size: int, shard_rows: int) -> Iterator[Iterator[ColumnBatch]]:
+        """The batches of each shard of a table, one iterator per shard (see iter_shards)."""
+        self.compile(config)
+        self._check_fk_refs(config)
+        self._start_keys(config)
+        master_seed = self.seed if self.seed is not None else int(self.rng.integers(2**63))
+
+        def batches(dg: DataGenerator, start: int, rows: int) -> Iterator[ColumnBatch]:
+            chunk = chunk_size or rows
+            for s in range(0, rows, chunk):
+                yield dg._gen_batch(config, min(chunk, rows - s), start + s)
+
+        for i, (start, rows) in enumerate(self.shard_bounds(config, shard_rows)):
+            dg = self._with_seed(shard_seed(master_seed, config.name, i))
+            dg.unique_seed = self.unique_seed
+            yield batches(dg, start, rows)
+
+    def write_shards(self, config: TableConfig, chunk_size: int = 0,
+                     shard_rows: int = DEFAULT_SHARD_ROWS) -> Tuple[str, int]:
+        """
+        Generate a table shard by shard in this process (see iter_shards) and
+        write it in the configured output format. Returns (path, n_rows).
+
+        Compressed CSV gets one gzip member or zstd frame per shard, as the
+        merged part files of parallel.export_sharded do, so the bytes are
+        the same whatever the number of workers.
+        """
+        if not (self.output.fmt == "csv" and self.output.compression in CSV_COMPRESSION
+                and not self.output.is_dataset()):
+            return self.write_batches(config, self.iter_shards(config, chunk_size, shard_rows))
+        path, n_rows = self.table_path(config), 0
+        for i, shard in enumerate(self._shards(config, chunk_size, shard_rows)):
+            n_rows += self.write_batches(config, shard, path, append=i > 0)[1]
+        return path, n_rows
 
-        for _ in range(config.n_rows):
+    # ---- table generation
+
+    def generate_table(self, config: TableConfig) -> List[dict]:
+        """Generate rows for a table respecting PK/FK and nullable rules."""
+        plan = self.compile(config)
+        self._check_fk_refs(config)
+
+        start = time.perf_counter() if self.instrument is not None else 0.0
+        rows: List[dict] = []
+        pk = plan.pk()
+        store = self._start_keys(config)
+        n = config.n_rows
+        rnd = self.random.random
+
+        # Draw PKs and FKs in bulk from the key stores, and unique columns as whole columns
+        pk_values = store.format(store.new_keys(self.rng, n)) if store is not None else []
+        bulk_values = {
+            cp.name: self.keys[cp.col.ref_table].format(cp.generator.generate(self, n))
+            for cp in plan.fks() if not cp.unique
+        }
+        for cp in plan.columns:
+            if cp.unique:
+                bulk_values[cp.name] = cp.generator.python_values(self, self._unique_values(config, cp, 0, n))
+        others = [cp for cp in plan.columns if cp is not pk]
+
+        for i in range(n):
             row: dict = {}
 
             # Assign PK
-            if pk_col:
-                row[pk_col.name] = str(uuid.uuid4())
+            if pk:
+                row[pk.name] = pk_values[i]
 
             # Assign other columns
-            for col in config.columns:
-                if col.col_type == 'pk':
-                    continue
-                if col.col_type == 'fk':
-                    candidates = self.generated[col.ref_table]
-                    ref_val = random.choice(candidates)[col.ref_column] if candidates else None
-                    row[col.name] = ref_val
+            for cp in others:
+                if cp.null_prob and rnd() < cp.null_prob:
+                    row[cp.name] = None
+                elif cp.name in bulk_values:
+                    row[cp.name] = bulk_values[cp.name][i]
                 else:
-                    row[col.name] = self._gen_value(col, config.name)
+                    row[cp.name] = cp.generator.value(self)
 
             rows.append(row)
 
-        self.generated[config.name] = rows
+        if self.instrument is not None:
+            self.instrument.gen_time(config.name, time.perf_counter() - start)
+            self.instrument.progress(config.name, n)
         return rows
 
     # ---- CSV export
 
-    def write_csv(self, table: TableConfig, rows: List[dict]) -> str:
-        """Write a table to CSV, preserving column order."""
-        path = os.path.join(self.output_dir, f"{table.name}.csv")
+    def write_csv(self, table: TableConfig, rows: Union[List[dict], ColumnBatch]) -> str:
+        """Write a table to CSV (compressed if configured), preserving column order."""
+        path = self.table_path(table) if self.output.fmt == "csv" else os.path.join(self.output_dir, f"{table.name}.csv")
         fieldnames = table.column_names()
-        with open(path, "w", newline="", encoding="utf-8") as f:
+        with open_csv(path, self.output) as f:
+            if isinstance(rows, ColumnBatch):
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(zip(*[rows.format_column(n) for n in fieldnames]))
+                return path
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             for r in rows:
                 row_clean = {k: ("" if v is None else v) for k, v in r.items()}
                 writer.writerow(row_clean)
         return path
+
+    def write_csv_stream(self, table: TableConfig, batches: Iterable[ColumnBatch],
+                         path: Optional[str] = None, header: bool = True,
+                         append: bool = False) -> Tuple[str, int]:
+        """
+        Write a stream of column batches to CSV chunk by chunk (appended to
+        the file with append). Returns (path, n_rows).
+        """
+        path = path or self.table_path(table)
+        fieldnames = table.column_names()
+        n_rows = 0
+        with open_csv(path, self.output, append) as f:
+            if header:
+                csv.writer(f).writerow(fieldnames)
+            for batch in batches:
+                # Encode the chunk in memory and hand it to the file (and compressor) in one write
+                buf = io.StringIO()
+                csv.writer(buf).writerows(zip(*[batch.format_column(n) for n in fieldnames]))
+                f.write(buf.getvalue())
+                n_rows += len(batch)
+        return path, n_rows
+
+    def write_batches(self, table: TableConfig, batches: Iterable[ColumnBatch],
+                      path: Optional[str] = None, header: bool = True,
+                      shard: Optional[int] = None, append: bool = False) -> Tuple[str, int]:
+        """
+        Write column batches in the configured output format. Returns (path, n_rows).
+
+        With write_queue > 0 the batches are written by a background thread
+        while the next ones are generated, with at most write_queue batches
+        waiting (see pipeline.py). header=False leaves out the CSV header.
+        shard is the index of the shard being written, if any (dataset output
+        names its files and manifest after it). append adds the rows to the
+        table's existing output (see append_table).
+        """
+        path = path or self.table_path(table)
+        if self.write_queue > 0:
+            return write_pipelined(lambda items: self._write_batches(table, items, path, header, shard, append),
+                                   batches, depth=self.write_queue)
+        return self._write_batches(table, batches, path, header, shard, append)
+
+    def _write_batches(self, table: TableConfig, batches: Iterable[ColumnBatch],
+                       path: str, header: bool, shard: Optional[int] = None,
+                       append: bool = False) -> Tuple[str, int]:
+        fmt = self.output.fmt
+        if self.output.is_dataset():
+            return path, self.write_dataset(table, batches, path, shard, append)
+        if fmt == "csv":
+            return self.write_csv_stream(table, batches, path=path, header=header and not append, append=append)
+        if fmt == "sqlite":
+            from .sql import write_sqlite
+            return path, write_sqlite(path, table, self.logical_types(table), batches, append)
+        if fmt == "pgcopy":
+            from .sql import write_pgcopy
+            return path, write_pgcopy(path, table, batches, self.output.copy_format, append)
+        if append:
+            raise ValueError(f"Cannot append to a single {fmt} file")
+        if fmt == "xlsx":
+            return path, self.write_sheet(table, batches, path)
+
+        from . import writers
+        if fmt not in writers.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {fmt}. Supported: {writers.OUTPUT_FORMATS}")
+        schema = writers.arrow_schema(self.logical_types(table))
+        if fmt == "parquet":
+            return path, writers.write_parquet(path, schema, batches, self.output)
+        return path, writers.write_feather(path, schema, batches, self.output)
+
+    # ---- dataset output
+
+    def dataset_options(self, config: TableConfig):
+        """
+        The table's file_converter.dataset.DatasetOptions for dataset output.
+        A file count without partitioning becomes a fixed number of rows per
+        file, so shards can write their files independently.
+        """
+        from file_converter.dataset import DatasetOptions, parse_partition
+        out = self.output
+        column, transform = parse_partition(out.partition_by) if out.partition_by else (None, None)
+        if column not in config.column_names():
+            column, transform = None, None
+        max_rows, files = out.split_rows, out.split_files
+        if files and column is None:
+            max_rows, files = max(-(-config.n_rows // files), 1), None
+        return DatasetOptions(max_rows=max_rows, max_bytes=out.split_bytes, files=files,
+                              partition_by=column, transform=transform)
+
+    def write_dataset(self, table: TableConfig, batches: Iterable[ColumnBatch], root: str,
+                      shard: Optional[int] = None, append: bool = False) -> int:
+        """
+        Write column batches as a dataset folder of CSV or Parquet files
+        (see file_converter.dataset.DatasetWriter). A shard writes
+        'part-SSSSS-NNNNN' files and its own manifest, merged afterwards by
+        parallel.export_sharded. With append, the new files are named
+        after the existing row count ('part-aRRRRRRRRRRRR-NNNNN') and added
+        to the existing manifest. Returns the row count.
+        """
+        from file_converter.dataset import MANIFEST_FILE, DatasetWriter, merge_manifests, read_manifest
+        from . import writers
+        if self.output.fmt == "csv" and self.output.compression in CSV_COMPRESSION:
+            raise ValueError("Dataset output writes uncompressed CSV files: use parquet to compress")
+        schema = writers.arrow_schema(self.logical_types(table))
+        prefix, manifest = "part", MANIFEST_FILE
+        if shard is not None:
+            prefix, manifest = f"part-{shard:05d}", shard_manifest(shard)
+        elif append:
+            prefix, manifest = f"part-a{read_manifest(root)['total_rows']:012d}", APPEND_MANIFEST
+        compression = self.output.compression if self.output.fmt == "parquet" else None
+        n_rows = 0
+        with DatasetWriter(root, self.output.fmt, self.dataset_options(table), schema,
+                           prefix=prefix, manifest=manifest, compression=compression) as writer:
+            for batch in batches:
+                writer.write(writers.to_record_batch(batch, schema))
+                n_rows += len(batch)
+        if manifest == APPEND_MANIFEST:
+            merge_manifests(root, [MANIFEST_FILE, APPEND_MANIFEST])
+        return n_rows
+
+    # ---- Excel output
+
+    def open_workbook(self, configs: Sequence[TableConfig]):
+        """
+        For 'xlsx' output, start the shared workbook with one sheet per table,
+        in the given order; tables written until close_workbook() fill their
+        sheets. No-op for other formats.
+        """
+        if self.output.fmt != "xlsx":
+            return
+        from file_converter.excel import ExcelWriter
+        self.workbook = ExcelWriter(os.path.join(self.output_dir, self.output.workbook))
+        for cfg in configs:
+            self.workbook.sheet(cfg.name)
+
+    def close_workbook(self) -> Optional[str]:
+        """Assemble and save the shared workbook, if one is open. Returns its path."""
+        if self.workbook is None:
+            return None
+        workbook, self.workbook = self.workbook, None
+        workbook.close()
+        return str(workbook.path)
+
+    def write_sheet(self, table: TableConfig, batches: Iterable[ColumnBatch], path: str) -> int:
+        """
+        Stream column batches into the table's sheet of the shared workbook
+        (see file_converter.excel.ExcelWriter), rolling over to new sheets at
+        Excel's row limit. Without an open workbook, a workbook holding just
+        this table is written to path. Returns the row count.
+        """
+        from file_converter.excel import ExcelWriter
+        from . import writers
+        schema = writers.arrow_schema(self.logical_types(table))
+        workbook = self.workbook if self.workbook is not None else ExcelWriter(path)
+        sheet = workbook.sheet(table.name, schema)
+        for batch in batches:
+            sheet.write(writers.to_record_batch(batch, schema))
+        if workbook is not self.workbook:
+            workbook.close()
+        return sheet.n_rows
+
+    def write_load_script(self, configs: Sequence[TableConfig]) -> Optional[str]:
+        """
+        For 'pgcopy' output, write the psql script that loads the tables'
+        COPY files (see sql.write_pg_load_script). Returns its path, or None
+        for other formats.
+        """
+        if self.output.fmt != "pgcopy":
+            return None
+        from .sql import LOAD_SCRIPT, write_pg_load_script
+        return write_pg_load_script(
+            os.path.join(self.output_dir, LOAD_SCRIPT), configs,
+            types={cfg.name: self.logical_types(cfg) for cfg in configs},
+            files={cfg.name: self.table_path(cfg) for cfg in configs},
+            copy_format=self.output.copy_format,
+        )
+
+    # ---- generate + export
+
+    def export_table(self, config: TableConfig, chunk_size: int = 0, workers: int = 0) -> Tuple[str, int]:
+        """
+        Generate a table and write it in the configured output format
+        (CSV by default). Returns (path, n_rows).
+
+        The table is generated in deterministic shards (see iter_shards),
+        across a process pool with workers > 0 (see parallel.py) and in this
+        process otherwise, so the output only depends on the seed and
+        chunk_size. With chunk_size > 0 the shards are streamed in chunks of
+        that many rows; by default each shard is generated in memory as one
+        batch.
+
+        With an Instrumentation attached, the table's timings are recorded.
+        """
+        if self.instrument is None:
+            return self._export_table(config, chunk_size, workers)
+        self.instrument.table_start(config.name, config.n_rows)
+        path, n_rows = self._export_table(config, chunk_size, workers)
+        self.instrument.table_end(config.name, path, n_rows)
+        return path, n_rows
+
+    def _export_table(self, config: TableConfig, chunk_size: int, workers: int) -> Tuple[str, int]:
+        if workers > 0:
+            from .parallel import export_sharded
+            paths, n_rows = export_sharded(self, config, workers=workers,
+                                           chunk_size=chunk_size or DEFAULT_SHARD_ROWS)
+            return paths[0], n_rows
+        if self.output.is_dataset():
+            from file_converter.dataset import clear_dataset
+            clear_dataset(self.table_path(config))
+        return self.write_shards(config, chunk_size)
+
+    # ---- incremental append
+
+    def load_keys(self, config: TableConfig) -> Optional[int]:
+        """
+        Read the PK column of the table's existing output into its key store
+        (see append.py), so new rows and child tables can build on it.
+        Returns the existing row count, or None if the table has no output
+        yet.
+        """
+        from .append import check_appendable, count_rows, load_keys, output_exists
+        check_appendable(self.output)
+        path = self.table_path(config)
+        if not output_exists(path, self.output, config):
+            return None
+        if config.pk_column() is None:
+            self.keys.pop(config.name, None)
+            return count_rows(path, self.output, config)
+        store = load_keys(path, self.output, config)
+        self.keys[config.name] = store
+        return len(store)
+
+    def append_table(self, config: TableConfig, chunk_size: int = 0) -> Tuple[str, int]:
+        """
+        Add config.n_rows new rows to the table's existing output, without
+        rewriting it or regenerating its parents: only the PK columns of
+        the table are read back (its parents' were loaded when they were
+        appended to). New int keys continue after the existing ones and
+        new uuid keys avoid them. A table without output yet is exported
+        as usual. Returns (path, rows added).
+
+        The new rows are drawn from a random state derived from the seed and
+        the existing row count. Unique columns continue the permutation of
+        the first run, so they stay unique if the seed is the same and their
+        domain (for unique FKs: the parent's row count) has not changed.
+        """
+        existing = self.load_keys(config)
+        if existing is None:
+            return self.export_table(config, chunk_size)
+        self.compile(config)
+        self._check_fk_refs(config)
+        path = self.table_path(config)
+        if config.n_rows == 0:
+            return path, 0
+        if self.seed is None and any(c.unique for c in config.columns):
+            print(f"Warning: appending to unique columns of '{config.name}' without a seed may repeat existing values.")
+
+        total = dataclasses.replace(config, n_rows=existing + config.n_rows)
+        seed = derive_seed(self.seed, "append", existing) if self.seed is not None else None
+        dg = self._with_seed(seed)
+        dg.unique_seed = self.unique_seed
+        chunk_size = chunk_size or config.n_rows
+        batches = (dg._gen_batch(total, min(chunk_size, total.n_rows - start), start)
+                   for start in range(existing, total.n_rows, chunk_size))
+
+        if self.instrument is not None:
+            self.instrument.table_start(config.name, config.n_rows)
+        path, n_rows = dg.write_batches(total, batches, path, append=True)
+        if self.instrument is not None:
+            self.instrument.table_end(config.name, path, n_rows)
+        return path, n_rows
@@ -0,0 +1,247 @@
+# fake_data_generator/instrument.py
+"""
+Instrumentation for generation runs.
+
+An Instrumentation attached to a DataGenerator records, per table, the
+generation time of every column, the write time, bytes written, rows/sec
+and the process's peak memory, and emits live progress events. Hooks
+receive the events; ProgressHook prints a live status line and
+JsonReportHook writes the timing report at the end of the run. Subclass
+Hook to forward metrics to another collector.
+
+The generator only checks `instrument is not None` once per batch, so a
+run without instrumentation pays nothing per row.
+"""
+
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+REPORT_FILE = "fakegen-report.json"    # default report name in the output folder
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process (and of finished child processes) in MB."""
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024     # bytes on macOS, KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / scale
+
+
+def _disk_size(path: str) -> int:
+    """Size of an output file, or of all files under a dataset folder."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+@dataclass
+class TableMetrics:
+    name: str
+    n_rows: int = 0
+    rows_done: int = 0
+    path: str = ""
+    start: float = 0.0               # perf_counter at table start
+    total_seconds: float = 0.0
+    gen_seconds: float = 0.0         # sum of column generation time (over all workers if sharded)
+    write_seconds: Optional[float] = 0.0   # the rest: formatting, encoding, I/O not overlapped with
+                                           # generation by the writer thread (None if sharded)
+    sharded: bool = False
+    bytes_written: int = 0
+    peak_rss_mb: Optional[float] = None
+    columns: Dict[str, float] = field(default_factory=dict)   # column -> generation seconds
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.n_rows / self.total_seconds if self.total_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        del data["start"]
+        data["rows_per_sec"] = round(self.rows_per_sec, 1)
+        return data
+
+
+class Hook:
+    """Instrumentation event receiver. Override the events you need."""
+
+    def table_start(self, metrics: TableMetrics):
+        pass
+
+    def progress(self, metrics: TableMetrics):
+        pass
+
+    def table_end(self, metrics: TableMetrics):
+        pass
+
+    def run_end(self, tables: List[TableMetrics]):
+        pass
+
+
+class Instrumentation:
+    """Collects per-table metrics and dispatches them to hooks (thread-safe)."""
+
+    def __init__(self, hooks: Iterable[Hook] = ()):
+        self.hooks: List[Hook] = list(hooks)
+        self.tables: Dict[str, TableMetrics] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def _emit(self, event: str, *args):
+        for hook in self.hooks:
+            getattr(hook, event)(*args)
+
+    def _metrics(self, table: str) -> TableMetrics:
+        metrics = self.tables.get(table)
+        if metrics is None:
+            metrics = self.tables[table] = TableMetrics(table, start=time.perf_counter())
+        return metrics
+
+    # ---- events from the generator
+
+    def table_start(self, table: str, n_rows: int):
+        with self._lock:
+            metrics = self.tables[table] = TableMetrics(table, n_rows=n_rows, start=time.perf_counter())
+            self._emit("table_start", metrics)
+
+    def column_time(self, table: str, column: str, seconds: float, worker: bool = False):
+        """Add generation time of a column; worker=True for time spent in a shard worker process."""
+        with self._lock:
+            metrics = self._metrics(table)
+            metrics.sharded = metrics.sharded or worker
+            metrics.columns[column] = metrics.columns.get(column, 0.0) + seconds
+            metrics.gen_seconds += seconds
+
+    def gen_time(self, table: str, seconds: float):
+        """Generation time not attributed to single columns (per-row engine)."""
+        with self._lock:
+            self._metrics(table).gen_seconds += seconds
+
+    def progress(self, table: str, rows: int):
+        with self._lock:
+            metrics = self._metrics(table)
+            metrics.rows_done += rows
+            self._emit("progress", metrics)
+
+    def table_end(self, table: str, path: str, n_rows: int):
+        with self._lock:
+            metrics = self._metrics(table)
+            metrics.total_seconds = time.perf_counter() - metrics.start
+            if not metrics.sharded:
+                metrics.write_seconds = max(metrics.total_seconds - metrics.gen_seconds, 0.0)
+            else:
+                metrics.write_seconds = None    # workers generate and write in parallel
+            metrics.n_rows = metrics.rows_done = n_rows
+            metrics.path = path
+            metrics.bytes_written = _disk_size(path) if path else 0
+            metrics.peak_rss_mb = peak_rss_mb()
+            self._emit("table_end", metrics)
+
+    def finish(self):
+        """End of the run: hand all table metrics to the hooks."""
+        with self._lock:
+            self._emit("run_end", list(self.tables.values()))
+
+    # ---- reporting
+
+    def to_dict(self) -> dict:
+        tables = [m.to_dict() for m in self.tables.values()]
+        return {
+            "tables": tables,
+            "total_rows": sum(t["n_rows"] for t in tables),
+            "total_bytes": sum(t["bytes_written"] for t in tables),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+# ---- built-in hooks
+
+class ProgressHook(Hook):
+    """Live one-line progress of the tables being generated, e.g. '⏳ Orders 42% (1.2M rows/s)'."""
+
+    def __init__(self, interval: float = 0.5, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.active: Dict[str, TableMetrics] = {}
+        self._last = 0.0
+
+    def _render(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        parts = []
+        for m in self.active.values():
+            elapsed = now - m.start
+            rate = m.rows_done / elapsed if elapsed else 0.0
+            pct = f"{m.rows_done * 100 // m.n_rows}%" if m.n_rows else "-"
+            parts.append(f"{m.name} {pct} ({rate:,.0f} rows/s)")
+        self.stream.write("\r\033[K" + ("⏳ " + " | ".join(parts) if parts else ""))
+        self.stream.flush()
+
+    def table_start(self, metrics):
+        self.active[metrics.name] = metrics
+        self._render()
+
+    def progress(self, metrics):
+        self._render()
+
+    def table_end(self, metrics):
+        # Clear the line so the caller's "saved" message starts clean; the next event redraws it
+        self.active.pop(metrics.name, None)
+        self.stream.write("\r\033[K")
+        self.stream.flush()
+
+
+class JsonReportHook(Hook):
+    """Write the timing report of the whole run to a JSON file."""
+
+    def __init__(self, instrument: Instrumentation, path: str):
+        self.instrument = instrument
+        self.path = path
+
+    def run_end(self, tables):
+        self.instrument.write_json(self.path)
+
+
+def make_instrumentation(report_path: Optional[str] = None, progress: bool = True) -> Instrumentation:
+    """Instrumentation with live progress and, if report_path is given, a JSON report at the end."""
+    inst = Instrumentation([ProgressHook()] if progress else [])
+    if report_path:
+        inst.add_hook(JsonReportHook(inst, report_path))
+    return inst
+
+
+def summary(tables: List[TableMetrics]) -> str:
+    """Human-readable per-table and per-column timing breakdown."""
+    lines = ["Generation profile:"]
+    for m in tables:
+        rss = f", peak {m.peak_rss_mb:.0f} MB" if m.peak_rss_mb is not None else ""
+        if m.sharded:
+            split = f"generate {m.gen_seconds:.2f}s across workers"
+        else:
+            split = f"generate {m.gen_seconds:.2f}s, write {m.write_seconds:.2f}s"
+        lines.append(f"  {m.name}: {m.n_rows} rows in {m.total_seconds:.2f}s ({m.rows_per_sec:,.0f} rows/s), "
+                     f"{split}, {m.bytes_written / 1e6:.1f} MB{rss}")
+        for column, seconds in sorted(m.columns.items(), key=lambda kv: -kv[1]):
+            lines.append(f"      {column:<20} {seconds:8.3f}s")
+    return "\n".join(lines)
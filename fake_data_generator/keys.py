@@ -0,0 +1,157 @@
+# fake_data_generator/keys.py
+"""
+Compact primary-key stores used to resolve FK columns.
+
+A KeyStore keeps only the PK values of a generated table:
+- uuid keys: packed 16-byte values (dtype V16), formatted to text on write
+- int keys : surrogate keys 1..n, stored as a single counter
+
+FK columns are filled by drawing all parent indices in one call.
+
+Keys read back from existing output (see append.py) are added with
+add_existing(); new uuid keys are then redrawn if they clash with them.
+"""
+
+from __future__ import annotations
+import uuid
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+UUID_DTYPE = np.dtype("V16")
+KEY_FORMATS = ("uuid", "int")
+
+
+def new_uuids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Draw n random (version 4) UUIDs as a packed V16 array."""
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw.view(UUID_DTYPE).ravel()
+
+
+def format_uuids(packed: np.ndarray) -> List[str]:
+    """Format a packed V16 array as canonical UUID strings."""
+    h = packed.tobytes().hex()
+    return [f"{h[i:i+8]}-{h[i+8:i+12]}-{h[i+12:i+16]}-{h[i+16:i+20]}-{h[i+20:i+32]}"
+            for i in range(0, len(h), 32)]
+
+
+def pack_uuids(values: Sequence[str]) -> np.ndarray:
+    """Pack UUID strings into a V16 array."""
+    try:
+        # Canonical strings: one hex decode for the whole sequence
+        raw = bytes.fromhex("".join(values).replace("-", ""))
+    except ValueError:
+        raw = b""
+    if len(raw) != 16 * len(values):
+        raw = b"".join(uuid.UUID(v).bytes for v in values)
+    return np.frombuffer(raw, dtype=UUID_DTYPE)
+
+
+class KeyStore:
+    def __init__(self, column: str, key_format: str = "uuid", offset: int = 0):
+        if key_format not in KEY_FORMATS:
+            raise ValueError(f"Unknown key format '{key_format}'. Supported: {KEY_FORMATS}")
+        self.column = column
+        self.key_format = key_format
+        self.offset = offset          # int keys start at offset + 1
+        self._chunks: List[np.ndarray] = []
+        self._packed: Optional[np.ndarray] = None
+        self._size = 0
+        self._existing: Optional[np.ndarray] = None   # sorted S16 view of keys from existing output
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        if self.key_format == "int":
+            return 0
+        return self._size * UUID_DTYPE.itemsize
+
+    def new_keys(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Create n new keys, add them to the store and return them."""
+        if self.key_format == "int":
+            first = self.offset + self._size + 1
+            keys = np.arange(first, first + n, dtype=np.int64)
+            self._size += n
+            return keys
+        keys = new_uuids(rng, n)
+        if self._existing is not None:
+            clash = self._clashes(keys)
+            while clash.any():
+                keys[clash] = new_uuids(rng, int(clash.sum()))
+                clash = self._clashes(keys)
+        self.add(keys)
+        return keys
+
+    def _clashes(self, keys: np.ndarray) -> np.ndarray:
+        """Mask of the uuid keys that are already in the existing output."""
+        probe = keys.view("S16")
+        pos = np.minimum(np.searchsorted(self._existing, probe), len(self._existing) - 1)
+        return self._existing[pos] == probe
+
+    def add(self, keys: np.ndarray):
+        """Add existing keys (packed V16 for uuid stores)."""
+        if self.key_format == "int":
+            self.add_range(len(keys))
+            return
+        self._chunks.append(keys)
+        self._packed = None
+        self._size += len(keys)
+
+    def add_existing(self, keys: np.ndarray):
+        """
+        Add the keys of rows already written (packed V16 or int64 for int
+        stores, which must hold the keys 1..n). New uuid keys are kept
+        distinct from them.
+        """
+        if self.key_format == "int":
+            self.add_range(len(keys))
+            return
+        self.add(keys)
+        if len(keys):
+            existing = np.sort(keys.view("S16"))
+            if self._existing is not None:
+                existing = np.sort(np.concatenate([self._existing, existing]))
+            self._existing = existing
+
+    def add_range(self, n: int):
+        """Add the next n surrogate keys of an int store without materialising them."""
+        if self.key_format != "int":
+            raise ValueError("add_range() is only supported for int key stores")
+        self._size += n
+
+    def values(self) -> np.ndarray:
+        """All keys as one array (packed V16 or int64)."""
+        if self.key_format == "int":
+            return np.arange(self.offset + 1, self.offset + self._size + 1, dtype=np.int64)
+        if self._packed is None:
+            if len(self._chunks) == 1:
+                self._packed = self._chunks[0]      # no copy (may be a shared-memory view)
+            elif self._chunks:
+                self._packed = np.concatenate(self._chunks)
+            else:
+                self._packed = np.empty(0, dtype=UUID_DTYPE)
+            self._chunks = [self._packed]
+        return self._packed
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Draw n keys uniformly with replacement, in one random-index draw."""
+        if self.key_format == "int":
+            return rng.integers(self.offset + 1, self.offset + self._size, size=n, endpoint=True, dtype=np.int64)
+        packed = self.values()
+        return packed[rng.integers(0, len(packed), size=n)]
+
+    def take(self, idx: np.ndarray) -> np.ndarray:
+        """Keys at the given positions (unique FK columns)."""
+        if self.key_format == "int":
+            return self.offset + 1 + np.asarray(idx, dtype=np.int64)
+        return self.values()[np.asarray(idx, dtype=np.intp)]
+
+    def format(self, keys: np.ndarray) -> list:
+        """Keys as Python values (UUID strings or ints)."""
+        if self.key_format == "int":
+            return keys.tolist()
+        return format_uuids(keys)
@@ -0,0 +1,254 @@
+# fake_data_generator/parallel.py
+"""
+Sharded multi-process generation.
+
+A table's rows are split into fixed-size shards, generated across a
+process pool. Each shard is seeded from (master seed, table name, shard
+index), so the output is byte-identical whatever the number of workers.
+Parent key stores are shared with workers through shared memory so FK
+columns resolve without copying the parent keys into every task.
+"""
+
+from __future__ import annotations
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .generator import DEFAULT_CHUNK_SIZE, DEFAULT_SHARD_ROWS, DataGenerator, shard_manifest, shard_seed
+from .instrument import Instrumentation
+from .keys import UUID_DTYPE, KeyStore
+from .schema import OutputConfig, TableConfig
+
+
+# ---- shared parent keys
+
+@dataclass
+class SharedKeys:
+    """Picklable handle to a parent key store placed in shared memory."""
+    table: str
+    column: str
+    key_format: str
+    size: int
+    shm_name: Optional[str] = None
+
+    @classmethod
+    def share(cls, table: str, store: KeyStore) -> Tuple["SharedKeys", Optional[SharedMemory]]:
+        """Copy a key store into shared memory (int stores need no memory)."""
+        if store.key_format == "int" or len(store) == 0:
+            return cls(table, store.column, store.key_format, len(store)), None
+        packed = store.values()
+        shm = SharedMemory(create=True, size=packed.nbytes)
+        np.ndarray(packed.shape, dtype=UUID_DTYPE, buffer=shm.buf)[:] = packed
+        return cls(table, store.column, store.key_format, len(store), shm.name), shm
+
+    def attach(self) -> Tuple[KeyStore, Optional[SharedMemory]]:
+        """Rebuild the key store in a worker, viewing the shared buffer."""
+        store = KeyStore(self.column, self.key_format)
+        if self.shm_name is None:
+            if self.key_format == "int":
+                store.add_range(self.size)
+            return store, None
+        shm = SharedMemory(name=self.shm_name)
+        store.add(np.ndarray((self.size,), dtype=UUID_DTYPE, buffer=shm.buf))
+        return store, shm
+
+
+# ---- shard worker
+
+@dataclass
+class ShardTask:
+    output_dir: str
+    config: TableConfig
+    index: int
+    start: int
+    n_rows: int
+    seed: int
+    chunk_size: int
+    path: str
+    parents: List[SharedKeys] = field(default_factory=list)
+    locale: str = "en_US"
+    pool_cache_dir: Optional[str] = None
+    output: OutputConfig = field(default_factory=OutputConfig)
+    instrument: bool = False        # collect per-column timings in the worker
+    unique_seed: int = 0            # shared by all shards, see DataGenerator.unique_seed
+    header: bool = True             # CSV header (only the first part has one when parts are merged)
+    write_queue: int = 0            # see DataGenerator.write_queue
+
+
+ShardResult = Tuple[str, int, Optional[np.ndarray], Optional[Dict[str, float]]]
+
+
+def _run_shard(task: ShardTask) -> ShardResult:
+    """
+    Generate one shard to its part file.
+    Returns (path, n_rows, packed uuid keys, column timings if instrumented).
+    """
+    attached: List[SharedMemory] = []
+    try:
+        dg = DataGenerator(task.output_dir, seed=task.seed,
+                           locale=task.locale, pool_cache_dir=task.pool_cache_dir,
+                           output=task.output, instrument=Instrumentation() if task.instrument else None,
+                           write_queue=task.write_queue)
+        for ref in task.parents:
+            store, shm = ref.attach()
+            dg.keys[ref.table] = store
+            if shm is not None:
+                attached.append(shm)
+        dg.unique_seed = task.unique_seed
+
+        config = task.config
+        pk_col = config.pk_column()
+        store = None
+        if pk_col is not None:
+            store = KeyStore(pk_col.name, pk_col.key_format, offset=task.start)
+            dg.keys[config.name] = store
+
+        chunk = task.chunk_size
+        batches = (dg._gen_batch(config, min(chunk, task.n_rows - s), task.start + s)
+                   for s in range(0, task.n_rows, chunk))
+        path, n_rows = dg.write_batches(config, batches, path=task.path, header=task.header, shard=task.index)
+
+        keys = store.values() if store is not None and store.key_format == "uuid" else None
+        timings = dg.instrument.tables[config.name].columns if task.instrument and n_rows else None
+        return path, n_rows, keys, timings
+    finally:
+        for shm in attached:
+            shm.close()
+
+
+# ---- driver
+
+def _record_shard(dg: DataGenerator, config: TableConfig, result: ShardResult) -> ShardResult:
+    """Forward a finished shard's timings and row count to dg's instrumentation."""
+    if dg.instrument is not None:
+        _, rows, _, timings = result
+        for column, seconds in (timings or {}).items():
+            dg.instrument.column_time(config.name, column, seconds, worker=True)
+        dg.instrument.progress(config.name, rows)
+    return result
+
+
+def _merge_parts(parts: List[str], path: str, output: OutputConfig):
+    """
+    Concatenate part files in order into one output file and remove them.
+    CSV parts after the first have no header, so they are appended byte for
+    byte (gzip members and zstd frames concatenate into a valid stream).
+    """
+    if output.fmt == "pgcopy":
+        from .sql import merge_pgcopy
+        merge_pgcopy(parts, path, output.copy_format)
+    elif output.fmt == "parquet":
+        from .writers import merge_parquet
+        merge_parquet(parts, path, output)
+    elif output.fmt == "feather":
+        from .writers import merge_feather
+        merge_feather(parts, path, output)
+    else:
+        with open(path, "wb") as dst:
+            for part in parts:
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, dst)
+    for part in parts:
+        os.remove(part)
+
+
+def export_sharded(
+    dg: DataGenerator,
+    config: TableConfig,
+    workers: int,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    merge: bool = True,
+) -> Tuple[List[str], int]:
+    """
+    Generate a table in shards across a process pool and write it in the
+    generator's output format.
+
+    Returns (paths, n_rows): one merged '<name>.<ext>' if merge is True,
+    otherwise the '<name>.part-NNNNN.<ext>' files in shard order. The
+    table's key store is rebuilt in dg so child tables can reference it.
+
+    Dataset output is always one folder: shards write their files into it
+    side by side and their manifests are merged. Shards are aligned to
+    whole files when the files have a fixed row count.
+    """
+    if workers < 1 or shard_rows < 1 or chunk_size < 1:
+        raise ValueError("workers, shard_rows and chunk_size must be positive")
+    if dg.output.fmt == "sqlite":
+        raise ValueError("SQLite output is loaded by a single process: use workers=0")
+    if dg.output.fmt == "xlsx":
+        raise ValueError("An Excel workbook is written by a single process: use workers=0")
+    dg._check_fk_refs(config)
+    dataset = dg.output.is_dataset()
+    if dataset:
+        from file_converter.dataset import clear_dataset
+        clear_dataset(dg.table_path(config))
+    master_seed = dg.seed if dg.seed is not None else int(dg.rng.integers(2**63))
+    bounds = dg.shard_bounds(config, shard_rows)
+
+    parents: List[SharedKeys] = []
+    owned: List[SharedMemory] = []
+    try:
+        for ref_table in dict.fromkeys(c.ref_table for c in config.columns if c.col_type == 'fk'):
+            handle, shm = SharedKeys.share(ref_table, dg.keys[ref_table])
+            parents.append(handle)
+            if shm is not None:
+                owned.append(shm)
+
+        tasks = [
+            ShardTask(
+                output_dir=dg.output_dir,
+                config=config,
+                index=i,
+                start=start,
+                n_rows=rows,
+                seed=shard_seed(master_seed, config.name, i),
+                chunk_size=chunk_size,
+                path=dg.table_path(config) if dataset else dg.table_path(config, suffix=f".part-{i:05d}"),
+                parents=parents,
+                locale=dg.locale,
+                pool_cache_dir=dg.pool_cache_dir,
+                output=dg.output,
+                instrument=dg.instrument is not None,
+                unique_seed=dg.unique_seed,
+                header=not merge or i == 0,
+                write_queue=dg.write_queue,
+            )
+            for i, (start, rows) in enumerate(bounds)
+        ]
+
+        if workers == 1 or len(tasks) == 1:
+            results = [_record_shard(dg, config, _run_shard(t)) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                results = [_record_shard(dg, config, r) for r in pool.map(_run_shard, tasks)]
+    finally:
+        for shm in owned:
+            shm.close()
+            shm.unlink()
+
+    # Rebuild the table's key store in shard order
+    store = dg._start_keys(config)
+    if store is not None:
+        for _, rows, keys, _ in results:
+            if keys is not None:
+                store.add(keys)
+            else:
+                store.add_range(rows)
+
+    parts = [path for path, _, _, _ in results]
+    total = sum(rows for _, rows, _, _ in results)
+    if dataset:
+        from file_converter.dataset import merge_manifests
+        merge_manifests(parts[0], [shard_manifest(t.index) for t in tasks])
+        return [parts[0]], total
+    if not merge:
+        return parts, total
+    path = dg.table_path(config)
+    _merge_parts(parts, path, dg.output)
+    return [path], total
@@ -0,0 +1,87 @@
+# fake_data_generator/pipeline.py
+"""
+Pipelined writing: overlap generation with serialisation and disk I/O.
+
+write_pipelined() runs a writer function on a background thread and feeds
+it the batches produced by the calling thread through a bounded queue.
+The queue depth caps the number of generated batches waiting in memory:
+when the writer falls behind, generation blocks (back-pressure).
+
+CSV encoding, Parquet/Arrow encoding, compression and file writes run
+mostly in C code that releases the GIL, so they proceed while the NumPy
+generation of the next chunk runs.
+"""
+
+from __future__ import annotations
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, TypeVar
+
+DEFAULT_QUEUE_DEPTH = 2     # batches buffered between generation and the writer
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_END = object()      # no more batches
+_ABORT = object()    # generation failed: the writer must not finish the file
+
+
+class GenerationAborted(Exception):
+    """Raised inside the writer when the producer failed."""
+
+
+def write_pipelined(write: Callable[[Iterable[T]], R], items: Iterable[T],
+                    depth: int = DEFAULT_QUEUE_DEPTH) -> R:
+    """
+    Call write(batches) on a writer thread while items are produced on this
+    one, with at most depth batches in flight. Returns write()'s result and
+    re-raises errors from either side.
+    """
+    if depth < 1:
+        raise ValueError("depth must be positive")
+    buffer: "queue.Queue[object]" = queue.Queue(maxsize=depth)
+    done = threading.Event()
+    outcome: dict = {}
+
+    def feed() -> Iterator[T]:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if item is _ABORT:
+                raise GenerationAborted("generation failed")
+            yield item
+
+    def run():
+        try:
+            outcome["result"] = write(feed())
+        except BaseException as e:    # handed to the producer thread
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    def put(item) -> bool:
+        # Block while the queue is full, unless the writer has stopped
+        while not done.is_set():
+            try:
+                buffer.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    writer = threading.Thread(target=run, name="fakegen-writer", daemon=True)
+    writer.start()
+    try:
+        for item in items:
+            if not put(item):
+                break
+    except BaseException:
+        put(_ABORT)
+        writer.join()
+        raise
+    put(_END)
+    writer.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,521 @@
+# fake_data_generator/plan.py
+"""
+Schema compilation for Fake Data Generator.
+
+compile_table() validates a TableConfig once, reporting every problem in
+a single SchemaError, and turns it into a TablePlan: one specialised
+ColumnGenerator per column, with bounds and lookups precomputed. The
+generation engines then run the plan without re-checking anything per
+cell, and a plan can be reused across runs.
+
+Column types are looked up in a registry, so new types are added with
+@register_column_type instead of another if/elif branch.
+
+Unique columns are checked here against the size of their domain, so an
+impossible row count fails before anything is generated.
+
+Columns with a skewed distribution get a sampler of domain indexes (see
+distributions.py) and map the indexes to values with take(), the same
+index-to-value mapping unique columns use.
+"""
+
+from __future__ import annotations
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+from .distributions import distribution_errors, make_sampler
+from .keys import KEY_FORMATS, KeyStore
+from .pools import FAKER_TYPES, faker_value, get_pool
+from .schema import ColumnConfig, TableConfig
+from .unique import check_pool, permute, permute_rounds, suffix_values
+
+if TYPE_CHECKING:
+    from .generator import DataGenerator
+
+
+class SchemaError(ValueError):
+    """Raised with every validation error found in a schema."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Invalid schema:\n  - " + "\n  - ".join(errors))
+
+
+# ---- column generators
+
+class ColumnGenerator:
+    """A validated, executable generator for one column."""
+
+    col_type = ""
+    # Logical output type: 'string' | 'int' | 'float' | 'bool' | 'date' | 'key'
+    # ('key' resolves to 'uuid' or 'int' from the key format, see TablePlan.logical_types)
+    logical_type = "string"
+    # True if the type can generate unique values (see domain_size / take)
+    supports_unique = False
+
+    def __init__(self, col: ColumnConfig, table: TableConfig):
+        self.col = col
+        self.table = table
+        # Index sampler of a skewed column (None = uniform, see distributions.py)
+        self.sampler = make_sampler(col, self.sample_size(col) or 0)
+
+    @classmethod
+    def validate(cls, col: ColumnConfig) -> List[str]:
+        """Return the problems with a column config (empty if valid)."""
+        return []
+
+    def generate(self, dg: "DataGenerator", n: int) -> np.ndarray:
+        """Generate n values in one batched call (nulls excluded)."""
+        raise NotImplementedError
+
+    def value(self, dg: "DataGenerator") -> Any:
+        """Generate a single Python value (per-row engine)."""
+        raise NotImplementedError
+
+    # ---- unique columns
+
+    @classmethod
+    def domain_size(cls, col: ColumnConfig) -> Optional[int]:
+        """Number of distinct values of a valid column (None = unbounded or known only when generating)."""
+        return None
+
+    def domain(self, dg: "DataGenerator") -> Optional[int]:
+        """Number of distinct values available when generating (None = unbounded)."""
+        return self.domain_size(self.col)
+
+    def unique_indexes(self, dg: "DataGenerator", rows: np.ndarray, seed: int) -> np.ndarray:
+        """Distinct domain indexes of the given table rows (a keyed permutation of the domain)."""
+        return permute(rows, self.domain(dg), seed)
+
+    def take(self, dg: "DataGenerator", idx: np.ndarray) -> np.ndarray:
+        """The distinct values at the given domain indexes (as generate() would return them)."""
+        raise NotImplementedError
+
+    def python_values(self, dg: "DataGenerator", values: np.ndarray) -> list:
+        """Batch values as the Python values value() returns (per-row engine)."""
+        return values.tolist()
+
+    # ---- skewed columns
+
+    @classmethod
+    def sample_size(cls, col: ColumnConfig) -> Optional[int]:
+        """Number of indexes a skewed column draws from (its domain by default)."""
+        return cls.domain_size(col)
+
+    def skewed(self, dg: "DataGenerator", n: int) -> np.ndarray:
+        """n values drawn through the column's sampler."""
+        return self.take(dg, self.sampler.indexes(dg.rng, n))
+
+    def skewed_value(self, dg: "DataGenerator") -> Any:
+        return self.python_values(dg, self.skewed(dg, 1))[0]
+
+
+COLUMN_TYPES: Dict[str, Type[ColumnGenerator]] = {}   # col_type -> generator class
+
+
+def register_column_type(*col_types: str):
+    """Class decorator registering a ColumnGenerator for one or more column types."""
+    def decorator(cls: Type[ColumnGenerator]) -> Type[ColumnGenerator]:
+        for col_type in col_types:
+            COLUMN_TYPES[col_type] = cls
+        return cls
+    return decorator
+
+
+@register_column_type("pk")
+class PkGenerator(ColumnGenerator):
+    logical_type = "key"
+    supports_unique = True      # always unique
+
+    @classmethod
+    def validate(cls, col):
+        if col.key_format not in KEY_FORMATS:
+            return [f"Unknown key format '{col.key_format}' for column '{col.name}'. Supported: {KEY_FORMATS}"]
+        return []
+
+    def generate(self, dg, n):
+        return dg.keys[self.table.name].new_keys(dg.rng, n)
+
+    def value(self, dg):
+        if self.col.key_format == "int":
+            # Continue the table's surrogate keys (starting a store if the table has none yet)
+            store = dg.keys.setdefault(self.table.name, KeyStore(self.col.name, "int"))
+            return int(store.new_keys(dg.rng, 1)[0])
+        return str(uuid.UUID(int=dg.random.getrandbits(128), version=4))
+
+
+@register_column_type("fk")
+class FkGenerator(ColumnGenerator):
+    logical_type = "key"
+    supports_unique = True      # one child row per parent row at most
+
+    @classmethod
+    def validate(cls, col):
+        if not col.ref_table or not col.ref_column:
+            return [f"FK column '{col.name}' must reference a table.column"]
+        return []
+
+    def _fit_sampler(self, dg):
+        # The domain is the parent key store, known only once the parent is generated
+        size = len(dg.keys[self.col.ref_table])
+        if self.sampler is None or self.sampler.size != size:
+            self.sampler = make_sampler(self.col, size)
+
+    def generate(self, dg, n):
+        self._fit_sampler(dg)
+        if self.sampler is not None:
+            return self.skewed(dg, n)
+        return dg.keys[self.col.ref_table].sample(dg.rng, n)
+
+    def value(self, dg):
+        self._fit_sampler(dg)
+        if self.sampler is not None:
+            return self.skewed_value(dg)
+        store = dg.keys[self.col.ref_table]
+        return store.format(store.sample(dg.rng, 1))[0]
+
+    def domain(self, dg):
+        return len(dg.keys[self.col.ref_table])
+
+    def take(self, dg, idx):
+        return dg.keys[self.col.ref_table].take(idx)
+
+    def python_values(self, dg, values):
+        return dg.keys[self.col.ref_table].format(values)
+
+
+@register_column_type(*FAKER_TYPES)
+class FakerGenerator(ColumnGenerator):
+    supports_unique = True      # pool values, suffixed once the pool is used up
+    unique_pool_size = 10_000   # pool of unique columns without a pool_size
+
+    @classmethod
+    def validate(cls, col):
+        if col.pool_size is not None and col.pool_size < 1:
+            return [f"Pool size must be positive for column '{col.name}'"]
+        return []
+
+    def generate(self, dg, n):
+        if self.col.pool_size:
+            pool = get_pool(self.col.col_type, self.col.pool_size, dg.locale, dg.pool_cache_dir)
+            return pool[dg.rng.integers(0, len(pool), size=n)]
+        return np.array([faker_value(dg.fake, self.col.col_type) for _ in range(n)], dtype=object)
+
+    def value(self, dg):
+        return faker_value(dg.fake, self.col.col_type)
+
+    def _unique_pool(self, dg):
+        return get_pool(self.col.col_type, self.col.pool_size or self.unique_pool_size, dg.locale, dg.pool_cache_dir)
+
+    def unique_indexes(self, dg, rows, seed):
+        # Unbounded domain: permute pool-sized rounds, independently of the row count
+        return permute_rounds(rows, len(self._unique_pool(dg)), seed)
+
+    def take(self, dg, idx):
+        col_type = self.col.col_type
+        pool = self._unique_pool(dg)
+        problem = check_pool(col_type, pool) if len(idx) and int(idx.max()) >= len(pool) else None
+        if problem:
+            raise ValueError(f"Cannot generate unique values for column '{self.col.name}': {problem}")
+        return suffix_values(col_type, pool, idx)
+
+
+@register_column_type("date")
+class DateGenerator(ColumnGenerator):
+    logical_type = "date"
+    supports_unique = True
+
+    def __init__(self, col, table):
+        super().__init__(col, table)
+        self.start = np.datetime64(col.date_start.strftime("%Y-%m-%d"), "D")
+        self.days = (col.date_end - col.date_start).days
+
+    @classmethod
+    def validate(cls, col):
+        start, end = col.date_start, col.date_end
+        if not start or not end or start > end:
+            return [f"Invalid date bounds for column '{col.name}'"]
+        return []
+
+    def generate(self, dg, n):
+        return self.start + dg.rng.integers(0, self.days, size=n, endpoint=True)
+
+    def value(self, dg):
+        offset = dg.random.randint(0, self.days)
+        return (self.col.date_start + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+    @classmethod
+    def domain_size(cls, col):
+        return (col.date_end - col.date_start).days + 1
+
+    def take(self, dg, idx):
+        return self.start + idx.astype(np.int64)
+
+    def python_values(self, dg, values):
+        return np.datetime_as_string(values, unit="D").tolist()
+
+
+@register_column_type("number")
+class NumberGenerator(ColumnGenerator):
+    logical_type = "int"
+    supports_unique = True
+
+    @classmethod
+    def validate(cls, col):
+        if col.num_min is None or col.num_max is None or col.num_min > col.num_max:
+            return [f"Invalid number bounds for column '{col.name}'"]
+        return []
+
+    def generate(self, dg, n):
+        if self.sampler is not None:
+            return self.skewed(dg, n)
+        return dg.rng.integers(self.col.num_min, self.col.num_max, size=n, endpoint=True)
+
+    def value(self, dg):
+        if self.sampler is not None:
+            return self.skewed_value(dg)
+        return dg.random.randint(self.col.num_min, self.col.num_max)
+
+    @classmethod
+    def domain_size(cls, col):
+        return col.num_max - col.num_min + 1
+
+    def take(self, dg, idx):
+        return self.col.num_min + idx.astype(np.int64)
+
+
+@register_column_type("float")
+class FloatGenerator(ColumnGenerator):
+    logical_type = "float"
+    supports_unique = True      # over the 0.01 grid between the bounds
+
+    @classmethod
+    def validate(cls, col):
+        if col.float_min is None or col.float_max is None or col.float_min > col.float_max:
+            return [f"Invalid float bounds for column '{col.name}'"]
+        return []
+
+    def generate(self, dg, n):
+        if self.sampler is not None:
+            return self.skewed(dg, n)
+        return np.round(dg.rng.uniform(self.col.float_min, self.col.float_max, size=n), 2)
+
+    def value(self, dg):
+        if self.sampler is not None:
+            return self.skewed_value(dg)
+        return round(dg.random.uniform(self.col.float_min, self.col.float_max), 2)
+
+    @staticmethod
+    def _grid(col) -> tuple:
+        """First and last multiple of 0.01 within the bounds, in hundredths."""
+        return math.ceil(round(col.float_min * 100, 6)), math.floor(round(col.float_max * 100, 6))
+
+    @classmethod
+    def domain_size(cls, col):
+        lo, hi = cls._grid(col)
+        return max(hi - lo + 1, 0)
+
+    def take(self, dg, idx):
+        lo, _ = self._grid(self.col)
+        return np.round((lo + idx.astype(np.int64)) / 100, 2)
+
+
+@register_column_type("boolean")
+class BooleanGenerator(ColumnGenerator):
+    logical_type = "bool"
+    supports_unique = True
+
+    def generate(self, dg, n):
+        return dg.rng.random(n) < 0.5
+
+    def value(self, dg):
+        return dg.random.random() < 0.5
+
+    @classmethod
+    def domain_size(cls, col):
+        return 2
+
+    def take(self, dg, idx):
+        return idx.astype(bool)
+
+
+@register_column_type("choice")
+class ChoiceGenerator(ColumnGenerator):
+    supports_unique = True
+
+    def __init__(self, col, table):
+        super().__init__(col, table)
+        self.choices = np.array(col.choices, dtype=object)
+
+    @classmethod
+    def validate(cls, col):
+        if not col.choices:
+            return [f"No choices provided for column '{col.name}'"]
+        return []
+
+    def generate(self, dg, n):
+        if self.sampler is not None:
+            return self.choices[self.sampler.indexes(dg.rng, n)]
+        return self.choices[dg.rng.integers(0, len(self.choices), size=n)]
+
+    def value(self, dg):
+        if self.sampler is not None:
+            return self.choices[self.sampler.indexes(dg.rng, 1)[0]]
+        return dg.random.choice(self.col.choices)
+
+    @classmethod
+    def domain_size(cls, col):
+        return len(set(col.choices))
+
+    @classmethod
+    def sample_size(cls, col):
+        return len(col.choices)     # duplicates included: 'weighted' has one weight per entry
+
+    def take(self, dg, idx):
+        return np.array(list(dict.fromkeys(self.col.choices)), dtype=object)[idx.astype(np.intp)]
+
+
+# ---- plans
+
+@dataclass
+class ColumnPlan:
+    col: ColumnConfig
+    generator: ColumnGenerator
+    null_prob: float = 0.0      # 0 when the column is not nullable
+    unique: bool = False        # values drawn without repetition (never set for PKs)
+
+    @property
+    def name(self) -> str:
+        return self.col.name
+
+
+@dataclass
+class TablePlan:
+    config: TableConfig
+    columns: List[ColumnPlan]
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    # Helper: get the PK column plan
+    def pk(self) -> Optional[ColumnPlan]:
+        for cp in self.columns:
+            if cp.col.col_type == 'pk':
+                return cp
+        return None
+
+    # Helper: get FK column plans
+    def fks(self) -> List[ColumnPlan]:
+        return [cp for cp in self.columns if cp.col.col_type == 'fk']
+
+    def logical_types(self, key_formats: Dict[str, str]) -> Dict[str, str]:
+        """
+        Logical type of every column, in order. key_formats maps table name
+        to its PK key format and resolves 'key' columns to 'uuid' or 'int'.
+        """
+        types: Dict[str, str] = {}
+        for cp in self.columns:
+            t = cp.generator.logical_type
+            if t == "key":
+                if cp.col.col_type == 'pk':
+                    fmt = cp.col.key_format
+                else:
+                    fmt = key_formats.get(cp.col.ref_table, "uuid")
+                t = "int" if fmt == "int" else "uuid"
+            types[cp.name] = t
+        return types
+
+
+def _unique_errors(cls: Type[ColumnGenerator], col: ColumnConfig, n_rows: int) -> List[str]:
+    if not cls.supports_unique:
+        return [f"Column '{col.name}' ({col.col_type}) does not support unique values"]
+    size = cls.domain_size(col)
+    if size is not None and size < n_rows:
+        return [f"Unique column '{col.name}' has only {size} distinct values for {n_rows} rows"]
+    return []
+
+
+def _table_errors(config: TableConfig) -> List[str]:
+    errors: List[str] = []
+    if config.n_rows < 0:
+        errors.append(f"Row count must be >= 0 (got {config.n_rows})")
+    names = [c.name for c in config.columns]
+    for name in sorted({n for n in names if names.count(n) > 1}):
+        errors.append(f"Duplicate column name '{name}'")
+    if sum(1 for c in config.columns if c.col_type == 'pk') > 1:
+        errors.append("A table can have at most one PK column")
+    for col in config.columns:
+        cls = COLUMN_TYPES.get(col.col_type)
+        if cls is None:
+            errors.append(f"Unknown column type '{col.col_type}' for column '{col.name}'")
+            continue
+        if col.nullable and not 0.0 <= col.null_prob <= 1.0:
+            errors.append(f"null_prob must be between 0 and 1 for column '{col.name}'")
+        col_errors = cls.validate(col) or distribution_errors(col)
+        errors.extend(col_errors)
+        if col.unique and not col_errors:
+            errors.extend(_unique_errors(cls, col, config.n_rows))
+    return [f"{config.name}: {e}" for e in errors]
+
+
+def compile_table(config: TableConfig) -> TablePlan:
+    """Validate a table config and compile it into a TablePlan."""
+    errors = _table_errors(config)
+    if errors:
+        raise SchemaError(errors)
+    columns = [
+        ColumnPlan(
+            col=col,
+            generator=COLUMN_TYPES[col.col_type](col, config),
+            null_prob=col.null_prob if col.nullable and col.col_type != 'pk' else 0.0,
+            unique=col.unique and col.col_type != 'pk',
+        )
+        for col in config.columns
+    ]
+    return TablePlan(config, columns)
+
+
+def compile_schema(configs: Sequence[TableConfig]) -> List[TablePlan]:
+    """
+    Validate a whole schema up front and compile every table.
+
+    On top of the per-table checks, FK columns must reference the PK of a
+    table in the schema, and a unique FK column cannot have more rows than
+    its parent table. All errors are reported together.
+    """
+    errors: List[str] = []
+    by_name: Dict[str, TableConfig] = {}
+    for cfg in configs:
+        if cfg.name in by_name:
+            errors.append(f"Duplicate table name '{cfg.name}'")
+        by_name[cfg.name] = cfg
+        errors.extend(_table_errors(cfg))
+
+    for cfg in configs:
+        for col in cfg.columns:
+            if col.col_type != 'fk' or not col.ref_table:
+                continue
+            parent = by_name.get(col.ref_table)
+            if parent is None:
+                errors.append(f"{cfg.name}: FK column '{col.name}' references unknown table '{col.ref_table}'")
+                continue
+            pk = parent.pk_column()
+            if pk is None or pk.name != col.ref_column:
+                errors.append(
+                    f"{cfg.name}: FK column '{col.name}' must reference the PK of '{col.ref_table}'"
+                )
+            elif col.unique and parent.n_rows < cfg.n_rows:
+                errors.append(
+                    f"{cfg.name}: Unique FK column '{col.name}' has only {parent.n_rows} parent rows "
+                    f"for {cfg.n_rows} rows"
+                )
+
+    if errors:
+        raise SchemaError(errors)
+    return [compile_table(cfg) for cfg in configs]
@@ -0,0 +1,87 @@
+# fake_data_generator/pools.py
+"""
+Pre-generated value pools for Faker-backed column types.
+
+Calling Faker once per cell costs tens of microseconds. A pool holds N
+distinct values generated once per (locale, column type, pool size), and
+columns are filled by sampling indices into it. Pools are deterministic
+for a given key, optionally cached on disk, and shared by every column
+(and shard) that asks for the same key.
+"""
+
+from __future__ import annotations
+import os
+import zlib
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+FAKER_TYPES = ("name", "email", "address")
+POOL_CACHE_ENV = "FAKEGEN_POOL_CACHE"   # default on-disk cache directory
+
+_pools: Dict[Tuple[str, int, str], np.ndarray] = {}   # in-process cache: (col_type, size, locale) -> pool
+
+
+def faker_value(fake: Faker, col_type: str) -> str:
+    """One Faker value for a Faker-backed column type."""
+    if col_type == "name":
+        return fake.name()
+    elif col_type == "email":
+        return fake.email()
+    elif col_type == "address":
+        return fake.address().replace("\n", ", ")
+    raise ValueError(f"'{col_type}' is not a Faker-backed column type")
+
+
+def _build_pool(col_type: str, size: int, locale: str) -> np.ndarray:
+    """Generate up to size distinct values with a Faker seeded from the pool key."""
+    from faker import Faker
+    fake = Faker(locale)
+    fake.seed_instance(zlib.crc32(f"{locale}:{col_type}:{size}".encode("utf-8")))
+    values: Dict[str, None] = {}
+    attempts = 0
+    while len(values) < size and attempts < size * 10:
+        values[faker_value(fake, col_type)] = None
+        attempts += 1
+    return np.array(list(values), dtype=object)
+
+
+def _cache_path(cache_dir: str, col_type: str, size: int, locale: str) -> str:
+    return os.path.join(cache_dir, f"{locale}-{col_type}-{size}.txt")
+
+
+def get_pool(col_type: str, size: int, locale: str = "en_US", cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Return the pool of distinct values for (col_type, size, locale).
+
+    Looks in the in-process cache, then in cache_dir (if given), and builds
+    and stores the pool otherwise.
+    """
+    if col_type not in FAKER_TYPES:
+        raise ValueError(f"Pools are only available for {FAKER_TYPES}, not '{col_type}'")
+    if size < 1:
+        raise ValueError("Pool size must be positive")
+
+    key = (col_type, size, locale)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    path = _cache_path(cache_dir, col_type, size, locale) if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            pool = np.array(f.read().split("\n"), dtype=object)
+    else:
+        pool = _build_pool(col_type, size, locale)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.tmp-{os.getpid()}"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("\n".join(pool.tolist()))
+            os.replace(tmp, path)
+
+    _pools[key] = pool
+    return pool
@@ -3,11 +3,36 @@
 Prebuilt schema generator: Users, Products, Orders.
 """
 
+import os
 from datetime import datetime
 from .schema import TableConfig, ColumnConfig
 from .generator import DataGenerator
+from .instrument import REPORT_FILE, make_instrumentation, summary
+from .plan import SchemaError
+from .scheduler import TableTiming, run_schema
 from . import prompts
 
+def print_saved(timing: TableTiming):
+    """Report a finished table."""
+    name = os.path.basename(timing.path)
+    if not name.startswith(timing.name):
+        name = f"{timing.name} ({name})"     # tables sharing a database file
+    print(f"✅ {name} saved with {timing.n_rows} rows at {timing.path}")
+
+def print_appended(timing: TableTiming):
+    """Report a table appended to."""
+    print(f"✅ {timing.name}: {timing.n_rows} rows appended at {timing.path}")
+
+def check_append(output) -> bool:
+    """Print why the output cannot be appended to, if it cannot."""
+    from .append import check_appendable
+    try:
+        check_appendable(output)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    return True
+
 def run_prebuilt():
     """
     Run the prebuilt schema generation flow:
@@ -17,26 +42,39 @@ def run_prebuilt():
     """
     print("\n--- Prebuilt Schema: Users, Products, Orders ---")
     out_dir = prompts.input_with_default("Enter output folder path", "./fake_data")
+    append = prompts.input_append(out_dir)
 
-    # Row counts
+    # Row counts (rows to add when appending)
     n_users = prompts.input_int("Number of Users", default=100, min_val=0)
     n_products = prompts.input_int("Number of Products", default=50, min_val=0)
     n_orders = 0
-    if n_users > 0 and n_products > 0:
+    if append or (n_users > 0 and n_products > 0):
         n_orders = prompts.input_int("Number of Orders", default=200, min_val=0)
     else:
         print("Orders will have 0 rows because Users or Products is 0.")
 
-    dg = DataGenerator(out_dir)
+    pool_size = prompts.input_pool_size() or None
+    output = prompts.input_output_config()
+    if append and not check_append(output):
+        return
+    chunk_size = prompts.input_chunk_size()
+    workers = 0 if append else prompts.input_workers(output=output)
+    seed = prompts.input_seed()
+    profiling = prompts.input_profiling()
+    dg = DataGenerator(out_dir, seed=seed, output=output)
+    instrument = None
+    if profiling:
+        # Report next to the output, in the folder the generator resolved (e.g. '~' expanded)
+        instrument = dg.instrument = make_instrumentation(os.path.join(dg.output_dir, REPORT_FILE))
 
     # Table definitions
     users_cfg = TableConfig(
         name="Users",
         columns=[
             ColumnConfig("user_id", "pk"),
-            ColumnConfig("name", "name"),
-            ColumnConfig("email", "email"),
-            ColumnConfig("address", "address"),
+            ColumnConfig("name", "name", pool_size=pool_size),
+            ColumnConfig("email", "email", pool_size=pool_size),
+            ColumnConfig("address", "address", pool_size=pool_size),
         ],
         n_rows=n_users,
     )
@@ -63,8 +101,15 @@ def run_prebuilt():
         n_rows=n_orders,
     )
 
-    # Generate tables in dependency order
-    for cfg in [users_cfg, products_cfg, orders_cfg]:
-        rows = dg.generate_table(cfg)
-        path = dg.write_csv(cfg, rows)
-        print(f"✅ {cfg.name}.csv saved with {len(rows)} rows at {path}")
+    # Generate tables in dependency order (independent tables run concurrently)
+    try:
+        report = run_schema(dg, [users_cfg, products_cfg, orders_cfg],
+                            chunk_size=chunk_size, workers=workers, append=append,
+                            on_table_done=print_appended if append else print_saved)
+    except SchemaError as e:
+        print(f"❌ {e}")
+        return
+    print(report.summary())
+    if instrument is not None:
+        print(summary(list(instrument.tables.values())))
+        print(f"✅ Timing report saved at {os.path.join(dg.output_dir, REPORT_FILE)}")
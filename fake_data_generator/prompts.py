@@ -3,9 +3,12 @@
 All input helpers for the CLI.
 """
 
-from typing import List
+import os
+from typing import List, Optional
 from datetime import datetime
 
+from .schema import OutputConfig
+
 def input_with_default(prompt: str, default: str = "") -> str:
     val = input(f"{prompt} [{default}]: ").strip()
     return val if val else default
@@ -74,3 +77,115 @@ def input_comma_separated(prompt: str, min_items: int = 1) -> List[str]:
 
 def input_nullable(prompt: str, default: bool = False) -> bool:
     return input_yesno(f"{prompt} (Allow null values?)", default=default)
+
+def input_unique(default: bool = False) -> bool:
+    return input_yesno("Unique values? (fails upfront if the range is too small for the row count)", default=default)
+
+def input_distribution(choices: Optional[List[str]] = None) -> dict:
+    """Distribution of a fk/number/float/choice column, as ColumnConfig keyword arguments ({} = uniform)."""
+    from .distributions import DEFAULT_PARAMS
+    options = ["uniform", "zipf", "normal", "exponential"] + (["weighted"] if choices else [])
+    while True:
+        dist = input_with_default(f"Value distribution {options}", "uniform").lower()
+        if dist in options:
+            break
+        print("Invalid choice. Try again.")
+    if dist == "uniform":
+        return {}
+    if dist == "weighted":
+        while True:
+            items = input_comma_separated(f"Weights for {', '.join(choices)}", min_items=len(choices))
+            try:
+                weights = [float(w) for w in items]
+            except ValueError:
+                weights = []
+            if len(weights) == len(choices) and min(weights) >= 0 and sum(weights) > 0:
+                return {"distribution": dist, "weights": weights}
+            print("Please enter one non-negative weight per choice.")
+    label = {
+        "zipf": "Zipf exponent (higher = more skewed)",
+        "normal": "Standard deviation, as a fraction of the range",
+        "exponential": "Mean, as a fraction of the range",
+    }[dist]
+    return {"distribution": dist, "dist_param": input_float(label, DEFAULT_PARAMS[dist], min_val=0.001)}
+
+def input_chunk_size(default: int = 100_000) -> int:
+    return input_int("Rows per chunk for streaming write, overlapped with generation (0 = whole table in memory)",
+                     default=default, min_val=0)
+
+def input_workers(default: int = 0, output: Optional[OutputConfig] = None) -> int:
+    if output is not None and output.fmt in ("sqlite", "xlsx"):
+        return 0    # one process loads the database / writes the workbook
+    return input_int("Worker processes for sharded generation (0 = single process)", default=default, min_val=0)
+
+def input_seed() -> Optional[int]:
+    while True:
+        val = input_with_default("Random seed (empty = random)", "")
+        if not val:
+            return None
+        try:
+            return int(val)
+        except ValueError:
+            print("Please enter a valid integer.")
+
+def input_pool_size(default: int = 0) -> int:
+    return input_int("Faker value pool size for name/email/address (0 = one Faker call per row)", default=default, min_val=0)
+
+def input_output_config() -> OutputConfig:
+    fmt = input_choice("Output format", ["csv", "parquet", "feather", "sqlite", "pgcopy", "xlsx"])
+    if fmt == "parquet":
+        compression = input_choice("Compression", ["snappy", "zstd", "gzip", "none"])
+        row_group_size = input_int("Rows per row group", default=1_000_000, min_val=1)
+        return input_dataset(OutputConfig(fmt, compression=compression, row_group_size=row_group_size))
+    if fmt == "feather":
+        compression = input_choice("Compression", ["lz4", "zstd", "none"])
+        return OutputConfig(fmt, compression=compression)
+    if fmt == "sqlite":
+        return OutputConfig(fmt, database=input_with_default("Database file name", "fakegen.db"))
+    if fmt == "pgcopy":
+        return OutputConfig(fmt, copy_format=input_choice("COPY format", ["text", "binary"]))
+    if fmt == "xlsx":
+        return OutputConfig(fmt, workbook=input_with_default("Workbook file name", "fakegen.xlsx"))
+    compression = input_choice("Compression", ["none", "gzip", "zstd"])
+    if compression != "none":
+        return OutputConfig(fmt, compression=compression)
+    return input_dataset(OutputConfig(fmt))
+
+def input_dataset(output: OutputConfig) -> OutputConfig:
+    """Optionally write every table as a folder of split / partitioned files."""
+    from file_converter.dataset import parse_partition, parse_size
+    if not input_yesno("Write each table as a folder of files (split rows/size, partitions)?", default=False):
+        return output
+    output.split_files = input_int("Number of files per table (0 = split by rows/size instead)",
+                                   default=0, min_val=0) or None
+    if output.split_files is None:
+        output.split_rows = input_int("Rows per file (0 = no limit)", default=0, min_val=0) or None
+        while True:
+            size = input_with_default("Approximate file size, e.g. 256MB (empty = no limit)", "")
+            try:
+                output.split_bytes = parse_size(size) if size else None
+                break
+            except ValueError as e:
+                print(e)
+    while True:
+        partition = input_with_default("Partition by column, e.g. country or order_date:month (empty = none)", "")
+        try:
+            if partition:
+                parse_partition(partition)
+            output.partition_by = partition or None
+            break
+        except ValueError as e:
+            print(e)
+    if not output.is_dataset():
+        output.split_files = 1      # a folder with one file and its manifest
+    return output
+
+def input_append(out_dir: str) -> bool:
+    """Ask whether to add rows to the tables already in out_dir (only if it has files)."""
+    out_dir = os.path.expanduser(out_dir)
+    if not os.path.isdir(out_dir) or not os.listdir(out_dir):
+        return False
+    return input_yesno("Append to the existing output in this folder (row counts = rows to add)?", default=False)
+
+def input_profiling() -> bool:
+    return input_yesno("Show live progress and save a timing report (fakegen-report.json)?", default=False)
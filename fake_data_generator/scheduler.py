@@ -0,0 +1,170 @@
+# fake_data_generator/scheduler.py
+"""
+Dependency-graph scheduler for multi-table schemas.
+
+Builds the FK dependency DAG from ColumnConfig.ref_table, rejects cycles,
+and generates tables concurrently: a table starts as soon as all of its
+parents have finished (and so their key stores are complete). Each table
+runs on its own DataGenerator.for_table() clone, so with a seed the output
+does not depend on scheduling order. The run report lists per-table wall
+time and the critical path.
+"""
+
+from __future__ import annotations
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .generator import DataGenerator
+from .plan import SchemaError, compile_schema
+from .schema import TableConfig
+
+
+def build_dag(configs: Sequence[TableConfig]) -> Dict[str, Set[str]]:
+    """Map every table to the set of tables it references through FKs."""
+    return {
+        cfg.name: {c.ref_table for c in cfg.columns if c.col_type == 'fk' and c.ref_table}
+        for cfg in configs
+    }
+
+
+def topological_order(dag: Dict[str, Set[str]]) -> List[str]:
+    """Order tables parents-first (stable w.r.t. input order); raise SchemaError on cycles."""
+    remaining = {name: set(parents) for name, parents in dag.items()}
+    order: List[str] = []
+    while remaining:
+        ready = [name for name, parents in remaining.items() if not parents & remaining.keys()]
+        if not ready:
+            raise SchemaError([f"FK cycle between tables: {', '.join(sorted(remaining))}"])
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+    return order
+
+
+@dataclass
+class TableTiming:
+    name: str
+    start: float = 0.0     # seconds since the run started
+    end: float = 0.0
+    n_rows: int = 0
+    path: str = ""
+
+    @property
+    def wall_time(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class ScheduleReport:
+    timings: Dict[str, TableTiming] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_time: float = 0.0
+    wall_time: float = 0.0
+    load_script: Optional[str] = None    # psql script for 'pgcopy' output
+
+    def summary(self) -> str:
+        lines = ["Table timings:"]
+        for t in sorted(self.timings.values(), key=lambda t: t.start):
+            lines.append(f"  {t.name:<20} {t.wall_time:8.2f}s  ({t.n_rows} rows, "
+                         f"started at {t.start:.2f}s)")
+        lines.append(f"Critical path: {' → '.join(self.critical_path)} ({self.critical_time:.2f}s)")
+        lines.append(f"Total wall time: {self.wall_time:.2f}s")
+        if self.load_script:
+            lines.append(f"Postgres load script: {self.load_script}")
+        return "\n".join(lines)
+
+
+def _critical_path(dag: Dict[str, Set[str]], order: List[str],
+                   timings: Dict[str, TableTiming]) -> Tuple[List[str], float]:
+    """Longest chain of dependent tables by wall time."""
+    best: Dict[str, float] = {}
+    prev: Dict[str, Optional[str]] = {}
+    for name in order:
+        parent = max(dag[name], key=lambda p: best[p], default=None)
+        best[name] = timings[name].wall_time + (best[parent] if parent else 0.0)
+        prev[name] = parent
+    if not best:
+        return [], 0.0
+    node: Optional[str] = max(best, key=best.get)
+    total = best[node]
+    path: List[str] = []
+    while node is not None:
+        path.append(node)
+        node = prev[node]
+    return path[::-1], total
+
+
+def run_schema(
+    dg: DataGenerator,
+    configs: Sequence[TableConfig],
+    chunk_size: int = 0,
+    workers: int = 0,
+    max_parallel: Optional[int] = None,
+    on_table_done: Optional[Callable[[TableTiming], None]] = None,
+    append: bool = False,
+) -> ScheduleReport:
+    """
+    Validate a schema and generate all of its tables, running independent
+    tables concurrently (up to max_parallel at a time, default: CPU count).
+    chunk_size and workers are passed to DataGenerator.export_table().
+
+    With append, n_rows is the number of rows to add to each table's
+    existing output (see DataGenerator.append_table); tables run in
+    process, so workers is not used. Tables adding no rows are only read
+    (their PK column) if a table adding rows references them.
+    """
+    compile_schema(configs)
+    if append:
+        from .append import check_appendable
+        check_appendable(dg.output)
+    dag = build_dag(configs)
+    order = topological_order(dag)
+    by_name = {cfg.name: cfg for cfg in configs}
+    referenced = {c.ref_table for cfg in configs if cfg.n_rows > 0 for c in cfg.columns if c.col_type == "fk"}
+    max_parallel = max_parallel or min(len(configs), os.cpu_count() or 1) or 1
+
+    report = ScheduleReport()
+    t0 = time.perf_counter()
+    dg.open_workbook([by_name[name] for name in order])
+
+    def run_one(name: str) -> TableTiming:
+        timing = TableTiming(name, start=time.perf_counter() - t0)
+        cfg = by_name[name]
+        if not append:
+            timing.path, timing.n_rows = dg.for_table(name).export_table(cfg, chunk_size=chunk_size, workers=workers)
+        elif cfg.n_rows > 0 or name in referenced:
+            timing.path, timing.n_rows = dg.for_table(name).append_table(cfg, chunk_size=chunk_size)
+        else:
+            timing.path = dg.table_path(cfg)
+        timing.end = time.perf_counter() - t0
+        return timing
+
+    done: Set[str] = set()
+    pending = list(order)
+    running: Dict[Future, str] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            while pending or running:
+                for name in [n for n in pending if dag[n] <= done]:
+                    pending.remove(name)
+                    running[pool.submit(run_one, name)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    timing = future.result()
+                    report.timings[name] = timing
+                    done.add(name)
+                    if on_table_done:
+                        on_table_done(timing)
+    finally:
+        dg.close_workbook()
+
+    report.wall_time = time.perf_counter() - t0
+    report.critical_path, report.critical_time = _critical_path(dag, order, report.timings)
+    report.load_script = dg.write_load_script([by_name[name] for name in order])
+    if dg.instrument is not None:
+        dg.instrument.finish()
+    return report
@@ -3,18 +3,26 @@
 Schema definitions for Fake Data Generator.
 
 Contains TableConfig and ColumnConfig dataclasses, including support for:
-- Primary keys (pk)
+- Primary keys (pk), as UUIDs or integer surrogate keys
 - Foreign keys (fk)
 - Nullable columns
+- Unique columns
+- Skewed value distributions (zipf, normal, exponential, weighted)
 - Faker-backed types (name, email, address)
 - Date, number, float, boolean, choice types
+
+and OutputConfig, describing the output file format (or database sink, or
+Excel workbook).
 """
 
 from __future__ import annotations
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
 
+CSV_COMPRESSION = {"gzip": ".gz", "zstd": ".zst"}   # streaming CSV codecs -> file suffix
+
 ColumnType = str  # 'pk' | 'fk' | 'name' | 'email' | 'address' | 'date' | 'number' | 'float' | 'boolean' | 'choice'
 
 @dataclass
@@ -25,6 +33,9 @@ class ColumnConfig:
     nullable: bool = False        # If True, column can have null values
     null_prob: float = 0.2        # Probability of null if nullable
 
+    # PK key format: 'uuid' (random UUIDs) | 'int' (surrogate keys 1..n)
+    key_format: str = "uuid"
+
     # FK reference
     ref_table: Optional[str] = None
     ref_column: Optional[str] = None
@@ -44,6 +55,20 @@ class ColumnConfig:
     # Choice options
     choices: Optional[List[str]] = None
 
+    # Faker-backed types: sample from a pool of this many distinct values
+    # instead of calling Faker per row (None = one Faker call per value)
+    pool_size: Optional[int] = None
+
+    # Unique values: no two non-null values of the column are equal
+    # (validated against the size of the column's domain, see unique.py)
+    unique: bool = False
+
+    # Value distribution of fk/number/float/choice columns (see distributions.py):
+    # 'uniform' (None) | 'zipf' | 'normal' | 'exponential' | 'weighted'
+    distribution: Optional[str] = None
+    dist_param: Optional[float] = None      # zipf exponent; normal std / exponential mean as a fraction of the range
+    weights: Optional[List[float]] = None   # 'weighted': one weight per choice
+
 @dataclass
 class TableConfig:
     name: str
@@ -60,3 +85,34 @@ class TableConfig:
     # Helper: get column names in order
     def column_names(self) -> List[str]:
         return [c.name for c in self.columns]
+
+@dataclass
+class OutputConfig:
+    fmt: str = "csv"                    # 'csv' | 'parquet' | 'feather' | 'sqlite' | 'pgcopy' | 'xlsx'
+    compression: Optional[str] = None   # parquet: 'snappy' (default), 'zstd', 'gzip', 'none'; feather: 'lz4', 'zstd';
+                                        # csv: 'gzip', 'zstd', None/'none' (plain text)
+    row_group_size: int = 1_000_000     # parquet: rows per row group
+    database: str = "fakegen.db"        # sqlite: database file in the output folder (all tables)
+    workbook: str = "fakegen.xlsx"      # xlsx: workbook in the output folder (one sheet per table)
+    copy_format: str = "text"           # pgcopy: Postgres COPY 'text' or 'binary' format
+    # Dataset output (csv/parquet): each table becomes a folder of files plus _manifest.json
+    split_rows: Optional[int] = None    # rows per file
+    split_bytes: Optional[int] = None   # roll to a new file at about this many bytes
+    split_files: Optional[int] = None   # number of files per table (per partition when partitioned)
+    partition_by: Optional[str] = None  # 'column' or 'column:year|month|day' (tables that have the column)
+
+    # Helper: is every table written as a dataset folder?
+    def is_dataset(self) -> bool:
+        return bool(self.split_rows or self.split_bytes or self.split_files or self.partition_by)
+
+    # Helper: file extension for the format
+    def extension(self) -> str:
+        if self.fmt == "csv" and self.compression in CSV_COMPRESSION:
+            return f".csv{CSV_COMPRESSION[self.compression]}"
+        if self.fmt == "pgcopy":
+            return ".copy" if self.copy_format == "text" else ".pgcopy"
+        if self.fmt == "sqlite":
+            return os.path.splitext(self.database)[1]
+        if self.fmt == "xlsx":
+            return os.path.splitext(self.workbook)[1]
+        return f".{self.fmt}"
@@ -0,0 +1,335 @@
+# fake_data_generator/sql.py
+"""
+Database sinks for generated tables.
+
+- SQLite: write_sqlite() loads column batches straight into a database
+  file with the standard library sqlite3 module. Tables are created typed
+  from the plan's logical types, rows go in with one transaction per
+  batch, and indexes (UUID primary keys, unique columns, FK columns) are
+  built once after the load.
+- Postgres: write_pgcopy() writes a table in COPY text or binary format,
+  and write_pg_load_script() writes a psql script that creates the
+  tables, COPYs the files in and only then adds the PK/FK/UNIQUE
+  constraints and FK indexes.
+
+SQL types come from the logical column types (see plan.ColumnGenerator).
+"""
+
+from __future__ import annotations
+import os
+import sqlite3
+import struct
+import threading
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from .columnar import ColumnBatch
+from .keys import format_uuids
+from .schema import TableConfig
+
+SQL_FORMATS = ("sqlite", "pgcopy")
+COPY_FORMATS = ("text", "binary")
+LOAD_SCRIPT = "load.sql"     # psql script written next to the COPY files
+
+SQLITE_TYPES = {
+    "string": "TEXT",
+    "uuid": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "bool": "INTEGER",
+    "date": "TEXT",      # ISO 8601, as SQLite's date functions expect
+}
+
+POSTGRES_TYPES = {
+    "string": "text",
+    "uuid": "uuid",
+    "int": "bigint",
+    "float": "double precision",
+    "bool": "boolean",
+    "date": "date",
+}
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_defs(config: TableConfig, types: Dict[str, str], sql_types: Dict[str, str]) -> List[str]:
+    """Column definitions with types and NOT NULL (constraints that are cheap to check while loading)."""
+    defs = []
+    for col in config.columns:
+        line = f"{quote_ident(col.name)} {sql_types[types[col.name]]}"
+        if col.col_type == 'pk' or not col.nullable:
+            line += " NOT NULL"
+        defs.append(line)
+    return defs
+
+
+def _index_name(table: str, column: str, suffix: str) -> str:
+    return quote_ident(f"{table}_{column}_{suffix}")
+
+
+# ---- SQLite
+
+def sqlite_create_table(config: TableConfig, types: Dict[str, str]) -> str:
+    """
+    CREATE TABLE statement for SQLite. An int PK becomes INTEGER PRIMARY KEY
+    (the rowid, so it costs no index); FK references are declared inline,
+    as SQLite cannot add them later and does not check them while loading.
+    """
+    defs = []
+    for col, line in zip(config.columns, _column_defs(config, types, SQLITE_TYPES)):
+        if col.col_type == 'pk' and types[col.name] == "int":
+            line = f"{quote_ident(col.name)} INTEGER PRIMARY KEY"
+        elif col.col_type == 'fk':
+            line += f" REFERENCES {quote_ident(col.ref_table)}({quote_ident(col.ref_column)})"
+        defs.append(line)
+    return f"CREATE TABLE {quote_ident(config.name)} (\n  " + ",\n  ".join(defs) + "\n)"
+
+
+def sqlite_indexes(config: TableConfig, types: Dict[str, str]) -> List[str]:
+    """Indexes built after the load: UUID primary key, unique columns, FK columns."""
+    table = quote_ident(config.name)
+    statements = []
+    for col in config.columns:
+        column = quote_ident(col.name)
+        if col.col_type == 'pk':
+            if types[col.name] != "int":
+                statements.append(f"CREATE UNIQUE INDEX {_index_name(config.name, col.name, 'pkey')} "
+                                  f"ON {table}({column})")
+        elif col.unique:
+            statements.append(f"CREATE UNIQUE INDEX {_index_name(config.name, col.name, 'key')} "
+                              f"ON {table}({column})")
+        elif col.col_type == 'fk':
+            statements.append(f"CREATE INDEX {_index_name(config.name, col.name, 'idx')} ON {table}({column})")
+    return statements
+
+
+def _sqlite_column(batch: ColumnBatch, name: str) -> list:
+    """A column as values sqlite3 binds natively (dates as ISO text), nulls as None."""
+    values = batch.columns[name]
+    if values.dtype.kind == "V":
+        out = format_uuids(values)
+    elif values.dtype.kind == "M":
+        out = np.datetime_as_string(values, unit="D").tolist()
+    else:
+        out = values.tolist()
+    mask = batch.null_mask(name)
+    if mask is not None:
+        for i in np.flatnonzero(mask).tolist():
+            out[i] = None
+    return out
+
+
+_db_locks: Dict[str, threading.Lock] = {}
+_db_locks_guard = threading.Lock()
+
+
+def _db_lock(path: str) -> threading.Lock:
+    """One writer at a time per database file (tables of a schema load concurrently)."""
+    with _db_locks_guard:
+        return _db_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def write_sqlite(path: str, config: TableConfig, types: Dict[str, str],
+                 batches: Iterable[ColumnBatch], append: bool = False) -> int:
+    """
+    (Re)create a table in a SQLite database and load the batches into it,
+    one transaction per batch, then build its indexes. Returns the row count.
+    With append, the rows are inserted into the existing table (and kept
+    in its existing indexes).
+    """
+    lock = _db_lock(path)
+    names = config.column_names()
+    insert = (f"INSERT INTO {quote_ident(config.name)} ({', '.join(map(quote_ident, names))}) "
+              f"VALUES ({', '.join('?' * len(names))})")
+    conn = sqlite3.connect(path, timeout=600, isolation_level=None, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA synchronous = OFF")
+        if not append:
+            with lock:
+                conn.execute("BEGIN")
+                conn.execute(f"DROP TABLE IF EXISTS {quote_ident(config.name)}")
+                conn.execute(sqlite_create_table(config, types))
+                conn.execute("COMMIT")
+        n_rows = 0
+        for batch in batches:
+            rows = zip(*[_sqlite_column(batch, n) for n in names])
+            with lock:
+                conn.execute("BEGIN")
+                conn.executemany(insert, rows)
+                conn.execute("COMMIT")
+            n_rows += len(batch)
+        if not append:
+            with lock:
+                conn.execute("BEGIN")
+                for statement in sqlite_indexes(config, types):
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+        return n_rows
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+# ---- Postgres COPY
+
+_PG_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PG_TRAILER = struct.pack(">h", -1)
+_PG_NULL = struct.pack(">i", -1)
+_PG_EPOCH_DAYS = 10957      # 2000-01-01 - 1970-01-01
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_text_column(values: np.ndarray, mask) -> List[str]:
+    kind = values.dtype.kind
+    if kind == "V":
+        out = format_uuids(values)
+    elif kind == "O":
+        out = [v.translate(_TEXT_ESCAPES) for v in values.tolist()]
+    elif kind == "M":
+        out = np.datetime_as_string(values, unit="D").tolist()
+    elif kind == "b":
+        out = np.where(values, "t", "f").tolist()
+    elif kind == "f":
+        out = [repr(v) for v in values.tolist()]
+    else:
+        out = values.astype(str).tolist()
+    if mask is not None:
+        for i in np.flatnonzero(mask).tolist():
+            out[i] = "\\N"
+    return out
+
+
+def _fixed_fields(data: np.ndarray) -> List[bytes]:
+    """Length-prefixed binary fields for a fixed-width big-endian array."""
+    width = data.dtype.itemsize
+    framed = np.empty(len(data), dtype=[("len", ">i4"), ("value", data.dtype)])
+    framed["len"] = width
+    framed["value"] = data
+    raw = framed.tobytes()
+    step = width + 4
+    return [raw[i:i + step] for i in range(0, len(raw), step)]
+
+
+def _copy_binary_column(values: np.ndarray, mask) -> List[bytes]:
+    kind = values.dtype.kind
+    if kind == "V":
+        out = _fixed_fields(values)                     # packed UUIDs are the 16 wire bytes
+    elif kind == "O":
+        encoded = [v.encode("utf-8") for v in values.tolist()]
+        out = [struct.pack(">i", len(b)) + b for b in encoded]
+    elif kind == "M":
+        days = values.astype("datetime64[D]").astype(np.int64) - _PG_EPOCH_DAYS
+        out = _fixed_fields(days.astype(">i4"))
+    elif kind == "b":
+        out = _fixed_fields(values.astype(np.uint8))
+    elif kind == "f":
+        out = _fixed_fields(values.astype(">f8"))
+    else:
+        out = _fixed_fields(values.astype(">i8"))
+    if mask is not None:
+        for i in np.flatnonzero(mask).tolist():
+            out[i] = _PG_NULL
+    return out
+
+
+def write_pgcopy(path: str, config: TableConfig, batches: Iterable[ColumnBatch],
+                 copy_format: str = "text", append: bool = False) -> int:
+    """
+    Write batches as a Postgres COPY file (text or binary format). Returns
+    the row count. With append, rows are added to the end of an existing
+    text file.
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"Unknown COPY format '{copy_format}'. Supported: {COPY_FORMATS}")
+    if append and copy_format == "binary":
+        raise ValueError("Only text COPY files can be appended to")
+    names = config.column_names()
+    n_rows = 0
+    with open(path, "ab" if append else "wb") as f:
+        if copy_format == "binary":
+            f.write(_PG_HEADER)
+            field_count = struct.pack(">h", len(names))
+        for batch in batches:
+            if copy_format == "text":
+                cols = [_copy_text_column(batch.columns[n], batch.null_mask(n)) for n in names]
+                f.write(("".join("\t".join(row) + "\n" for row in zip(*cols))).encode("utf-8"))
+            else:
+                cols = [_copy_binary_column(batch.columns[n], batch.null_mask(n)) for n in names]
+                f.write(b"".join(field_count + b"".join(row) for row in zip(*cols)))
+            n_rows += len(batch)
+        if copy_format == "binary":
+            f.write(_PG_TRAILER)
+    return n_rows
+
+
+def merge_pgcopy(parts: List[str], path: str, copy_format: str):
+    """Concatenate COPY part files in order (binary: one header and one trailer)."""
+    with open(path, "wb") as dst:
+        for i, part in enumerate(parts):
+            with open(part, "rb") as src:
+                data = src.read()
+            if copy_format == "binary":
+                start = len(_PG_HEADER) if i > 0 else 0
+                end = len(data) - len(_PG_TRAILER) if i < len(parts) - 1 else len(data)
+                data = data[start:end]
+            dst.write(data)
+
+
+def pg_create_table(config: TableConfig, types: Dict[str, str]) -> str:
+    """CREATE TABLE for Postgres, without the constraints that are added after the load."""
+    defs = _column_defs(config, types, POSTGRES_TYPES)
+    return f"CREATE TABLE {quote_ident(config.name)} (\n  " + ",\n  ".join(defs) + "\n);"
+
+
+def pg_constraints(config: TableConfig) -> List[str]:
+    """PK, UNIQUE and FK constraints and FK indexes, added once the data is loaded."""
+    table = quote_ident(config.name)
+    statements = []
+    for col in config.columns:
+        column = quote_ident(col.name)
+        if col.col_type == 'pk':
+            statements.append(f"ALTER TABLE {table} ADD PRIMARY KEY ({column});")
+        elif col.unique:
+            statements.append(f"ALTER TABLE {table} ADD UNIQUE ({column});")
+    for col in config.columns:
+        if col.col_type == 'fk':
+            column = quote_ident(col.name)
+            statements.append(f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) "
+                              f"REFERENCES {quote_ident(col.ref_table)} ({quote_ident(col.ref_column)});")
+            if not col.unique:
+                statements.append(f"CREATE INDEX {_index_name(config.name, col.name, 'idx')} ON {table} ({column});")
+    return statements
+
+
+def write_pg_load_script(path: str, configs: Sequence[TableConfig], types: Dict[str, Dict[str, str]],
+                         files: Dict[str, str], copy_format: str = "text") -> str:
+    """
+    Write a psql script loading the COPY files of a schema: create tables,
+    COPY the data, then add constraints and indexes, in one transaction.
+    files maps table name to its COPY file, referenced relative to the script.
+    Run it from its folder: psql -f load.sql.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    lines = ["-- Generated by fakegen: run from this folder with  psql -f " + os.path.basename(path),
+             "\\set ON_ERROR_STOP on", "BEGIN;", ""]
+    for cfg in configs:
+        lines.append(f"DROP TABLE IF EXISTS {quote_ident(cfg.name)} CASCADE;")
+    for cfg in configs:
+        lines += ["", pg_create_table(cfg, types[cfg.name])]
+    lines.append("")
+    for cfg in configs:
+        rel = os.path.relpath(files[cfg.name], base).replace("'", "''")
+        lines.append(f"\\copy {quote_ident(cfg.name)} FROM '{rel}' WITH (FORMAT {copy_format})")
+    lines.append("")
+    for cfg in configs:
+        lines += pg_constraints(cfg)
+    lines += ["", "COMMIT;", ""]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
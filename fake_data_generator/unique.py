@@ -0,0 +1,121 @@
+# fake_data_generator/unique.py
+"""
+Unique-value columns.
+
+A unique column of n rows maps n distinct indexes of its domain (the
+column's distinct values, numbered 0..size-1) to values, see
+ColumnGenerator.take(). The indexes come from a keyed pseudo-random
+permutation of the domain evaluated at each row's global row number:
+- nothing is remembered, so cost per value is constant and never retries;
+- chunks and shards generate their rows independently and the values
+  stay unique across the whole table.
+
+The permutation is a Feistel network over the smallest even power of two
+covering the domain, with cycle walking to stay inside it.
+
+Faker-backed columns have no bounded domain: index i takes pool value
+i % len(pool), suffixed with i // len(pool) from the second round on
+(see suffix_values). Their rows are permuted round by round instead (see
+permute_rounds), so a row's value does not depend on the row count and
+rows appended later with the same seed stay distinct from earlier ones.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import numpy as np
+
+_ROUNDS = 4
+_C1 = np.uint64(0xBF58476D1CE4E5B9)
+_C2 = np.uint64(0x94D049BB133111EB)
+MAX_DOMAIN = 1 << 63        # larger domains are permuted over their first 2**63 values
+
+
+def _mix(right: np.ndarray, key: np.uint64, mask: np.uint64) -> np.ndarray:
+    """Feistel round function (splitmix64 finaliser of right ^ key)."""
+    h = (right ^ key) * _C1
+    h ^= h >> np.uint64(31)
+    h *= _C2
+    h ^= h >> np.uint64(29)
+    return h & mask
+
+
+def permute(idx: np.ndarray, size: int, seed: int) -> np.ndarray:
+    """
+    Map indexes in [0, size) to distinct indexes in [0, size), as a
+    bijection keyed by seed. Vectorised; no state beyond the seed.
+    """
+    size = min(size, MAX_DOMAIN)
+    idx = np.asarray(idx, dtype=np.uint64)
+    if len(idx) and int(idx.max()) >= size:
+        raise ValueError(f"Unique column needs {int(idx.max()) + 1} distinct values "
+                         f"but its domain has only {size}")
+    if size <= 1:
+        return idx.copy()
+
+    bits = (size - 1).bit_length()
+    half = (bits + bits % 2) // 2
+    shift, mask = np.uint64(half), np.uint64((1 << half) - 1)
+    keys = np.random.SeedSequence(seed).generate_state(_ROUNDS, np.uint64)
+
+    def feistel(x: np.ndarray) -> np.ndarray:
+        left, right = x >> shift, x & mask
+        for key in keys:
+            left, right = right, left ^ _mix(right, key, mask)
+        return (left << shift) | right
+
+    # Cycle walking: re-apply until the value falls inside the domain
+    # (the covering power of two is < 4 * size, so few rounds on average)
+    out = feistel(idx)
+    outside = np.flatnonzero(out >= size)
+    while len(outside):
+        out[outside] = feistel(out[outside])
+        outside = outside[out[outside] >= size]
+    return out
+
+
+def permute_rounds(idx: np.ndarray, block: int, seed: int) -> np.ndarray:
+    """
+    Map indexes in [0, inf) to distinct indexes: each round of block
+    consecutive indexes is permuted among itself, with a key of its own.
+    """
+    idx = np.asarray(idx, dtype=np.uint64)
+    rounds, pos = np.divmod(idx, np.uint64(block))
+    out = np.empty_like(idx)
+    for r in np.unique(rounds).tolist():
+        in_round = rounds == r
+        round_seed = int(np.random.SeedSequence([seed, r]).generate_state(1, np.uint64)[0])
+        out[in_round] = permute(pos[in_round], block, round_seed) + np.uint64(r * block)
+    return out
+
+
+def suffix_separator(col_type: str) -> str:
+    return "+" if col_type == "email" else " #"
+
+
+def suffix_values(col_type: str, pool: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """
+    Distinct values for distinct indexes: pool[i % len(pool)], with a
+    deterministic suffix for i >= len(pool) (emails: 'jane+2@example.org',
+    other types: 'Jane Doe #2'). Pool values must be distinct.
+    """
+    sep = suffix_separator(col_type)
+    rounds, pos = np.divmod(np.asarray(idx, dtype=np.int64), len(pool))
+    values = pool[pos]
+    repeat = np.flatnonzero(rounds)
+    if len(repeat):
+        if col_type == "email":
+            suffixed = [v.replace("@", f"{sep}{k}@", 1) for v, k in zip(values[repeat], rounds[repeat].tolist())]
+        else:
+            suffixed = [f"{v}{sep}{k}" for v, k in zip(values[repeat], rounds[repeat].tolist())]
+        values = values.copy()
+        values[repeat] = suffixed
+    return values
+
+
+def check_pool(col_type: str, pool: np.ndarray) -> Optional[str]:
+    """Problem with using a pool for suffixed unique values, if any."""
+    sep = suffix_separator(col_type)
+    if any(sep in v for v in pool.tolist()):
+        return f"pool values for '{col_type}' contain '{sep}', so suffixed values could collide"
+    return None
@@ -0,0 +1,114 @@
+# fake_data_generator/writers.py
+"""
+Native file writers for generated column batches.
+
+Batches are written straight to Parquet or Arrow IPC (Feather v2) with
+typed columns and real nulls, streaming one batch at a time. Parquet
+row groups are sized independently of the generation chunk size.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .columnar import ColumnBatch
+from .keys import format_uuids
+from .schema import OutputConfig
+
+OUTPUT_FORMATS = ("csv", "parquet", "feather", "sqlite", "pgcopy", "xlsx")
+
+ARROW_TYPES = {
+    "string": pa.string(),
+    "uuid": pa.string(),
+    "int": pa.int64(),
+    "float": pa.float64(),
+    "bool": pa.bool_(),
+    "date": pa.date32(),
+}
+
+
+def arrow_schema(types: Dict[str, str]) -> pa.Schema:
+    """Arrow schema from a {column: logical type} mapping."""
+    return pa.schema([pa.field(name, ARROW_TYPES[t]) for name, t in types.items()])
+
+
+def to_record_batch(batch: ColumnBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Convert a column batch to an Arrow record batch, nulls included."""
+    arrays = []
+    for f in schema:
+        values = batch.columns[f.name]
+        mask = batch.null_mask(f.name)
+        if values.dtype.kind == "V":
+            values = format_uuids(values)
+        arrays.append(pa.array(values, type=f.type, mask=mask))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _compression(output: OutputConfig, default: Optional[str]) -> Optional[str]:
+    if output.compression is None:
+        return default
+    return None if output.compression == "none" else output.compression
+
+
+def write_parquet(path: str, schema: pa.Schema, batches: Iterable[ColumnBatch], output: OutputConfig) -> int:
+    """Stream column batches to a Parquet file in row groups. Returns the row count."""
+    n_rows = 0
+    buffered: List[pa.RecordBatch] = []
+    buffered_rows = 0
+    with pq.ParquetWriter(path, schema, compression=_compression(output, "snappy")) as writer:
+        for batch in batches:
+            rb = to_record_batch(batch, schema)
+            buffered.append(rb)
+            buffered_rows += rb.num_rows
+            n_rows += rb.num_rows
+            if buffered_rows >= output.row_group_size:
+                # Write whole row groups only; carry the remainder over
+                table = pa.Table.from_batches(buffered, schema)
+                full = buffered_rows - buffered_rows % output.row_group_size
+                writer.write_table(table.slice(0, full), row_group_size=output.row_group_size)
+                rest = table.slice(full)
+                buffered, buffered_rows = rest.to_batches(), rest.num_rows
+        if buffered:
+            writer.write_table(pa.Table.from_batches(buffered, schema), row_group_size=output.row_group_size)
+    return n_rows
+
+
+def write_feather(path: str, schema: pa.Schema, batches: Iterable[ColumnBatch], output: OutputConfig) -> int:
+    """Stream column batches to an Arrow IPC (Feather v2) file. Returns the row count."""
+    n_rows = 0
+    options = ipc.IpcWriteOptions(compression=_compression(output, None))
+    with pa.OSFile(path, "wb") as sink, ipc.new_file(sink, schema, options=options) as writer:
+        for batch in batches:
+            rb = to_record_batch(batch, schema)
+            writer.write_batch(rb)
+            n_rows += rb.num_rows
+    return n_rows
+
+
+def merge_parquet(parts: List[str], path: str, output: OutputConfig):
+    """Concatenate Parquet part files row group by row group."""
+    schema = pq.read_schema(parts[0])
+    with pq.ParquetWriter(path, schema, compression=_compression(output, "snappy")) as writer:
+        for part in parts:
+            pf = pq.ParquetFile(part)
+            for i in range(pf.num_row_groups):
+                writer.write_table(pf.read_row_group(i))
+
+
+def merge_feather(parts: List[str], path: str, output: OutputConfig):
+    """Concatenate Arrow IPC part files batch by batch."""
+    options = ipc.IpcWriteOptions(compression=_compression(output, None))
+    writer = None
+    with pa.OSFile(path, "wb") as sink:
+        for part in parts:
+            with pa.memory_map(part) as source:
+                reader = ipc.open_file(source)
+                if writer is None:
+                    writer = ipc.new_file(sink, reader.schema, options=options)
+                for i in range(reader.num_record_batches):
+                    writer.write_batch(reader.get_batch(i))
+        if writer is not None:
+            writer.close()
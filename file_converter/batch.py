@@ -0,0 +1,193 @@
+# file_converter/batch.py
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .reader import SUPPORTED_FORMATS, iter_batches, read_file, read_table
+from .writer import write_batches, write_file, write_table
+
+@dataclass
+class ConvertJob:
+    input_path: Path
+    output_path: Path
+    engine: str = "pandas"
+    chunk_size: Optional[int] = None
+
+@dataclass
+class JobResult:
+    input_path: Path
+    output_path: Path
+    n_bytes: int = 0
+    error: Optional[str] = None
+
+@dataclass
+class BatchReport:
+    converted: List[JobResult] = field(default_factory=list)
+    failed: List[JobResult] = field(default_factory=list)
+    skipped: List[Path] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    def summary(self) -> str:
+        n_bytes = sum(r.n_bytes for r in self.converted)
+        elapsed = self.wall_time or 1e-9
+        lines = [
+            f"Converted {len(self.converted)} file(s), skipped {len(self.skipped)} up to date, "
+            f"{len(self.failed)} failed in {self.wall_time:.2f}s",
+            f"Throughput: {len(self.converted) / elapsed:.1f} files/s, "
+            f"{n_bytes / elapsed / 1e6:.1f} MB/s",
+        ]
+        if self.failed:
+            lines.append("Failures:")
+            lines.extend(f"  {r.input_path}: {r.error}" for r in self.failed)
+        return "\n".join(lines)
+
+def is_pattern(spec: str) -> bool:
+    return any(c in spec for c in "*?[")
+
+def glob_root(spec: str) -> Path:
+    """Leading directories of a glob pattern, up to the first one with a wildcard."""
+    root = Path()
+    for part in Path(spec).parts[:-1]:
+        if is_pattern(part):
+            break
+        root /= part
+    return root
+
+def expand_inputs(specs: Sequence[str], to: Optional[str] = None,
+                  out_dir: Optional[Path] = None) -> List[Tuple[Path, Path]]:
+    """
+    Expand files, directories and glob patterns (all supported files,
+    recursively) into (input path, path relative to its root) pairs. The
+    relative path keeps the directory layout when writing to a target
+    directory; a pattern's root is its directories before the first wildcard.
+
+    Files found in directories and patterns are left out when they look like
+    the outputs of an earlier run: already in the target format (to), or
+    inside the target directory (out_dir).
+    """
+    out_dir = out_dir.resolve() if out_dir is not None else None
+
+    def wanted(p: Path) -> bool:
+        ext = p.suffix.lower().lstrip(".")
+        if not p.is_file() or ext not in SUPPORTED_FORMATS or ext == to:
+            return False
+        return out_dir is None or out_dir not in p.resolve().parents
+
+    found = {}
+    for spec in specs:
+        path = Path(spec)
+        if is_pattern(spec):
+            root = glob_root(spec)
+            for p in sorted(Path(m) for m in glob.glob(spec, recursive=True)):
+                if wanted(p):
+                    found.setdefault(p, p.relative_to(root))
+        elif path.is_dir():
+            for p in sorted(path.rglob("*")):
+                if wanted(p):
+                    found.setdefault(p, p.relative_to(path))
+        else:
+            found.setdefault(path, Path(path.name))
+    return list(found.items())
+
+def output_path_for(input_path: Path, rel_path: Path, to: Optional[str], out_dir: Optional[Path]) -> Path:
+    """Output path for an input: same name with the target extension, under out_dir if given."""
+    if to is None:
+        # Default: CSV → Parquet, others → CSV
+        to = "parquet" if input_path.suffix.lower() == ".csv" else "csv"
+    if out_dir is None:
+        return input_path.with_suffix(f".{to}")
+    return (out_dir / rel_path).with_suffix(f".{to}")
+
+def drop_outputs(jobs: Sequence[ConvertJob]) -> List[ConvertJob]:
+    """
+    Leave out the jobs whose input is another job's output (converted by an
+    earlier run, so rewritten or skipped as up to date by that job). When two
+    files are each other's output (a.csv and a.parquet with the default
+    targets) the CSV is kept, as CSV → Parquet is the default direction.
+    """
+    by_output = {job.output_path.resolve(): job for job in jobs}
+    kept = []
+    for job in jobs:
+        source = by_output.get(job.input_path.resolve())
+        if source is None or source is job:
+            kept.append(job)
+        elif source.input_path.resolve() == job.output_path.resolve() and job.input_path.suffix.lower() == ".csv":
+            kept.append(job)
+    return kept
+
+def conflicts(jobs: Sequence[ConvertJob]) -> List[str]:
+    """Problems that would lose data: an output written twice, or an input of the run overwritten."""
+    inputs = {job.input_path.resolve(): job.input_path for job in jobs}
+    first = {}
+    problems = []
+    for job in jobs:
+        key = job.output_path.resolve()
+        other = first.setdefault(key, job.input_path)
+        if other != job.input_path:
+            problems.append(f"{other} and {job.input_path} would both be written to {job.output_path}")
+        elif key in inputs:
+            problems.append(f"{job.input_path} would overwrite the input {inputs[key]}")
+    return problems
+
+def is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    """True when the output exists and is newer than the input."""
+    try:
+        return output_path.stat().st_mtime >= input_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+def convert_one(job: ConvertJob) -> JobResult:
+    """Convert a single file. Errors are captured in the result, not raised."""
+    result = JobResult(job.input_path, job.output_path)
+    writing = False
+    try:
+        if job.input_path.resolve() == job.output_path.resolve():
+            raise ValueError("output would overwrite the input")
+        result.n_bytes = job.input_path.stat().st_size
+        job.output_path.parent.mkdir(parents=True, exist_ok=True)
+        writing = True
+        if job.chunk_size:
+            write_batches(job.output_path, iter_batches(job.input_path, job.chunk_size))
+        elif job.engine == "arrow":
+            write_table(job.output_path, read_table(job.input_path))
+        else:
+            write_file(job.output_path, read_file(job.input_path))
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        if writing:
+            # Don't leave a partial output that would look up to date next run
+            job.output_path.unlink(missing_ok=True)
+    return result
+
+def run_batch(jobs: Sequence[ConvertJob], workers: int = 0, force: bool = False) -> BatchReport:
+    """
+    Convert many files across a process pool (workers <= 1 converts inline).
+    Pool workers are reused, so the pandas/pyarrow import cost is paid once
+    per worker instead of once per file. Outputs newer than their input are
+    skipped unless force is set.
+    """
+    report = BatchReport()
+    todo = []
+    for job in jobs:
+        if not force and is_up_to_date(job.input_path, job.output_path):
+            report.skipped.append(job.input_path)
+        else:
+            todo.append(job)
+
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers <= 1:
+        results = [convert_one(job) for job in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(todo) // (workers * 4))
+            results = list(pool.map(convert_one, todo, chunksize=chunksize))
+    report.wall_time = time.perf_counter() - start
+
+    for result in results:
+        (report.failed if result.error else report.converted).append(result)
+    return report
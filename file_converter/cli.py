@@ -1,41 +1,253 @@
 # file_converter/cli.py
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, List
 import typer
-from .reader import read_file
-from .writer import write_file
+
+# The converter modules (pyarrow, and pandas for the pandas engine) are
+# imported inside the commands, so --help and usage errors return at once
+if TYPE_CHECKING:
+    from .dataset import DatasetOptions
 
 app = typer.Typer(help="Convert files between CSV, Parquet, and Excel formats.")
 
 @app.command()
 def convert(
-    input_file: str = typer.Argument(..., help="Path to input file"),
-    output_file: str = typer.Option(None, "-o", "--output", help="Path to output file")
+    inputs: List[str] = typer.Argument(..., help="Input file(s), directories or glob patterns"),
+    output_file: str = typer.Option(None, "-o", "--output", help="Path to output file (single input only)"),
+    to: str = typer.Option(None, "--to", help="Output format for converted files (csv, parquet, xlsx)"),
+    out_dir: str = typer.Option(None, "--out-dir", help="Write outputs to this directory"),
+    workers: int = typer.Option(
+        0, "--workers", min=0, help="Worker processes for batch conversion (0 = one per CPU)"
+    ),
+    force: bool = typer.Option(False, "--force", help="Convert even if the output is newer than the input"),
+    chunk_size: int = typer.Option(
+        None, "--chunk-size", min=1,
+        help="Stream the conversion in chunks of this many rows (bounded memory)"
+    ),
+    engine: str = typer.Option(
+        "pandas", "--engine",
+        help="Read/write engine: 'pandas' or 'arrow' (multithreaded CSV parsing, no NumPy round trip)"
+    ),
+    schema: str = typer.Option(
+        None, "--schema",
+        help="Column types (skips inference): a saved schema file or 'id:int64,price:double,day:date32'"
+    ),
+    save_schema_file: str = typer.Option(
+        None, "--save-schema", help="Save the schema of the converted data to this file for later runs"
+    ),
+    timings: bool = typer.Option(False, "--timings", help="Print read and write times"),
+    split_rows: int = typer.Option(
+        None, "--split-rows", min=1, help="Write a dataset folder of files with at most this many rows each"
+    ),
+    split_size: str = typer.Option(
+        None, "--split-size", help="Write a dataset folder of files of about this size each (e.g. 256MB)"
+    ),
+    files: int = typer.Option(None, "--files", min=1, help="Write a dataset folder of this many files"),
+    partition_by: str = typer.Option(
+        None, "--partition-by",
+        help="Hive-style partition folders by a column, or by 'column:year|month|day' of a date column"
+    ),
 ):
     """
-    Convert a file between supported formats.
+    Convert files between supported formats.
+    Several inputs, directories or glob patterns are converted in parallel.
+    With --split-rows, --split-size, --files or --partition-by the output is
+    a folder of files with a _manifest.json.
     """
+    from .batch import is_pattern, output_path_for
+    from .reader import ENGINES, SUPPORTED_FORMATS, iter_batches, parse_schema, read_file, read_table, save_schema
+    from .writer import output_format, write_batches, write_file, write_table
+
+    try:
+        dataset = dataset_options(split_rows, split_size, files, partition_by)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(code=1)
+    if to is not None and to.lower() not in SUPPORTED_FORMATS:
+        typer.echo(f"❌ Unsupported output format: {to}. Supported: {SUPPORTED_FORMATS}")
+        raise typer.Exit(code=1)
+    to = to.lower() if to else None
+    target_dir = Path(out_dir) if out_dir else None
+    if to == "xls":
+        typer.echo("❌ Writing .xls (Excel 97-2003) files is not supported: use --to xlsx.")
+        raise typer.Exit(code=1)
+
+    if len(inputs) > 1 or any(is_pattern(i) or Path(i).is_dir() for i in inputs):
+        if output_file or schema or save_schema_file or dataset:
+            typer.echo("❌ -o/--output, --schema, --save-schema and dataset output take a single input; "
+                       "use --to/--out-dir.")
+            raise typer.Exit(code=1)
+        convert_many(inputs, to, target_dir, engine, chunk_size, workers, force)
+        return
+
+    input_file = inputs[0]
     input_path = Path(input_file)
     if not input_path.exists():
         typer.echo(f"❌ Input file '{input_file}' does not exist.")
         raise typer.Exit(code=1)
+    if engine not in ENGINES:
+        typer.echo(f"❌ Unknown engine '{engine}'. Supported: {ENGINES}")
+        raise typer.Exit(code=1)
 
     try:
-        df = read_file(input_path)
+        arrow_schema = parse_schema(schema) if schema else None
     except Exception as e:
-        typer.echo(f"❌ Failed to read input file: {e}")
+        typer.echo(f"❌ Invalid schema: {e}")
+        raise typer.Exit(code=1)
+    if arrow_schema is not None and engine == "pandas" and not chunk_size:
+        typer.echo("❌ --schema needs --engine arrow or --chunk-size.")
         raise typer.Exit(code=1)
 
     if output_file:
         output_path = Path(output_file)
     else:
-        # Default: CSV → Parquet, others → CSV
-        default_ext = ".parquet" if input_path.suffix.lower() == ".csv" else ".csv"
-        output_path = input_path.with_suffix(default_ext)
+        output_path = output_path_for(input_path, Path(input_path.name), to, target_dir)
+        if target_dir:
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+    if dataset is not None:
+        convert_dataset(input_path, output_path, to, dataset, chunk_size or DATASET_CHUNK_SIZE,
+                        arrow_schema, save_schema_file, timings)
+        return
+    try:
+        output_format(output_path)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(code=1)
+
+    if chunk_size:
+        # Streaming path: read and write one chunk at a time
+        if output_path.resolve() == input_path.resolve():
+            typer.echo("❌ The output would overwrite the input while it is being read.")
+            raise typer.Exit(code=1)
+        seen = []
 
+        def batches():
+            for batch in iter_batches(input_path, chunk_size, arrow_schema):
+                if not seen:
+                    seen.append(batch.schema)
+                yield batch
+
+        start = time.perf_counter()
+        try:
+            # The output schema is the first chunk's: the pinned types plus the columns it does not list
+            n_rows = write_batches(output_path, batches())
+        except Exception as e:
+            output_path.unlink(missing_ok=True)     # don't leave a truncated output behind
+            typer.echo(f"❌ Failed to convert file: {e}")
+            raise typer.Exit(code=1)
+        if save_schema_file and seen:
+            save_schema(seen[0], Path(save_schema_file))
+        typer.echo(f"✅ Converted '{input_file}' → '{output_path}' ({n_rows} rows, streamed)")
+        if timings:
+            typer.echo(f"⏱  read+write {time.perf_counter() - start:.3f}s")
+        return
+
+    start = time.perf_counter()
     try:
-        write_file(output_path, df)
+        if engine == "arrow":
+            data = read_table(input_path, arrow_schema)
+        else:
+            data = read_file(input_path)
+    except Exception as e:
+        typer.echo(f"❌ Failed to read input file: {e}")
+        raise typer.Exit(code=1)
+    read_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        if engine == "arrow":
+            write_table(output_path, data)
+        else:
+            write_file(output_path, data)
     except Exception as e:
         typer.echo(f"❌ Failed to write output file: {e}")
         raise typer.Exit(code=1)
+    write_time = time.perf_counter() - start
+
+    if save_schema_file:
+        import pyarrow as pa
+        schema_out = data.schema if engine == "arrow" else pa.Schema.from_pandas(data, preserve_index=False)
+        save_schema(schema_out, Path(save_schema_file))
 
     typer.echo(f"✅ Converted '{input_file}' → '{output_path}'")
+    if timings:
+        typer.echo(f"⏱  engine={engine} read {read_time:.3f}s, write {write_time:.3f}s")
+
+DATASET_CHUNK_SIZE = 100_000    # rows per read when writing a dataset without --chunk-size
+
+def dataset_options(split_rows: int, split_size: str, files: int, partition_by: str):
+    """DatasetOptions from the CLI flags, or None when the output is a single file."""
+    if not (split_rows or split_size or files or partition_by):
+        return None
+    from .dataset import DatasetOptions, parse_partition, parse_size
+
+    if files and (split_rows or split_size):
+        raise ValueError("--files cannot be combined with --split-rows/--split-size")
+    column, transform = parse_partition(partition_by) if partition_by else (None, None)
+    return DatasetOptions(
+        max_rows=split_rows,
+        max_bytes=parse_size(split_size) if split_size else None,
+        files=files,
+        partition_by=column,
+        transform=transform,
+    )
+
+def convert_dataset(input_path: Path, output_path: Path, to: str, options: "DatasetOptions", chunk_size: int,
+                    arrow_schema, save_schema_file: str, timings: bool):
+    """Stream a file into a dataset folder (output path without its extension)."""
+    from .dataset import DATASET_FORMATS, DatasetWriter, clear_dataset, read_manifest
+    from .reader import iter_batches, save_schema
+
+    fmt = to or output_path.suffix.lower().lstrip(".")
+    if fmt not in DATASET_FORMATS:
+        typer.echo(f"❌ Dataset output supports {DATASET_FORMATS}, not '{fmt or output_path}'")
+        raise typer.Exit(code=1)
+    root = output_path.with_suffix("") if output_path.suffix else output_path
+
+    start = time.perf_counter()
+    try:
+        clear_dataset(root)
+        with DatasetWriter(root, fmt, options) as writer:
+            for batch in iter_batches(input_path, chunk_size, arrow_schema):
+                if writer.schema is None:
+                    writer.schema = batch.schema
+                writer.write(batch)
+        manifest = read_manifest(root)
+    except Exception as e:
+        typer.echo(f"❌ Failed to convert file: {e}")
+        raise typer.Exit(code=1)
+    if save_schema_file and writer.schema is not None:
+        save_schema(writer.schema, Path(save_schema_file))
+    typer.echo(f"✅ Converted '{input_path}' → '{root}/' ({manifest['total_rows']} rows in "
+               f"{len(manifest['files'])} files, {manifest['total_bytes'] / 1e6:.1f} MB)")
+    if timings:
+        typer.echo(f"⏱  read+write {time.perf_counter() - start:.3f}s")
+
+def convert_many(inputs: List[str], to: str, target_dir: Path, engine: str,
+                 chunk_size: int, workers: int, force: bool):
+    """Batch conversion: expand the inputs and convert them across a process pool."""
+    from .batch import ConvertJob, conflicts, drop_outputs, expand_inputs, output_path_for, run_batch
+    from .reader import ENGINES
+
+    if engine not in ENGINES:
+        typer.echo(f"❌ Unknown engine '{engine}'. Supported: {ENGINES}")
+        raise typer.Exit(code=1)
+    found = expand_inputs(inputs, to, target_dir)
+    if not found:
+        typer.echo("❌ No input files matched.")
+        raise typer.Exit(code=1)
+    jobs = drop_outputs([
+        ConvertJob(path, output_path_for(path, rel, to, target_dir), engine, chunk_size)
+        for path, rel in found
+    ])
+    problems = conflicts(jobs)
+    if problems:
+        for problem in problems:
+            typer.echo(f"❌ {problem}")
+        raise typer.Exit(code=1)
+    report = run_batch(jobs, workers=workers, force=force)
+    typer.echo(("❌ " if report.failed else "✅ ") + report.summary())
+    if report.failed:
+        raise typer.Exit(code=1)
@@ -0,0 +1,329 @@
+# file_converter/dataset.py
+import json
+import math
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .writer import BatchWriter
+
+MANIFEST_FILE = "_manifest.json"
+DATASET_FORMATS = ["csv", "parquet"]
+PARTITION_TRANSFORMS = {"year": "%Y", "month": "%Y-%m", "day": "%Y-%m-%d"}
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+MAX_PARTITIONS = 1024           # open files grow with partitions: refuse high-cardinality columns
+
+_SIZE_UNITS = {"": 1, "b": 1, "kb": 10**3, "mb": 10**6, "gb": 10**9, "kib": 2**10, "mib": 2**20, "gib": 2**30}
+
+def parse_size(spec: str) -> int:
+    """Parse a byte size such as '256MB', '1.5GB' or '1000000'."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([a-zA-Z]*)\s*", str(spec))
+    if not match or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size '{spec}' (examples: 500000, 64MB, 1.5GB)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+def parse_partition(spec: str) -> Tuple[str, Optional[str]]:
+    """Parse 'column' or 'column:month' (year, month or day of a date column)."""
+    column, _, transform = spec.partition(":")
+    if not column:
+        raise ValueError(f"Invalid partition spec '{spec}'")
+    if transform and transform not in PARTITION_TRANSFORMS:
+        raise ValueError(f"Unknown partition transform '{transform}'. Supported: {list(PARTITION_TRANSFORMS)}")
+    return column, transform or None
+
+@dataclass
+class DatasetOptions:
+    max_rows: Optional[int] = None          # rows per file
+    max_bytes: Optional[int] = None         # roll to a new file at about this size
+    files: Optional[int] = None             # split every partition into this many files
+    partition_by: Optional[str] = None      # Hive-style partition column
+    transform: Optional[str] = None         # 'year' | 'month' | 'day' of a date partition column
+
+    def __post_init__(self):
+        for name in ("max_rows", "max_bytes", "files"):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be positive")
+        if self.transform and self.transform not in PARTITION_TRANSFORMS:
+            raise ValueError(f"Unknown partition transform '{self.transform}'. Supported: {list(PARTITION_TRANSFORMS)}")
+
+    @property
+    def partition_key(self) -> Optional[str]:
+        """Name of the partition directory key ('order_date_month' for a transformed column)."""
+        if not self.partition_by:
+            return None
+        return f"{self.partition_by}_{self.transform}" if self.transform else self.partition_by
+
+@dataclass
+class DatasetFile:
+    path: str                   # relative to the dataset root, '/'-separated
+    rows: int = 0
+    bytes: int = 0
+    partition: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class _OpenFile:
+    entry: DatasetFile
+    writer: BatchWriter
+
+class _Partition:
+    """Files of one partition directory: the open slots and the files already finished."""
+
+    def __init__(self, directory: str, values: Dict[str, str]):
+        self.directory = directory
+        self.values = values
+        self.slots: Dict[int, _OpenFile] = {}
+        self.next_file = 0
+        self.next_slot = 0      # round robin over slots when splitting into N files
+
+class DatasetWriter:
+    """
+    Write record batches as a dataset directory instead of one file:
+    - split into files of at most max_rows rows or about max_bytes bytes,
+      or into `files` files per partition (rows dealt out batch slice by
+      batch slice, so the total need not be known up front);
+    - Hive-style partition directories (`status=paid/`, or
+      `order_date_month=2023-05/` with a year/month/day transform).
+      A plain partition column is dropped from the files, as Hive does;
+      a transformed one is kept;
+    - a manifest (_manifest.json) listing every file with its partition
+      values, row count and byte size.
+
+    `prefix` names the files '<prefix>-NNNNN.<ext>'; writers with different
+    prefixes can share a root (one per shard) and their manifests are
+    combined with merge_manifests(). `compression` is the Parquet codec
+    (snappy by default).
+    """
+
+    def __init__(self, root: Path, fmt: str, options: DatasetOptions = None,
+                 schema: Optional[pa.Schema] = None, prefix: str = "part", manifest: str = MANIFEST_FILE,
+                 compression: Optional[str] = None):
+        if fmt not in DATASET_FORMATS:
+            raise ValueError(f"Dataset output supports {DATASET_FORMATS}, not '{fmt}'")
+        self.root = Path(root)
+        self.fmt = fmt
+        self.options = options or DatasetOptions()
+        self.schema = schema
+        self.prefix = prefix
+        self.manifest = manifest
+        self.compression = compression      # Parquet codec of the files
+        self.files: List[DatasetFile] = []
+        self._partitions: Dict[Optional[str], _Partition] = {}
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ---- partitioning
+
+    def _partition_values(self, batch: pa.RecordBatch) -> List[str]:
+        """Partition directory value of every row of a batch."""
+        column = batch.column(self.options.partition_by)
+        transform = self.options.transform
+        if transform:
+            if not pa.types.is_timestamp(column.type):
+                column = pc.cast(column, pa.timestamp("s"))     # dates, or ISO date strings
+            column = pc.strftime(column, format=PARTITION_TRANSFORMS[transform])
+        else:
+            column = pc.cast(column, pa.string())
+        return pc.fill_null(column, NULL_PARTITION).to_pylist()
+
+    def _split(self, batch: pa.RecordBatch) -> Iterable[Tuple[Optional[str], pa.RecordBatch]]:
+        """(partition value, rows) groups of a batch; (None, batch) without partitioning."""
+        if not self.options.partition_by:
+            yield None, batch
+            return
+        if self.options.partition_by not in batch.schema.names:
+            raise ValueError(f"Partition column '{self.options.partition_by}' is not in the data")
+        values = np.array(self._partition_values(batch), dtype=object)
+        keys, codes = np.unique(values, return_inverse=True)
+        if not self.options.transform:
+            batch = batch.drop_columns([self.options.partition_by])
+        if len(keys) == 1:
+            yield keys[0], batch
+            return
+        order = np.argsort(codes, kind="stable")
+        ordered = batch.take(pa.array(order))
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(codes[order])) + 1, [len(codes)]])
+        for i, key in enumerate(keys):
+            yield key, ordered.slice(int(bounds[i]), int(bounds[i + 1] - bounds[i]))
+
+    def _partition(self, value: Optional[str]) -> _Partition:
+        part = self._partitions.get(value)
+        if part is None:
+            if len(self._partitions) >= MAX_PARTITIONS:
+                raise ValueError(f"More than {MAX_PARTITIONS} partitions: choose a coarser partition column")
+            if value is None:
+                part = _Partition("", {})
+            else:
+                key = self.options.partition_key
+                part = _Partition(f"{key}={quote(value, safe=' ')}", {key: value})
+            self._partitions[value] = part
+        return part
+
+    # ---- files
+
+    def _open(self, part: _Partition, schema: pa.Schema) -> _OpenFile:
+        name = f"{self.prefix}-{part.next_file:05d}.{self.fmt}"
+        part.next_file += 1
+        rel = f"{part.directory}/{name}" if part.directory else name
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = BatchWriter(path, schema, self.fmt, self.compression)
+        return _OpenFile(DatasetFile(rel, partition=dict(part.values)), writer)
+
+    def _close(self, open_file: _OpenFile):
+        open_file.writer.close()
+        open_file.entry.bytes = os.path.getsize(self.root / open_file.entry.path)
+        self.files.append(open_file.entry)
+
+    def _room(self, open_file: _OpenFile, batch: pa.RecordBatch) -> int:
+        """Rows of batch that still fit in the file under max_rows / max_bytes."""
+        room = batch.num_rows
+        opts = self.options
+        if opts.max_rows:
+            room = min(room, opts.max_rows - open_file.entry.rows)
+        if opts.max_bytes:
+            written = open_file.writer.n_bytes
+            rows = open_file.entry.rows
+            # Bytes per row measured on the file so far, or estimated from memory for a new file
+            per_row = written / rows if rows else max(batch.nbytes / max(batch.num_rows, 1), 1.0)
+            room = min(room, max(int((opts.max_bytes - written) / per_row), 0))
+        return room
+
+    def _write_slot(self, part: _Partition, slot: int, batch: pa.RecordBatch):
+        while batch.num_rows:
+            open_file = part.slots.get(slot)
+            if open_file is None:
+                open_file = part.slots[slot] = self._open(part, self._file_schema(batch))
+            room = self._room(open_file, batch)
+            if room <= 0:
+                if open_file.entry.rows == 0:
+                    room = 1    # always make progress, even if one row exceeds max_bytes
+                else:
+                    self._close(part.slots.pop(slot))
+                    continue
+            head = batch.slice(0, room)
+            open_file.writer.write(head)
+            open_file.entry.rows += head.num_rows
+            batch = batch.slice(room)
+
+    def _file_schema(self, batch: pa.RecordBatch) -> pa.Schema:
+        if self.schema is None:
+            return batch.schema
+        if self.options.partition_by and not self.options.transform and self.options.partition_by in self.schema.names:
+            return self.schema.remove(self.schema.get_field_index(self.options.partition_by))
+        return self.schema
+
+    def write(self, batch: pa.RecordBatch):
+        for value, rows in self._split(batch):
+            part = self._partition(value)
+            n_files = self.options.files
+            if not n_files:
+                self._write_slot(part, 0, rows)
+                continue
+            # Deal the rows out over the N files in contiguous slices
+            step = math.ceil(rows.num_rows / n_files)
+            for start in range(0, rows.num_rows, step):
+                self._write_slot(part, part.next_slot, rows.slice(start, step))
+                part.next_slot = (part.next_slot + 1) % n_files
+
+    def close(self) -> dict:
+        """Close all files and write the manifest. Returns the manifest."""
+        for part in self._partitions.values():
+            for slot in sorted(part.slots):
+                self._close(part.slots[slot])
+            part.slots.clear()
+        manifest = build_manifest(self.fmt, self.options, self.files, self.schema)
+        write_manifest(self.root / self.manifest, manifest)
+        return manifest
+
+    def abort(self):
+        """Close and delete everything written so far (no manifest)."""
+        for part in self._partitions.values():
+            for open_file in part.slots.values():
+                open_file.writer.close()
+                self.files.append(open_file.entry)
+            part.slots.clear()
+        for entry in self.files:
+            _remove_file(self.root, self.root / entry.path)
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def build_manifest(fmt: str, options: DatasetOptions, files: List[DatasetFile],
+                   schema: Optional[pa.Schema] = None) -> dict:
+    files = sorted(files, key=lambda f: f.path)
+    return {
+        "format": fmt,
+        "partition_by": options.partition_key,
+        "schema": [{"name": f.name, "type": str(f.type)} for f in schema] if schema is not None else None,
+        "total_rows": sum(f.rows for f in files),
+        "total_bytes": sum(f.bytes for f in files),
+        "files": [asdict(f) for f in files],
+    }
+
+def write_manifest(path: Path, manifest: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+def read_manifest(root: Path) -> dict:
+    with open(Path(root) / MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+def merge_manifests(root: Path, parts: List[str]) -> dict:
+    """Combine the manifests of writers sharing a root into _manifest.json and remove them."""
+    root = Path(root)
+    merged = None
+    for name in parts:
+        with open(root / name, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if merged is None:
+            merged = dict(manifest, files=[])
+        merged["files"].extend(manifest["files"])
+        os.remove(root / name)
+    if merged is None:
+        return {}
+    merged["files"].sort(key=lambda f: f["path"])
+    merged["total_rows"] = sum(f["rows"] for f in merged["files"])
+    merged["total_bytes"] = sum(f["bytes"] for f in merged["files"])
+    write_manifest(root / MANIFEST_FILE, merged)
+    return merged
+
+def clear_dataset(root: Path):
+    """Remove the files of an earlier dataset written to root (those listed in its manifest)."""
+    root = Path(root)
+    if not (root / MANIFEST_FILE).exists():
+        return
+    for entry in read_manifest(root).get("files", []):
+        _remove_file(root, root / entry["path"])
+    (root / MANIFEST_FILE).unlink()
+
+def _remove_file(root: Path, path: Path):
+    """Delete a dataset file, and its partition directory once empty."""
+    if path.exists():
+        path.unlink()
+    if path.parent != root and path.parent.exists() and not any(path.parent.iterdir()):
+        path.parent.rmdir()
+
+def write_dataset(root: Path, batches: Iterable[pa.RecordBatch], fmt: str,
+                  options: DatasetOptions, schema: Optional[pa.Schema] = None) -> dict:
+    """Write record batches as a dataset directory (see DatasetWriter). Returns the manifest."""
+    clear_dataset(root)
+    with DatasetWriter(root, fmt, options, schema) as writer:
+        for batch in batches:
+            if writer.schema is None:
+                writer.schema = batch.schema
+            writer.write(batch)
+    return build_manifest(fmt, writer.options, writer.files, writer.schema)
@@ -0,0 +1,164 @@
+# file_converter/excel.py
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import pyarrow as pa
+
+EXCEL_MAX_ROWS = 1_048_576      # rows per sheet, header included
+SHEET_TITLE_MAX = 31
+DEFAULT_SHEET = "Sheet1"
+
+_INVALID_TITLE = re.compile(r"[\[\]:*?/\\]")
+
+def check_excel_format(fmt: str):
+    """Fail before any work for Excel formats that cannot be written."""
+    if fmt == "xls":
+        raise ValueError("Writing .xls (Excel 97-2003) files is not supported: write .xlsx instead")
+
+def continuation_title(title: str, part: int) -> str:
+    """Title of the part-th sheet (2, 3, ...) of a table that overflowed its first sheet."""
+    suffix = f"_{part}"
+    return title[:SHEET_TITLE_MAX - len(suffix)] + suffix
+
+def _excel_values(array: pa.Array) -> list:
+    """Python values of an Arrow column that openpyxl can write."""
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    t = array.type
+    if pa.types.is_timestamp(t) and t.tz is not None:
+        array = array.cast(pa.timestamp(t.unit))    # Excel has no time zones: write UTC
+    elif pa.types.is_nested(t) or pa.types.is_binary(t) or pa.types.is_large_binary(t):
+        return [None if v is None else str(v) for v in array.to_pylist()]
+    return array.to_pylist()
+
+class ExcelSheet:
+    """A table's sheet in an ExcelWriter; rolls over to a new sheet when one is full."""
+
+    def __init__(self, writer: "ExcelWriter", title: str):
+        self.writer = writer
+        self.title = title
+        self.titles = [title]       # this sheet and its continuation sheets
+        self.header: Optional[List[str]] = None
+        self.n_rows = 0
+        self._ws = writer._create(title)
+        self._ws_rows = 0
+
+    def start(self, names: List[str]):
+        """Write the header row (once)."""
+        if self.header is None:
+            self.header = list(names)
+            self._ws.append(self.header)
+            self._ws_rows = 1
+
+    def _roll_over(self):
+        title = self.writer._title(continuation_title(self.title, len(self.titles) + 1))
+        self._ws = self.writer._create(title, after=self.titles[-1])
+        self.titles.append(title)
+        self._ws.append(self.header)
+        self._ws_rows = 1
+
+    def write(self, batch: pa.RecordBatch):
+        self.write_rows(batch.schema.names, zip(*[_excel_values(column) for column in batch.columns]))
+
+    def write_rows(self, names: List[str], rows: Iterable[Sequence]):
+        """Append rows of Python values (names: the header, if not written yet)."""
+        with self.writer._lock:
+            self.start(names)
+            append = self._ws.append
+            for row in rows:
+                if self._ws_rows >= self.writer.max_rows:
+                    self._roll_over()
+                    append = self._ws.append
+                append(row)
+                self._ws_rows += 1
+                self.n_rows += 1
+
+class ExcelWriter:
+    """
+    Streaming .xlsx writer: openpyxl's write-only mode appends rows to
+    per-sheet temporary files with inline strings, so memory stays flat
+    whatever the row count. Each table gets its own sheet, continued on
+    '<title>_2', '<title>_3', ... sheets past Excel's 1,048,576-row limit.
+    The workbook is assembled when the writer is closed.
+
+    Usage:
+        with ExcelWriter(path) as wb:
+            sheet = wb.sheet("Users")
+            for batch in batches:
+                sheet.write(batch)
+    """
+
+    def __init__(self, file_path: Path, max_rows: int = EXCEL_MAX_ROWS):
+        from openpyxl import Workbook
+
+        self.path = Path(file_path)
+        check_excel_format(self.path.suffix.lower().lstrip("."))
+        if max_rows < 2:
+            raise ValueError("max_rows must leave room for the header and one row")
+        self.max_rows = max_rows
+        self.sheets: Dict[str, ExcelSheet] = {}      # table name -> sheet
+        self._workbook = Workbook(write_only=True)
+        self._titles: List[str] = []                # in workbook order
+        self._lock = threading.RLock()              # tables may be written from several threads
+
+    def _title(self, name: str) -> str:
+        base = _INVALID_TITLE.sub("_", name).strip("'")[:SHEET_TITLE_MAX] or "Sheet"
+        taken = {t.lower() for t in self._titles}
+        title, part = base, 2
+        while title.lower() in taken:       # titles are case-insensitive
+            title = continuation_title(base, part)
+            part += 1
+        return title
+
+    def _create(self, title: str, after: Optional[str] = None):
+        index = self._titles.index(after) + 1 if after is not None else len(self._titles)
+        self._titles.insert(index, title)
+        return self._workbook.create_sheet(title, index)
+
+    def sheet(self, name: str, schema: Optional[pa.Schema] = None) -> ExcelSheet:
+        """The sheet of a table, created on first use (with its header, if the schema is given)."""
+        with self._lock:
+            sheet = self.sheets.get(name)
+            if sheet is None:
+                sheet = self.sheets[name] = ExcelSheet(self, self._title(name))
+            if schema is not None:
+                sheet.start(schema.names)
+            return sheet
+
+    @property
+    def titles(self) -> List[str]:
+        """Sheet titles in workbook order."""
+        return list(self._titles)
+
+    def close(self):
+        if not self._titles:
+            self._create(DEFAULT_SHEET)     # a workbook needs at least one sheet
+        self._workbook.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_excel(file_path: Path, tables: Dict[str, Union[pa.Table, Iterable[pa.RecordBatch]]],
+                max_rows: int = EXCEL_MAX_ROWS) -> int:
+    """
+    Stream tables (Arrow tables or iterables of record batches) into one
+    workbook, one sheet (or more past the row limit) per table, in order.
+    Returns the number of rows written.
+    """
+    n_rows = 0
+    with ExcelWriter(file_path, max_rows) as writer:
+        for name, batches in tables.items():
+            if isinstance(batches, pa.Table):
+                sheet = writer.sheet(name, batches.schema)
+                batches = batches.to_batches()
+            else:
+                sheet = writer.sheet(name)
+            for batch in batches:
+                sheet.write(batch)
+            n_rows += sheet.n_rows
+    return n_rows
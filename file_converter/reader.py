@@ -1,20 +1,37 @@
 # file_converter/reader.py
+import json
+import re
+import sys
 from pathlib import Path
-import pandas as pd
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 SUPPORTED_FORMATS = ["csv", "parquet", "xlsx", "xls"]
+ENGINES = ["pandas", "arrow"]
 
-def read_file(file_path: Path) -> pd.DataFrame:
-    """
-    Read a file and return a pandas DataFrame.
-    Supports CSV, Parquet, XLSX, XLS.
-    """
+if TYPE_CHECKING:
+    import pandas as pd     # imported where used: the Arrow paths never load pandas
+
+def _check_input(file_path: Path) -> str:
     if not file_path.exists():
         raise FileNotFoundError(f"File '{file_path}' does not exist.")
 
     ext = file_path.suffix.lower().replace(".", "")
     if ext not in SUPPORTED_FORMATS:
         raise ValueError(f"Unsupported input format: {ext}. Supported: {SUPPORTED_FORMATS}")
+    return ext
+
+def read_file(file_path: Path) -> "pd.DataFrame":
+    """
+    Read a file and return a pandas DataFrame.
+    Supports CSV, Parquet, XLSX, XLS.
+    """
+    import pandas as pd
+
+    ext = _check_input(file_path)
 
     if ext == "csv":
         return pd.read_csv(file_path)
@@ -22,3 +39,198 @@ def read_file(file_path: Path) -> pd.DataFrame:
         return pd.read_parquet(file_path)
     elif ext in ["xlsx", "xls"]:
         return pd.read_excel(file_path)
+
+def _apply_schema(data: Union[pa.Table, pa.RecordBatch], schema: pa.Schema) -> Union[pa.Table, pa.RecordBatch]:
+    """
+    Cast the columns a (possibly partial) schema lists to its types; other
+    columns keep their own type and the column order is the file's.
+    """
+    missing = [name for name in schema.names if name not in data.schema.names]
+    if missing:
+        raise ValueError(f"Schema columns not in the file: {missing}")
+    target = pa.schema([schema.field(f.name) if f.name in schema.names else f for f in data.schema])
+    return data if data.schema == target else data.cast(target)
+
+def read_table(file_path: Path, schema: Optional[pa.Schema] = None) -> pa.Table:
+    """
+    Read a file into an Arrow table (Arrow engine).
+    CSV is parsed on all cores by Arrow's multithreaded reader and stays in
+    Arrow memory. With a schema, CSV columns are parsed with those types
+    (no inference) and other formats are cast to it; columns the schema
+    does not list are kept as read.
+    """
+    ext = _check_input(file_path)
+
+    if ext == "csv":
+        # Empty fields are nulls in string columns too, as the CSV writers write them
+        convert_options = pacsv.ConvertOptions(
+            column_types={f.name: f.type for f in schema} if schema else None, strings_can_be_null=True
+        )
+        table = pacsv.read_csv(file_path, read_options=pacsv.ReadOptions(use_threads=True),
+                               convert_options=convert_options)
+    elif ext == "parquet":
+        table = pq.read_table(file_path, use_threads=True)
+    elif ext == "xlsx" and schema is not None:
+        # Cell values as stored: pandas would turn text such as '0001' into numbers
+        batches = list(_iter_excel(file_path, sys.maxsize, schema))
+        table = pa.Table.from_batches(batches) if batches else pa.table({f.name: pa.array([], f.type) for f in schema})
+    else:
+        import pandas as pd
+        table = pa.Table.from_pandas(pd.read_excel(file_path), preserve_index=False)
+
+    return _apply_schema(table, schema) if schema is not None else table
+
+def _parse_type(type_name: str) -> pa.DataType:
+    type_name = type_name.strip()
+    m = re.fullmatch(r"timestamp\[(\w+), tz=(.+)\]", type_name)
+    if m:
+        return pa.timestamp(m.group(1), tz=m.group(2))
+    m = re.fullmatch(r"decimal(128|256)\((\d+), ?(\d+)\)", type_name)
+    if m:
+        factory = pa.decimal128 if m.group(1) == "128" else pa.decimal256
+        return factory(int(m.group(2)), int(m.group(3)))
+    return pa.type_for_alias(type_name)
+
+def parse_schema(spec: str) -> pa.Schema:
+    """
+    Parse an explicit schema: either the path of a saved schema file (see
+    save_schema) or an inline 'name:type,name:type' list. Types are Arrow
+    type names, e.g. int64, double, string, bool, date32, timestamp[s].
+    """
+    if Path(spec).is_file():
+        return load_schema(Path(spec))
+    fields = []
+    for item in spec.split(","):
+        name, sep, type_name = item.strip().rpartition(":")
+        if not sep or not name:
+            raise ValueError(f"Invalid schema entry '{item}'. Use name:type")
+        try:
+            fields.append(pa.field(name, _parse_type(type_name)))
+        except ValueError:
+            raise ValueError(f"Unknown type '{type_name}' for column '{name}'")
+    return pa.schema(fields)
+
+def save_schema(schema: pa.Schema, file_path: Path):
+    """Save a schema as JSON ({"columns": [{"name": ..., "type": ...}]}) for reuse."""
+    columns = [{"name": f.name, "type": str(f.type)} for f in schema]
+    Path(file_path).write_text(json.dumps({"columns": columns}, indent=2), encoding="utf-8")
+
+def load_schema(file_path: Path) -> pa.Schema:
+    """Load a schema saved by save_schema."""
+    data = json.loads(Path(file_path).read_text(encoding="utf-8"))
+    try:
+        return pa.schema([pa.field(c["name"], _parse_type(c["type"])) for c in data["columns"]])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid schema file '{file_path}': {e}")
+
+def _rebatch(batches: Iterable[pa.RecordBatch], chunk_size: int) -> Iterator[pa.RecordBatch]:
+    """Regroup record batches into batches of exactly chunk_size rows (last one may be shorter)."""
+    pending = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            start = 0
+            while pending_rows - start >= chunk_size:
+                yield table.slice(start, chunk_size).combine_chunks().to_batches()[0]
+                start += chunk_size
+            rest = table.slice(start)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+def _iter_csv(file_path: Path, schema: Optional[pa.Schema]) -> Iterator[pa.RecordBatch]:
+    convert_options = pacsv.ConvertOptions(
+        column_types={f.name: f.type for f in schema} if schema else None, strings_can_be_null=True
+    )
+    reader = pacsv.open_csv(file_path, convert_options=convert_options)
+    try:
+        yield from reader
+    except pa.ArrowInvalid as e:
+        raise ValueError(
+            f"{e}\nColumn types were fixed from the first chunk; pass an explicit schema to override them."
+        )
+
+def _excel_sheets(wb) -> list:
+    """The active sheet and the '<title>_2', '<title>_3', ... sheets it rolled over to (see excel.py)."""
+    from .excel import continuation_title
+
+    sheets = [wb.active]
+    while continuation_title(wb.active.title, len(sheets) + 1) in wb.sheetnames:
+        sheets.append(wb[continuation_title(wb.active.title, len(sheets) + 1)])
+    return sheets
+
+def _excel_array(values: tuple, arrow_type: Optional[pa.DataType] = None) -> pa.Array:
+    """Arrow array of a column of cell values (typed by the schema if given, inferred otherwise)."""
+    if arrow_type is None:
+        return pa.array(values)
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        values = [None if v is None else str(v) for v in values]
+    return pa.array(values, type=arrow_type)
+
+def _iter_excel(file_path: Path, chunk_size: int, schema: Optional[pa.Schema] = None) -> Iterator[pa.RecordBatch]:
+    from openpyxl import load_workbook
+
+    # Column types: the schema's, and for other columns the first chunk's (as the CSV reader does)
+    types = {f.name: f.type for f in schema} if schema is not None else {}
+
+    def to_batch(rows: list) -> pa.RecordBatch:
+        # Rows stop at their last non-empty cell when the sheet has no dimension record
+        width = len(header)
+        rows = [row + (None,) * (width - len(row)) if len(row) < width else row[:width] for row in rows]
+        try:
+            arrays = [_excel_array(c, types.get(name)) for name, c in zip(header, zip(*rows))]
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"{e}\nColumn types were fixed from the first chunk; pass an explicit schema to override them."
+            )
+        for name, array in zip(header, arrays):
+            if name not in types and not pa.types.is_null(array.type):
+                types[name] = array.type
+        return pa.RecordBatch.from_arrays(arrays, names=header)
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        header = None
+        chunk = []
+        for ws in _excel_sheets(wb):
+            rows = ws.iter_rows(values_only=True)
+            names = [str(h) for h in next(rows, ())]
+            if header is None:
+                header = names
+            elif names != header:
+                break       # another table, not a continuation
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield to_batch(chunk)
+                    chunk = []
+        if chunk:
+            yield to_batch(chunk)
+    finally:
+        wb.close()
+
+def iter_batches(file_path: Path, chunk_size: int, schema: Optional[pa.Schema] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Read a file incrementally as Arrow record batches of at most chunk_size rows.
+    Supports CSV (incremental reader), Parquet (row groups) and XLSX (read-only mode).
+    With an explicit schema, CSV columns are parsed with those types, XLSX
+    cells converted to them and Parquet batches cast to them; columns the
+    schema does not list are kept as read, as read_table does.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    ext = _check_input(file_path)
+
+    if ext == "csv":
+        batches = _rebatch(_iter_csv(file_path, schema), chunk_size)
+    elif ext == "parquet":
+        batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size)
+    elif ext == "xlsx":
+        batches = _iter_excel(file_path, chunk_size, schema)
+    else:
+        raise ValueError("Streaming read is not supported for .xls files; convert without --chunk-size.")
+    for batch in batches:
+        yield _apply_schema(batch, schema) if schema is not None else batch
@@ -1,10 +1,27 @@
 # file_converter/writer.py
 from pathlib import Path
-import pandas as pd
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from .excel import DEFAULT_SHEET, ExcelWriter, check_excel_format, write_excel
 
 SUPPORTED_FORMATS = ["csv", "parquet", "xlsx", "xls"]
 
-def write_file(file_path: Path, df: pd.DataFrame, fmt: str = None):
+if TYPE_CHECKING:
+    import pandas as pd
+
+def output_format(file_path: Path, fmt: Optional[str] = None) -> str:
+    """The output format (explicit, or from the suffix); raises ValueError if it cannot be written."""
+    fmt = fmt.lower() if fmt else Path(file_path).suffix.lower().replace(".", "")
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported output format: {fmt}. Supported: {SUPPORTED_FORMATS}")
+    check_excel_format(fmt)
+    return fmt
+
+def write_file(file_path: Path, df: "pd.DataFrame", fmt: str = None):
     """
     Write a pandas DataFrame to a file.
     
@@ -13,17 +30,127 @@ def write_file(file_path: Path, df: pd.DataFrame, fmt: str = None):
         df: pandas DataFrame to write.
         fmt: Optional; output format. If None, inferred from file_path suffix.
     
-    Supported formats: CSV, Parquet, XLSX, XLS
+    Supported formats: CSV, Parquet, XLSX (streamed, see excel.py)
     """
     file_path = Path(file_path)
-    fmt = fmt.lower() if fmt else file_path.suffix.lower().replace(".", "")
-
-    if fmt not in SUPPORTED_FORMATS:
-        raise ValueError(f"Unsupported output format: {fmt}. Supported: {SUPPORTED_FORMATS}")
+    fmt = output_format(file_path, fmt)
 
     if fmt == "csv":
         df.to_csv(file_path, index=False)
     elif fmt == "parquet":
         df.to_parquet(file_path, engine="pyarrow", index=False)
-    elif fmt in ["xlsx", "xls"]:
-        df.to_excel(file_path, index=False)
+    elif fmt == "xlsx":
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type object columns: write the Python values as they are
+            with ExcelWriter(file_path) as writer:
+                rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+                writer.sheet(DEFAULT_SHEET).write_rows([str(c) for c in df.columns], rows)
+            return
+        write_excel(file_path, {DEFAULT_SHEET: table})
+
+def write_table(file_path: Path, table: pa.Table, fmt: str = None):
+    """
+    Write an Arrow table to a file (Arrow engine).
+    All formats are written directly from Arrow memory.
+    """
+    file_path = Path(file_path)
+    fmt = output_format(file_path, fmt)
+
+    if fmt == "csv":
+        pacsv.write_csv(table, file_path, write_options=pacsv.WriteOptions(quoting_style="needed"))
+    elif fmt == "parquet":
+        pq.write_table(table, file_path)
+    elif fmt == "xlsx":
+        write_excel(file_path, {DEFAULT_SHEET: table})
+
+class BatchWriter:
+    """
+    Incremental writer for Arrow record batches with a fixed schema.
+    Every batch is cast to the schema before it is written (its columns
+    must be the schema's, in any order).
+
+    Usage:
+        with BatchWriter(path, schema) as w:
+            for batch in batches:
+                w.write(batch)
+    """
+
+    def __init__(self, file_path: Path, schema: pa.Schema, fmt: str = None, compression: Optional[str] = None):
+        file_path = Path(file_path)
+        self.fmt = output_format(file_path, fmt)
+        self.schema = schema
+        self._sink = None
+        if self.fmt == "xlsx":
+            self._writer = ExcelWriter(file_path)
+            self._sheet = self._writer.sheet(DEFAULT_SHEET, schema)
+            return
+        self._sink = pa.OSFile(str(file_path), "wb")
+        if self.fmt == "csv":
+            self._writer = pacsv.CSVWriter(
+                self._sink, schema, write_options=pacsv.WriteOptions(quoting_style="needed")
+            )
+        else:
+            self._writer = pq.ParquetWriter(self._sink, schema, compression=compression or "snappy")
+
+    @property
+    def n_bytes(self) -> int:
+        """
+        Bytes written to the file so far (the Parquet footer is added on
+        close; an XLSX workbook is only assembled on close).
+        """
+        return self._sink.tell() if self._sink is not None else 0
+
+    def write(self, batch: pa.RecordBatch):
+        if batch.schema != self.schema:
+            if set(batch.schema.names) != set(self.schema.names):
+                raise ValueError(f"Chunk columns {batch.schema.names} do not match the output schema "
+                                 f"{self.schema.names}")
+            try:
+                table = pa.Table.from_batches([batch]).select(self.schema.names).cast(self.schema)
+            except (pa.ArrowInvalid, KeyError) as e:
+                raise ValueError(f"Chunk does not match the output schema: {e}")
+            for b in table.to_batches():
+                self._write(b)
+            return
+        self._write(batch)
+
+    def _write(self, batch: pa.RecordBatch):
+        if self.fmt == "xlsx":
+            self._sheet.write(batch)
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_batches(file_path: Path, batches: Iterable[pa.RecordBatch],
+                  schema: Optional[pa.Schema] = None, fmt: str = None) -> int:
+    """
+    Write record batches incrementally, one at a time. The output schema is
+    the explicit schema if given, otherwise the schema of the first batch.
+    Returns the number of rows written.
+    """
+    writer = None
+    n_rows = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                writer = BatchWriter(file_path, schema or batch.schema, fmt)
+            writer.write(batch)
+            n_rows += batch.num_rows
+        if writer is None:
+            writer = BatchWriter(file_path, schema or pa.schema([]), fmt)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
@@ -0,0 +1,70 @@
+# tests/test_append.py
+import pyarrow as pa
+import pytest
+
+from fake_data_generator.append import iter_column
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.scheduler import run_schema
+from fake_data_generator.schema import ColumnConfig, OutputConfig, TableConfig
+
+
+def schema(n_users, n_orders):
+    return [
+        TableConfig("Users", [
+            ColumnConfig("user_id", "pk", key_format="int"),
+            ColumnConfig("email", "email", pool_size=100, unique=True),
+        ], n_users),
+        TableConfig("Orders", [
+            ColumnConfig("order_id", "pk"),
+            ColumnConfig("user_id", "fk", ref_table="Users", ref_column="user_id"),
+            ColumnConfig("ticket", "number", num_min=1, num_max=10_000, unique=True),
+        ], n_orders),
+    ]
+
+
+def column(dg, config, name, arrow_type=pa.string()):
+    """Every value of a column of a table's output."""
+    arrays = iter_column(dg.table_path(config), dg.output, config, name, arrow_type)
+    return [v for array in arrays for v in array.to_pylist()]
+
+
+OUTPUTS = {
+    "csv": OutputConfig(),
+    "csv.gz": OutputConfig(compression="gzip"),
+    "dataset": OutputConfig(fmt="parquet", split_rows=300),
+    "sqlite": OutputConfig(fmt="sqlite"),
+}
+
+
+@pytest.mark.parametrize("fmt", list(OUTPUTS))
+def test_appended_rows_keep_keys_and_unique_values_valid(tmp_path, fmt):
+    run_schema(DataGenerator(str(tmp_path), seed=3, output=OUTPUTS[fmt]), schema(1_000, 2_000), chunk_size=250)
+    dg = DataGenerator(str(tmp_path), seed=3, output=OUTPUTS[fmt])
+    report = run_schema(dg, schema(150, 700), chunk_size=250, append=True)
+    assert {name: t.n_rows for name, t in report.timings.items()} == {"Users": 150, "Orders": 700}
+
+    users, orders = schema(0, 0)
+    user_ids = column(dg, users, "user_id", pa.int64())
+    assert sorted(user_ids) == list(range(1, 1_151))
+
+    emails = column(dg, users, "email")
+    assert len(emails) == len(set(emails)) == 1_150
+
+    order_ids = column(dg, orders, "order_id")
+    assert len(order_ids) == len(set(order_ids)) == 2_700
+    assert set(column(dg, orders, "user_id", pa.int64())) <= set(user_ids)
+    tickets = column(dg, orders, "ticket", pa.int64())
+    assert len(tickets) == len(set(tickets)) == 2_700
+
+
+def test_appending_to_a_missing_table_exports_it(tmp_path):
+    dg = DataGenerator(str(tmp_path), seed=3)
+    report = run_schema(dg, schema(10, 20), append=True)
+    assert {name: t.n_rows for name, t in report.timings.items()} == {"Users": 10, "Orders": 20}
+    assert len(column(dg, schema(0, 0)[1], "order_id")) == 20
+
+
+def test_single_parquet_files_cannot_be_appended_to(tmp_path):
+    dg = DataGenerator(str(tmp_path), seed=3, output=OutputConfig(fmt="parquet"))
+    with pytest.raises(ValueError, match="cannot be appended to"):
+        run_schema(dg, schema(10, 20), append=True)
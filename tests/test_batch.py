@@ -0,0 +1,86 @@
+# tests/test_batch.py
+import os
+
+from typer.testing import CliRunner
+
+from file_converter.cli import app
+
+runner = CliRunner()
+
+
+def convert(*args):
+    return runner.invoke(app, [*map(str, args), "--workers", "1"])
+
+
+def write_inputs(root):
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "x.csv").write_text("code,n\n0001,1\n0002,2\n")
+    (root / "b" / "x.csv").write_text("code,n\n0003,3\n")
+    (root / "b" / "notes.txt").write_text("not a table\n")
+
+
+def test_second_run_skips_outputs_of_the_first(tmp_path):
+    write_inputs(tmp_path)
+    original = (tmp_path / "a" / "x.csv").read_text()
+
+    first = convert(tmp_path)
+    assert first.exit_code == 0, first.output
+    assert "Converted 2 file(s)" in first.output
+    assert (tmp_path / "a" / "x.parquet").exists()
+
+    second = convert(tmp_path)
+    assert second.exit_code == 0, second.output
+    assert "Converted 0 file(s), skipped 2 up to date" in second.output
+    assert (tmp_path / "a" / "x.csv").read_text() == original
+
+
+def test_second_run_with_explicit_target(tmp_path):
+    write_inputs(tmp_path)
+    assert convert(tmp_path, "--to", "parquet").exit_code == 0
+    second = convert(tmp_path, "--to", "parquet")
+    assert second.exit_code == 0, second.output
+    assert "Converted 0 file(s), skipped 2 up to date" in second.output
+
+
+def test_edited_csv_is_converted_again(tmp_path):
+    write_inputs(tmp_path)
+    assert convert(tmp_path).exit_code == 0
+    source = tmp_path / "a" / "x.csv"
+    source.write_text("code,n\n0009,9\n")
+    later = os.stat(tmp_path / "a" / "x.parquet").st_mtime + 10
+    os.utime(source, (later, later))
+
+    second = convert(tmp_path)
+    assert second.exit_code == 0, second.output
+    assert "Converted 1 file(s)" in second.output
+    assert source.read_text() == "code,n\n0009,9\n"
+
+
+def test_out_dir_inside_the_input_directory(tmp_path):
+    write_inputs(tmp_path)
+    out = tmp_path / "out"
+    assert convert(tmp_path, "--out-dir", out).exit_code == 0
+    second = convert(tmp_path, "--out-dir", out)
+    assert second.exit_code == 0, second.output
+    assert "Converted 0 file(s), skipped 2 up to date" in second.output
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.*")) == [
+        "a/x.csv", "b/notes.txt", "b/x.csv", "out/a/x.parquet", "out/b/x.parquet",
+    ]
+
+
+def test_glob_keeps_layout_under_out_dir(tmp_path):
+    write_inputs(tmp_path)
+    out = tmp_path / "out"
+    result = convert(f"{tmp_path}/**/*", "--to", "parquet", "--out-dir", out)
+    assert result.exit_code == 0, result.output
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*.parquet")) == ["a/x.parquet", "b/x.parquet"]
+
+
+def test_clashing_outputs_fail_before_converting(tmp_path):
+    write_inputs(tmp_path)
+    out = tmp_path / "out"
+    result = convert(f"{tmp_path}/a/*", f"{tmp_path}/b/*", "--to", "parquet", "--out-dir", out)
+    assert result.exit_code == 1
+    assert "would both be written to" in result.output
+    assert not out.exists()
@@ -0,0 +1,77 @@
+# tests/test_columnar.py
+import uuid
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.schema import ColumnConfig, TableConfig
+
+N = 20_000
+
+PARENT = TableConfig("Users", [ColumnConfig("user_id", "pk", key_format="int")], 500)
+CHILD = TableConfig("Orders", [
+    ColumnConfig("order_id", "pk"),
+    ColumnConfig("user_id", "fk", ref_table="Users", ref_column="user_id", nullable=True, null_prob=0.25),
+    ColumnConfig("quantity", "number", num_min=3, num_max=7),
+    ColumnConfig("price", "float", float_min=1.5, float_max=2.5),
+    ColumnConfig("day", "date", date_start=datetime(2023, 1, 1), date_end=datetime(2023, 3, 31)),
+    ColumnConfig("size", "choice", choices=["S", "M", "L"], distribution="weighted", weights=[8, 1, 1]),
+    ColumnConfig("paid", "boolean"),
+], N)
+
+
+@pytest.fixture
+def orders(tmp_path):
+    dg = DataGenerator(str(tmp_path), seed=21)
+    dg.generate_columns(PARENT)
+    return dg.generate_columns(CHILD)
+
+
+def test_values_stay_in_their_ranges(orders):
+    assert len(orders) == N
+    quantity = orders.columns["quantity"]
+    assert quantity.min() >= 3 and quantity.max() <= 7 and set(np.unique(quantity)) == {3, 4, 5, 6, 7}
+    price = orders.columns["price"]
+    assert price.min() >= 1.5 and price.max() <= 2.5
+    days = orders.to_pylist("day")
+    assert min(days) >= date(2023, 1, 1) and max(days) <= date(2023, 3, 31)
+    assert set(orders.to_pylist("size")) == {"S", "M", "L"}
+    assert set(orders.to_pylist("paid")) == {True, False}
+
+
+def test_weighted_choices_follow_their_weights(orders):
+    share = orders.to_pylist("size").count("S") / N
+    assert share == pytest.approx(0.8, abs=0.02)
+
+
+def test_null_rate_follows_null_prob(orders):
+    user_ids = orders.to_pylist("user_id")
+    assert user_ids.count(None) / N == pytest.approx(0.25, abs=0.02)
+    assert orders.null_mask("quantity") is None
+
+
+def test_keys_are_unique_and_references_exist(orders):
+    order_ids = orders.to_pylist("order_id")
+    assert len(set(order_ids)) == N
+    assert all(uuid.UUID(key).version == 4 for key in order_ids[:100])
+    refs = {v for v in orders.to_pylist("user_id") if v is not None}
+    assert refs <= set(range(1, 501))
+    assert len(refs) > 450      # uniform over the parent's keys
+
+
+def test_rows_and_formatted_columns_agree(orders):
+    first = next(orders.rows())
+    assert first["day"].isoformat() == orders.format_column("day")[0]
+    assert first["order_id"] == orders.to_pylist("order_id")[0]
+
+
+def test_same_seed_same_columns(tmp_path):
+    runs = []
+    for name in ("a", "b"):
+        dg = DataGenerator(str(tmp_path / name), seed=21)
+        dg.generate_columns(PARENT)
+        runs.append(dg.generate_columns(CHILD))
+    for column in runs[0].column_names():
+        assert runs[0].to_pylist(column) == runs[1].to_pylist(column)
@@ -0,0 +1,61 @@
+# tests/test_compression.py
+import gzip
+from datetime import datetime
+
+import pyarrow as pa
+import pytest
+
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.schema import ColumnConfig, OutputConfig, TableConfig
+
+CONFIG = TableConfig("Events", [
+    ColumnConfig("event_id", "pk"),
+    ColumnConfig("name", "name", pool_size=50, nullable=True, null_prob=0.2),
+    ColumnConfig("day", "date", date_start=datetime(2024, 1, 1), date_end=datetime(2024, 12, 31)),
+    ColumnConfig("amount", "float", float_min=0, float_max=100),
+], 3_000)
+
+
+def decompress(path: str, compression: str) -> bytes:
+    if compression == "gzip":
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    with pa.CompressedInputStream(pa.OSFile(path), compression) as f:
+        return f.read()
+
+
+def export(tmp_path, name, compression=None, write_queue=0, chunk_size=700):
+    dg = DataGenerator(str(tmp_path / name), seed=11, output=OutputConfig(compression=compression),
+                       write_queue=write_queue)
+    path, n_rows = dg.export_table(CONFIG, chunk_size)
+    assert n_rows == CONFIG.n_rows
+    return path
+
+
+@pytest.mark.parametrize("compression, suffix", [("gzip", ".csv.gz"), ("zstd", ".csv.zst")])
+@pytest.mark.parametrize("write_queue", [0, 2])
+def test_compressed_csv_holds_the_plain_csv(tmp_path, compression, suffix, write_queue):
+    plain = export(tmp_path, "plain")
+    path = export(tmp_path, "packed", compression, write_queue)
+    assert path.endswith(suffix)
+    with open(plain, "rb") as f:
+        assert decompress(path, compression) == f.read()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_csv_is_reproducible(tmp_path, compression):
+    with open(export(tmp_path, "a", compression), "rb") as a, open(export(tmp_path, "b", compression), "rb") as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_append_adds_a_readable_member(tmp_path, compression):
+    dg = DataGenerator(str(tmp_path), seed=11, output=OutputConfig(compression=compression))
+    dg.export_table(CONFIG, 700)
+    path, added = DataGenerator(str(tmp_path), seed=11, output=dg.output).append_table(
+        TableConfig(CONFIG.name, CONFIG.columns, 500), 200)
+    assert added == 500
+    lines = decompress(path, compression).decode("utf-8").splitlines()
+    assert lines[0] == "event_id,name,day,amount"
+    assert len(lines) == 1 + 3_500      # one header, no line broken at the member boundary
+    assert len({line.split(",")[0] for line in lines[1:]}) == 3_500
@@ -0,0 +1,91 @@
+# tests/test_converter.py
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from typer.testing import CliRunner
+
+from file_converter.cli import app
+from file_converter.reader import iter_batches, parse_schema, read_table
+from file_converter.writer import write_table
+
+runner = CliRunner()
+
+TABLE = pa.table({
+    "id": pa.array(["0001", "0002", "0003", "0004", "0005"]),
+    "price": pa.array([1.5, 2.0, None, 4.25, 5.0]),
+    "day": pa.array([19000, 19001, 19002, None, 19004], pa.int32()).cast(pa.date32()),
+    "note": pa.array(["a", None, "c, d", "e\nf", "g"]),
+})
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet", "xlsx"])
+def test_round_trip_with_saved_schema(tmp_path, ext):
+    path = tmp_path / f"t.{ext}"
+    write_table(path, TABLE)
+    schema_path = tmp_path / "t.schema.json"
+    result = runner.invoke(app, [str(path), "-o", str(tmp_path / "out.parquet"), "--engine", "arrow",
+                                 "--schema", "id:string,price:double,day:date32,note:string",
+                                 "--save-schema", str(schema_path)])
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(tmp_path / "out.parquet").equals(TABLE)
+    assert parse_schema(str(schema_path)) == TABLE.schema
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet", "xlsx"])
+def test_partial_schema_keeps_other_columns(tmp_path, ext):
+    path = tmp_path / f"t.{ext}"
+    write_table(path, TABLE)
+    schema = parse_schema("id:string")
+
+    table = read_table(path, schema)
+    assert table.column_names == TABLE.column_names
+    assert table.column("id").to_pylist() == TABLE.column("id").to_pylist()
+
+    batches = list(iter_batches(path, 2, schema))
+    assert [b.schema.names for b in batches] == [TABLE.column_names] * 3
+    assert pa.Table.from_batches(batches).column("id").to_pylist() == TABLE.column("id").to_pylist()
+
+
+def test_schema_column_missing_from_the_file(tmp_path):
+    path = tmp_path / "t.parquet"
+    write_table(path, TABLE)
+    with pytest.raises(ValueError, match="not in the file"):
+        read_table(path, parse_schema("sku:string"))
+
+
+def test_streamed_partial_schema_writes_every_column(tmp_path):
+    path = tmp_path / "t.csv"
+    write_table(path, TABLE)
+    out = tmp_path / "out.parquet"
+    result = runner.invoke(app, [str(path), "-o", str(out), "--chunk-size", "2", "--schema", "id:string"])
+    assert result.exit_code == 0, result.output
+    table = pq.read_table(out)
+    assert table.column_names == TABLE.column_names
+    assert table.column("id").to_pylist() == ["0001", "0002", "0003", "0004", "0005"]
+
+
+def test_streamed_excel_uses_the_schema(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["a", "b"])
+    for row in [(1, 1.5), (2, 2.5), (3, 3.5), ("x", 4.5)]:
+        ws.append(row)
+    wb.save(tmp_path / "e.xlsx")
+    out = tmp_path / "e.parquet"
+
+    result = runner.invoke(app, [str(tmp_path / "e.xlsx"), "-o", str(out), "--chunk-size", "3", "--schema", "a:string"])
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(out).column("a").to_pylist() == ["1", "2", "3", "x"]
+
+    result = runner.invoke(app, [str(tmp_path / "e.xlsx"), "-o", str(out), "--chunk-size", "3", "--schema", "a:int64"])
+    assert result.exit_code == 1
+    assert not out.exists()     # no truncated output left behind
+
+
+def test_streamed_csv_keeps_string_nulls(tmp_path):
+    path = tmp_path / "t.csv"
+    write_table(path, TABLE)
+    batches = list(iter_batches(path, 2))
+    assert pa.Table.from_batches(batches).column("note").to_pylist() == TABLE.column("note").to_pylist()
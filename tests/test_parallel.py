@@ -0,0 +1,89 @@
+# tests/test_parallel.py
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.parallel import export_sharded
+from fake_data_generator.scheduler import run_schema
+from fake_data_generator.schema import ColumnConfig, OutputConfig, TableConfig
+
+
+def schema(n_orders=6_000):
+    return [
+        TableConfig("Users", [
+            ColumnConfig("user_id", "pk"),
+            ColumnConfig("name", "name", pool_size=200),
+            ColumnConfig("email", "email", pool_size=200, unique=True, nullable=True, null_prob=0.1),
+        ], 1_500),
+        TableConfig("Products", [
+            ColumnConfig("product_id", "pk", key_format="int"),
+            ColumnConfig("price", "float", float_min=1, float_max=9),
+        ], 300),
+        TableConfig("Orders", [
+            ColumnConfig("order_id", "pk"),
+            ColumnConfig("user_id", "fk", ref_table="Users", ref_column="user_id"),
+            ColumnConfig("product_id", "fk", ref_table="Products", ref_column="product_id"),
+            ColumnConfig("order_date", "date", date_start=datetime(2023, 1, 1), date_end=datetime(2023, 12, 31)),
+        ], n_orders),
+    ]
+
+
+def digest(root: Path) -> str:
+    """Hash of the output files' contents in name order (pooled datasets name their files per shard)."""
+    h = hashlib.md5()
+    for path in sorted(p for p in root.rglob("*") if p.is_file() and "manifest" not in p.name):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+OUTPUTS = {
+    "csv": OutputConfig(),
+    "parquet": OutputConfig(fmt="parquet"),
+    "dataset": OutputConfig(fmt="parquet", split_rows=700),
+    "csv.gz": OutputConfig(compression="gzip"),
+}
+
+
+@pytest.mark.parametrize("fmt", list(OUTPUTS))
+@pytest.mark.parametrize("chunk_size", [0, 500])
+def test_output_does_not_depend_on_the_worker_count(tmp_path, fmt, chunk_size):
+    digests = []
+    for workers in (0, 1, 2):
+        out = tmp_path / f"w{workers}"
+        run_schema(DataGenerator(str(out), seed=7, output=OUTPUTS[fmt]), schema(),
+                   chunk_size=chunk_size, workers=workers)
+        digests.append(digest(out))
+    assert digests[0] == digests[1] == digests[2]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_small_shards_match_in_process_and_across_workers(tmp_path, compression):
+    output = OutputConfig(compression=compression)
+    local = DataGenerator(str(tmp_path / "local"), seed=7, output=output)
+    pooled = DataGenerator(str(tmp_path / "pool"), seed=7, output=output)
+    for config in schema():
+        path, n_rows = local.write_shards(config, 250, shard_rows=1_000)
+        paths, pooled_rows = export_sharded(pooled, config, 3, shard_rows=1_000, chunk_size=250)
+        assert n_rows == pooled_rows == config.n_rows
+        assert Path(path).read_bytes() == Path(paths[0]).read_bytes()
+
+
+def test_unmerged_shards_concatenate_to_the_merged_file(tmp_path):
+    config = schema()[1]
+    merged = DataGenerator(str(tmp_path / "merged"), seed=7)
+    parts = DataGenerator(str(tmp_path / "parts"), seed=7)
+    (path,), _ = export_sharded(merged, config, 2, shard_rows=100, chunk_size=50)
+    paths, _ = export_sharded(parts, config, 2, shard_rows=100, chunk_size=50, merge=False)
+    assert len(paths) == 3
+    lines = [Path(p).read_text().splitlines() for p in paths]
+    # Every part repeats the header
+    assert Path(path).read_text().splitlines() == lines[0] + lines[1][1:] + lines[2][1:]
+
+
+def test_sqlite_output_refuses_workers(tmp_path):
+    dg = DataGenerator(str(tmp_path), seed=7, output=OutputConfig(fmt="sqlite"))
+    with pytest.raises(ValueError, match="single process"):
+        export_sharded(dg, schema()[1], 2)
@@ -0,0 +1,78 @@
+# tests/test_unique.py
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.plan import SchemaError, compile_table
+from fake_data_generator.schema import ColumnConfig, TableConfig
+from fake_data_generator.unique import permute, permute_rounds, suffix_values
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 17, 1000, 4096, 65_537])
+def test_permute_is_a_bijection(size):
+    out = permute(np.arange(size, dtype=np.uint64), size, seed=5)
+    assert sorted(out.tolist()) == list(range(size))
+
+
+def test_permute_depends_on_the_seed_only():
+    idx = np.arange(500, 600, dtype=np.uint64)
+    assert np.array_equal(permute(idx, 10_000, 1), permute(np.arange(10_000, dtype=np.uint64), 10_000, 1)[500:600])
+    assert not np.array_equal(permute(idx, 10_000, 1), permute(idx, 10_000, 2))
+
+
+def test_permute_refuses_indexes_outside_the_domain():
+    with pytest.raises(ValueError):
+        permute(np.arange(11, dtype=np.uint64), 10, seed=0)
+
+
+def test_permute_rounds_is_unique_and_independent_of_the_row_count():
+    rows = np.arange(2_500, dtype=np.uint64)
+    out = permute_rounds(rows, 1_000, seed=9)
+    assert len(set(out.tolist())) == len(out)
+    # Each round of the block maps onto itself
+    assert np.array_equal(np.sort(out[:1_000]), np.arange(1_000))
+    # Extending the row range leaves earlier rows' indexes unchanged
+    assert np.array_equal(permute_rounds(rows[:700], 1_000, seed=9), out[:700])
+
+
+def test_suffix_values_are_distinct_past_the_pool():
+    pool = np.array(["ann@example.org", "bob@example.org"], dtype=object)
+    values = suffix_values("email", pool, np.arange(6))
+    assert values.tolist() == ["ann@example.org", "bob@example.org", "ann+1@example.org",
+                               "bob+1@example.org", "ann+2@example.org", "bob+2@example.org"]
+
+
+def unique_table(n_rows):
+    return TableConfig("T", [
+        ColumnConfig("id", "pk", key_format="int"),
+        ColumnConfig("n", "number", num_min=1, num_max=5_000, unique=True),
+        ColumnConfig("d", "date", date_start=datetime(2020, 1, 1), date_end=datetime(2030, 1, 1), unique=True),
+        ColumnConfig("e", "email", pool_size=300, unique=True, nullable=True, null_prob=0.1),
+    ], n_rows)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 5_000])
+def test_unique_columns_are_unique_across_chunks(tmp_path, chunk_size):
+    config = unique_table(2_000)
+    dg = DataGenerator(str(tmp_path), seed=4)
+    batches = list(dg.iter_columns(config, chunk_size))
+    for name in ("n", "d", "e"):
+        values = [v for b in batches for v in b.to_pylist(name) if v is not None]
+        assert len(values) == len(set(values)), name
+    numbers = np.concatenate([b.columns["n"] for b in batches])
+    assert numbers.min() >= 1 and numbers.max() <= 5_000
+
+
+def test_chunking_does_not_change_unique_values(tmp_path):
+    config = unique_table(1_000)
+    whole = DataGenerator(str(tmp_path), seed=4).generate_columns(config)
+    chunked = list(DataGenerator(str(tmp_path), seed=4).iter_columns(config, 128))
+    assert whole.columns["n"].tolist() == np.concatenate([b.columns["n"] for b in chunked]).tolist()
+
+
+def test_unique_row_count_larger_than_the_domain_fails_before_generating():
+    config = TableConfig("T", [ColumnConfig("b", "boolean", unique=True)], 3)
+    with pytest.raises(SchemaError, match="only 2 distinct values"):
+        compile_table(config)
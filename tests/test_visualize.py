@@ -0,0 +1,66 @@
+# tests/test_visualize.py
+from pathlib import Path
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from fake_data_generator.generator import DataGenerator
+from fake_data_generator.schema import ColumnConfig, TableConfig
+from visualize_file.cli import app, profile_app
+from visualize_file import reader
+from visualize_file.profile import profile_file
+
+runner = CliRunner()
+
+
+def test_profile_counts_empty_csv_fields_as_nulls(tmp_path):
+    config = TableConfig("People", [
+        ColumnConfig("id", "pk"),
+        ColumnConfig("name", "name", nullable=True, null_prob=0.3, pool_size=100),
+        ColumnConfig("status", "choice", choices=["new", "paid"], nullable=True, null_prob=0.5),
+    ], 20_000)
+    path, _ = DataGenerator(str(tmp_path), seed=1).export_table(config, chunk_size=5_000)
+
+    profiles = {p.name: p for p in profile_file(Path(path))}
+    expected = pd.read_csv(path).isna().sum()
+    for name in ("name", "status"):
+        assert profiles[name].rows == 20_000
+        assert profiles[name].nulls == expected[name] > 0
+        assert profiles[name].min != ""
+    assert profiles["status"].distinct == 2
+
+
+def test_visualize_takes_a_bare_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    result = runner.invoke(app, [str(path), "--max-rows", "1"])
+    assert result.exit_code == 0, result.output
+    assert "x" in result.output and "y" not in result.output
+
+    result = runner.invoke(profile_app, [str(path), "--top", "0"])
+    assert result.exit_code == 0, result.output
+
+
+def write_multiline_csv(path, n_rows):
+    with open(path, "w", newline="") as f:
+        f.write("id,note\n")
+        f.writelines(f'{i},"line one\nline two"\n' for i in range(n_rows))
+
+
+def test_small_csv_row_count_is_exact_with_quoted_newlines(tmp_path):
+    path = tmp_path / "notes.csv"
+    write_multiline_csv(path, 2_000)
+    assert reader.count_rows(path) == (2_000, True)
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    assert reader.count_rows(empty) == (0, True)
+
+
+def test_large_csv_row_count_is_an_estimate(tmp_path, monkeypatch):
+    path = tmp_path / "notes.csv"
+    write_multiline_csv(path, 2_000)
+    monkeypatch.setattr(reader, "CSV_SAMPLE_BYTES", 4_096)
+    _, exact = reader.count_rows(path)
+    assert not exact
+    assert reader.count_rows(path, exact=True) == (2_000, True)
@@ -1,21 +1,129 @@
 import typer
 from pathlib import Path
-from .reader import read_file
-from .table import render_table
+
+# Readers (pandas, pyarrow) and rendering (rich) are imported inside the
+# commands, so --help and usage errors return at once
 
 app = typer.Typer(help="Visualize CSV, Parquet, and Excel files in terminal.")
+# Own entry point (visualize-profile), so 'visualize FILE' stays a single-command app
+profile_app = typer.Typer(help="Profile the columns of CSV, Parquet, and Excel files.")
 
 @app.command()
-def view(input_file: str, max_rows: int = 20):
+def view(
+    input_file: str,
+    max_rows: int = 20,
+    count: bool = typer.Option(False, "--count", help="Count CSV rows exactly (streams the whole file)"),
+    start: int = typer.Option(0, "--start", min=0, help="Show the page starting at this row (0-based)"),
+    pager: bool = typer.Option(False, "--pager", help="Browse the file page by page"),
+    where: str = typer.Option(None, "--where", help="Filter rows, e.g. 'price > 1000 and country == \"DE\"'"),
+    columns: str = typer.Option(None, "--columns", help="Comma-separated columns to show"),
+    sort: str = typer.Option(None, "--sort", help="Show the first rows ordered by this column"),
+    desc: bool = typer.Option(False, "--desc", help="Sort descending"),
+):
     """Visualize a file in table form (first max_rows rows)."""
+    from .reader import count_rows, read_head
+    from .table import render_table
+
     path = Path(input_file)
     if not path.exists():
         typer.echo(f"❌ File not found: {input_file}")
         raise typer.Exit(1)
 
+    query = where or columns or sort
+    if query and (pager or start):
+        typer.echo("❌ --where/--columns/--sort cannot be combined with --pager/--start.")
+        raise typer.Exit(1)
+
     try:
-        df = read_file(path)
-        render_table(df, max_rows=max_rows)
+        if query:
+            show_query(path, max_rows, where, columns, sort, desc)
+            return
+        if pager or start:
+            browse(path, max_rows, start, interactive=pager)
+            return
+        # Only the displayed rows are read; the total comes from metadata or a sample
+        df = read_head(path, max_rows)
+        total_rows, exact = count_rows(path, exact=count)
+        if len(df) < max_rows:
+            total_rows, exact = len(df), True
+        render_table(df, max_rows=max_rows, total_rows=total_rows, exact=exact)
     except Exception as e:
         typer.echo(f"❌ Error reading file: {e}")
         raise typer.Exit(1)
+
+def show_query(path: Path, max_rows: int, where: str, columns: str, sort: str, desc: bool):
+    """Filtered/projected/sorted preview with the work pushed down to the scan."""
+    from .query import run_query
+    from .table import console, render_table
+
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    result = run_query(path, where=where, columns=selected, sort=sort, descending=desc, limit=max_rows)
+    df = result.table.to_pandas()
+    if result.matched is None:
+        render_table(df, max_rows=max_rows)
+        console.print("... more matching rows not shown", style="dim")
+    else:
+        render_table(df, max_rows=max_rows, total_rows=result.matched)
+
+def browse(path: Path, page_size: int, start: int, interactive: bool):
+    """Show the page at start; with interactive, keep paging until the user quits."""
+    from .pager import open_pages
+    from .table import console, render_table
+
+    source = open_pages(path)
+    try:
+        while True:
+            start = max(0, min(start, max(source.n_rows - 1, 0)))
+            df = source.read_rows(start, page_size)
+            render_table(df, max_rows=page_size, first_row=start)
+            console.print(f"Rows {start + 1}-{start + len(df)} of {source.n_rows}", style="dim")
+            if not interactive:
+                return
+            choice = input("[n]ext, [p]rev, [g]oto row, [q]uit: ").strip().lower()
+            if choice in ("q", "quit"):
+                return
+            elif choice in ("", "n"):
+                if start + page_size < source.n_rows:
+                    start += page_size
+            elif choice == "p":
+                start -= page_size
+            elif choice.startswith("g"):
+                target = choice[1:].strip() or input("Row number: ").strip()
+                if target.replace("_", "").isdigit():
+                    start = int(target.replace("_", "")) - 1
+                else:
+                    print("❌ Enter a row number.")
+            else:
+                print("❌ Unknown command.")
+    finally:
+        source.close()
+
+@profile_app.command()
+def profile(
+    input_file: str,
+    columns: str = typer.Option(None, "--columns", help="Comma-separated columns to profile"),
+    top: int = typer.Option(5, "--top", min=0, help="Number of most frequent values to show"),
+    quantiles: str = typer.Option("0.05,0.5,0.95", "--quantiles", help="Comma-separated quantiles"),
+    footer_only: bool = typer.Option(
+        False, "--footer-only", help="Parquet: report footer statistics only, without scanning"
+    ),
+):
+    """Profile every column in one streaming pass (nulls, min/max, mean, distinct, quantiles, top values)."""
+    from .profile import profile_file
+    from .table import render_profile
+
+    path = Path(input_file)
+    if not path.exists():
+        typer.echo(f"❌ File not found: {input_file}")
+        raise typer.Exit(1)
+
+    try:
+        qs = [float(q) for q in quantiles.split(",") if q.strip()]
+        if any(not 0.0 <= q <= 1.0 for q in qs):
+            raise ValueError("Quantiles must be between 0 and 1")
+        selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+        profiles = profile_file(path, columns=selected, quantiles=qs, top=top, footer_only=footer_only)
+        render_profile(profiles, path.name)
+    except Exception as e:
+        typer.echo(f"❌ Error profiling file: {e}")
+        raise typer.Exit(1)
@@ -0,0 +1,228 @@
+# visualize_file/pager.py
+"""
+Random-access paging over large files.
+
+CSV files get a sparse row offset index: the byte offset of every
+INDEX_STRIDE-th data row, built in one vectorised pass over a memory-mapped
+file (newlines inside quoted fields are not row breaks) and persisted next
+to the file as '<file>.rowidx.npz'. The index is rebuilt when the file's
+size or mtime changes. A page is read by jumping to the nearest indexed
+offset, skipping at most INDEX_STRIDE rows, and parsing only the page's bytes.
+
+Parquet pages are located from row-group metadata, so only the row group(s)
+holding the page are read.
+"""
+
+import io
+import mmap
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+INDEX_STRIDE = 10_000          # rows between indexed offsets
+SCAN_BYTES = 8 << 20           # bytes scanned per step while indexing
+INDEX_SUFFIX = ".rowidx.npz"
+
+
+# ---- CSV row offset index
+
+def _row_starts(buf: np.ndarray, base: int, quoted: bool):
+    """
+    Byte offsets (base-relative to the file) of the rows starting after each
+    unquoted newline in buf. quoted says whether buf starts inside a quoted
+    field. Returns (offsets, quoted state at the end of buf).
+    """
+    newlines = buf == 10
+    quotes = buf == 34
+    if quotes.any():
+        # Escaped quotes ("") come in pairs, so quote-count parity tells
+        # whether a byte sits inside a quoted field (uint8 wraps but keeps parity)
+        parity = np.cumsum(quotes, dtype=np.uint8) & 1
+        if quoted:
+            parity ^= 1
+        newlines &= parity == 0
+        quoted = bool(parity[-1])
+    return np.flatnonzero(newlines) + base + 1, quoted
+
+
+class RowIndex:
+    """Sparse byte offsets of CSV data rows (every stride-th row)."""
+
+    def __init__(self, offsets: np.ndarray, n_rows: int, header_end: int,
+                 size: int, mtime_ns: int, stride: int = INDEX_STRIDE):
+        self.offsets = offsets
+        self.n_rows = n_rows
+        self.header_end = header_end
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.stride = stride
+
+    @staticmethod
+    def path_for(file_path: Path) -> Path:
+        return file_path.with_name(file_path.name + INDEX_SUFFIX)
+
+    def matches(self, file_path: Path) -> bool:
+        st = file_path.stat()
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    @classmethod
+    def build(cls, file_path: Path, stride: int = INDEX_STRIDE) -> "RowIndex":
+        """Scan the file once and record the offset of every stride-th data row."""
+        st = file_path.stat()
+        size = st.st_size
+        offsets = [np.empty(0, dtype=np.int64)]
+        n_rows = 0
+        if size:
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                quoted = False
+                for pos in range(0, size, SCAN_BYTES):
+                    count = min(SCAN_BYTES, size - pos)
+                    buf = np.frombuffer(mm, dtype=np.uint8, count=count, offset=pos)
+                    starts, quoted = _row_starts(buf, pos, quoted)
+                    del buf     # release the export before the mmap closes
+                    # Data row i starts after the (i+1)-th row break; none after the final newline
+                    starts = starts[starts < size]
+                    offsets.append(starts[(-n_rows) % stride::stride])
+                    n_rows += len(starts)
+        offsets = np.concatenate(offsets).astype(np.int64)
+        header_end = int(offsets[0]) if n_rows else size
+        return cls(offsets, n_rows, header_end, size, st.st_mtime_ns, stride)
+
+    def save(self, file_path: Path):
+        meta = np.array([self.n_rows, self.header_end, self.size, self.mtime_ns, self.stride], dtype=np.int64)
+        with open(self.path_for(file_path), "wb") as f:
+            np.savez(f, offsets=self.offsets, meta=meta)
+
+    @classmethod
+    def load(cls, file_path: Path) -> Optional["RowIndex"]:
+        index_path = cls.path_for(file_path)
+        if not index_path.exists():
+            return None
+        try:
+            with np.load(index_path) as data:
+                n_rows, header_end, size, mtime_ns, stride = (int(v) for v in data["meta"])
+                return cls(data["offsets"], n_rows, header_end, size, mtime_ns, stride)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def open(cls, file_path: Path) -> "RowIndex":
+        """Load the persisted index, rebuilding (and re-saving) it if it is missing or stale."""
+        index = cls.load(file_path)
+        if index is None or not index.matches(file_path):
+            index = cls.build(file_path)
+            try:
+                index.save(file_path)
+            except OSError:
+                pass    # read-only location: keep the index in memory only
+        return index
+
+
+# ---- page sources
+
+class PageSource:
+    """Random access to pages of rows of a file."""
+
+    n_rows: int = 0
+
+    def read_rows(self, start: int, n: int) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvPageSource(PageSource):
+    def __init__(self, file_path: Path):
+        self.index = RowIndex.open(file_path)
+        self.n_rows = self.index.n_rows
+        self._file = open(file_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.index.size else None
+
+    def _row_offset(self, base: int, skip: int) -> int:
+        """Offset of the row `skip` rows after the row starting at base."""
+        pos, quoted = base, False
+        window = 1 << 20
+        while skip and pos < self.index.size:
+            count = min(window, self.index.size - pos)
+            starts, quoted = _row_starts(np.frombuffer(self._mm, dtype=np.uint8, count=count, offset=pos), pos, quoted)
+            if len(starts) >= skip:
+                return int(starts[skip - 1])
+            skip -= len(starts)
+            pos += count
+        return pos
+
+    def read_rows(self, start, n):
+        if start >= self.n_rows or n <= 0:
+            return pd.DataFrame()
+        n = min(n, self.n_rows - start)
+        k = start // self.index.stride
+        begin = self._row_offset(int(self.index.offsets[k]), start - k * self.index.stride)
+        end = self._row_offset(begin, n)
+        data = self._mm[:self.index.header_end] + self._mm[begin:end]
+        return pd.read_csv(io.BytesIO(data))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+
+class ParquetPageSource(PageSource):
+    def __init__(self, file_path: Path):
+        import pyarrow.parquet as pq
+
+        self._pf = pq.ParquetFile(file_path)
+        sizes = [self._pf.metadata.row_group(i).num_rows for i in range(self._pf.num_row_groups)]
+        self._starts = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        self.n_rows = int(self._starts[-1])
+
+    def read_rows(self, start, n):
+        import pyarrow as pa
+
+        if start >= self.n_rows or n <= 0:
+            return self._pf.schema_arrow.empty_table().to_pandas()
+        end = min(start + n, self.n_rows)
+        first = int(np.searchsorted(self._starts, start, side="right")) - 1
+        last = int(np.searchsorted(self._starts, end, side="left")) - 1
+        table = pa.concat_tables(self._pf.read_row_group(i) for i in range(first, last + 1))
+        return table.slice(start - int(self._starts[first]), end - start).to_pandas()
+
+
+class ExcelPageSource(PageSource):
+    """XLSX pages via openpyxl read-only mode (the sheet is still parsed sequentially)."""
+
+    def __init__(self, file_path: Path):
+        from openpyxl import load_workbook
+
+        self._path = file_path
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            self.n_rows = max((wb.active.max_row or 1) - 1, 0)
+        finally:
+            wb.close()
+
+    def read_rows(self, start, n):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(self._path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            header = [str(h) for h in next(ws.iter_rows(max_row=1, values_only=True), ())]
+            rows = list(ws.iter_rows(min_row=start + 2, max_row=start + 1 + n, values_only=True))
+        finally:
+            wb.close()
+        return pd.DataFrame(rows, columns=header)
+
+
+def open_pages(file_path: Path) -> PageSource:
+    ext = file_path.suffix.lower().replace(".", "")
+    if ext == "csv":
+        return CsvPageSource(file_path)
+    elif ext == "parquet":
+        return ParquetPageSource(file_path)
+    elif ext == "xlsx":
+        return ExcelPageSource(file_path)
+    raise ValueError(f"Paging is not supported for .{ext} files")
@@ -0,0 +1,202 @@
+# visualize_file/profile.py
+"""
+One-pass, fixed-memory column profiler.
+
+profile_file() streams a file batch by batch and keeps per column:
+- null count, min/max and mean (running aggregates);
+- approximate distinct count (HyperLogLog);
+- approximate quantiles (KLL) for numeric and date/time columns;
+- top-k frequent values (Misra-Gries) for non-float columns.
+
+Memory does not grow with the file. For Parquet, the row count, null
+counts and min/max come from the footer statistics when every row group
+has them, and are not recomputed.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .reader import _check_format, iter_batches
+from .sketches import FrequentItems, HyperLogLog, KLLSketch
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    type: str
+    rows: int = 0
+    nulls: int = 0
+    min: object = None
+    max: object = None
+    mean: Optional[float] = None
+    distinct: Optional[int] = None
+    quantiles: Dict[float, object] = field(default_factory=dict)
+    top: List[Tuple[object, int]] = field(default_factory=list)
+    top_error: int = 0              # top counts may be low by up to this much
+    from_footer: bool = False       # rows/nulls/min/max were read from Parquet statistics
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.rows if self.rows else 0.0
+
+
+def _is_temporal(t: pa.DataType) -> bool:
+    return pa.types.is_date(t) or pa.types.is_timestamp(t) or pa.types.is_time(t)
+
+
+def _as_int(array: pa.Array) -> pa.Array:
+    """Temporal values as their integer storage (days, or units since the epoch)."""
+    return array.cast(pa.int32() if pa.types.is_date32(array.type) or pa.types.is_time32(array.type)
+                      else pa.int64())
+
+
+def _from_int(values: Sequence[float], t: pa.DataType) -> list:
+    storage = pa.int32() if pa.types.is_date32(t) or pa.types.is_time32(t) else pa.int64()
+    return pa.array(np.round(values).astype(np.int64)).cast(storage).cast(t).to_pylist()
+
+
+class _ColumnProfiler:
+    def __init__(self, name: str, arrow_type: pa.DataType, top: int, footer: Optional[dict]):
+        self.profile = ColumnProfile(name, str(arrow_type))
+        self.type = arrow_type
+        self.numeric = pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) \
+            or pa.types.is_decimal(arrow_type)
+        self.temporal = _is_temporal(arrow_type)
+        self.footer = footer
+        self.total = 0.0
+        self.hll = HyperLogLog()
+        self.kll = KLLSketch() if self.numeric or self.temporal else None
+        self.frequent = FrequentItems() if top and not pa.types.is_floating(arrow_type) else None
+
+    def update(self, array: pa.Array):
+        p = self.profile
+        if self.footer is None:
+            p.rows += len(array)
+            p.nulls += array.null_count
+            if not pa.types.is_null(array.type):
+                bounds = pc.min_max(array)
+                lo, hi = bounds["min"].as_py(), bounds["max"].as_py()
+                if lo is not None:
+                    p.min = lo if p.min is None else min(p.min, lo)
+                    p.max = hi if p.max is None else max(p.max, hi)
+        values = array.drop_null()
+        if not len(values):
+            return
+        if self.numeric:
+            self.total += pc.sum(values.cast(pa.float64())).as_py()
+        elif pa.types.is_boolean(self.type):
+            self.total += pc.sum(values.cast(pa.int64())).as_py()
+        if self.kll is not None:
+            self.kll.update(self._numbers(values))
+        if self.frequent is not None:
+            counts = pc.value_counts(values)
+            distinct = counts.field("values")
+            self.frequent.update(distinct.to_numpy(zero_copy_only=False), counts.field("counts").to_numpy())
+            # Hashing the batch's distinct values is enough for the HLL
+            self.hll.update(self._hashable(distinct))
+        else:
+            self.hll.update(self._hashable(values))
+
+    def _numbers(self, values: pa.Array) -> np.ndarray:
+        if self.temporal:
+            values = _as_int(values)
+        return values.cast(pa.float64()).to_numpy()
+
+    def _hashable(self, values: pa.Array) -> np.ndarray:
+        if self.temporal:
+            values = _as_int(values)
+        elif pa.types.is_boolean(values.type):
+            values = values.cast(pa.uint8())
+        return values.to_numpy(zero_copy_only=False)
+
+    def result(self, quantiles: Sequence[float], top: int) -> ColumnProfile:
+        p = self.profile
+        if self.footer is not None:
+            p.rows, p.nulls, p.min, p.max = (self.footer[k] for k in ("rows", "nulls", "min", "max"))
+            p.from_footer = True
+        non_null = self.kll.n if self.kll is not None else None
+        p.distinct = self.hll.count()
+        if self.numeric or pa.types.is_boolean(self.type):
+            count = p.rows - p.nulls
+            p.mean = self.total / count if count else None
+        if self.kll is not None and non_null:
+            qs = self.kll.quantiles(quantiles)
+            p.quantiles = dict(zip(quantiles, _from_int(qs, self.type) if self.temporal else qs))
+        if self.frequent is not None:
+            p.top = self.frequent.top(top)
+            p.top_error = self.frequent.error
+        return p
+
+
+def footer_stats(file_path: Path) -> Dict[str, dict]:
+    """
+    Row count, null count and min/max per column from Parquet footer
+    statistics. Columns whose row groups lack complete statistics are left out.
+    """
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(file_path).metadata
+    stats: Dict[str, dict] = {}
+    for i in range(metadata.num_columns):
+        name = metadata.schema.column(i).path
+        if "." in name:
+            continue    # nested column: no top-level answer
+        entry = {"rows": metadata.num_rows, "nulls": 0, "min": None, "max": None}
+        for g in range(metadata.num_row_groups):
+            st = metadata.row_group(g).column(i).statistics
+            if st is None or not st.has_null_count:
+                entry = None
+                break
+            entry["nulls"] += st.null_count
+            if st.has_min_max:
+                entry["min"] = st.min if entry["min"] is None else min(entry["min"], st.min)
+                entry["max"] = st.max if entry["max"] is None else max(entry["max"], st.max)
+            elif st.null_count != metadata.row_group(g).num_rows:
+                entry = None
+                break
+        if entry is not None:
+            stats[name] = entry
+    return stats
+
+
+def profile_file(file_path: Path, columns: Optional[List[str]] = None,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES, top: int = 5,
+                 footer_only: bool = False) -> List[ColumnProfile]:
+    """
+    Profile the columns of a file in a single streaming pass. With
+    footer_only (Parquet), return only what the footer statistics answer
+    without scanning the data.
+    """
+    ext = _check_format(file_path)
+    footer = footer_stats(file_path) if ext == "parquet" else {}
+
+    if footer_only:
+        if ext != "parquet":
+            raise ValueError("Footer statistics are only available for Parquet files")
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(file_path)
+        return [
+            ColumnProfile(f.name, str(f.type), from_footer=True, **footer[f.name])
+            for f in schema if f.name in footer and (not columns or f.name in columns)
+        ]
+
+    profilers: Optional[Dict[str, _ColumnProfiler]] = None
+    for batch in iter_batches(file_path, columns=columns):
+        if profilers is None:
+            profilers = {
+                f.name: _ColumnProfiler(f.name, f.type, top, footer.get(f.name))
+                for f in batch.schema
+            }
+        for name, profiler in profilers.items():
+            profiler.update(batch.column(name))
+    if profilers is None:
+        return []
+    return [p.result(quantiles, top) for p in profilers.values()]
@@ -0,0 +1,226 @@
+# visualize_file/query.py
+"""
+Filtered, projected and sorted previews that never load the whole file.
+
+--where is parsed into an Arrow compute expression and handed to an Arrow
+dataset scan together with the column selection. For Parquet, the filter
+prunes row groups by their min/max statistics and only the selected
+columns are decoded. CSV is filtered batch by batch while it is streamed.
+
+Without --sort the scan stops as soon as the page is full. With --sort
+each batch is reduced to its own top k rows (pyarrow's select_k, a bounded
+heap) and merged into the running top k. Only the k displayed rows are
+ever materialised.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .reader import read_file
+
+DATASET_FORMATS = {"csv": "csv", "parquet": "parquet"}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+      | (?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>>=|<=|==|!=|=|>|<|\(|\)|,)
+      | (?P<word>[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+_COMPARISONS = {
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    "==": lambda a, b: a == b, "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+
+
+# ---- --where parsing
+
+def _tokenize(text: str) -> List[tuple]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise ValueError(f"Unexpected input in filter at: '{text[pos:].strip()}'")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser for filters such as
+    price > 1000 and (country == "DE" or country in ("FR", "IT")) and not discount is null
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.columns: List[str] = []
+
+    def peek(self, kind=None, value=None) -> bool:
+        if self.pos >= len(self.tokens):
+            return False
+        k, v = self.tokens[self.pos]
+        if kind and k != kind:
+            return False
+        return value is None or (v.lower() if k == "word" else v) == value
+
+    def take(self, kind=None, value=None) -> str:
+        if not self.peek(kind, value):
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "end of filter"
+            raise ValueError(f"Expected {value or kind} in filter, found '{found}'")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def parse(self) -> pc.Expression:
+        expr = self.or_expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.pos][1]}' in filter")
+        return expr
+
+    def or_expr(self):
+        expr = self.and_expr()
+        while self.peek("word", "or"):
+            self.take()
+            expr = expr | self.and_expr()
+        return expr
+
+    def and_expr(self):
+        expr = self.not_expr()
+        while self.peek("word", "and"):
+            self.take()
+            expr = expr & self.not_expr()
+        return expr
+
+    def not_expr(self):
+        if self.peek("word", "not"):
+            self.take()
+            return ~self.not_expr()
+        if self.peek("op", "("):
+            self.take()
+            expr = self.or_expr()
+            self.take("op", ")")
+            return expr
+        return self.comparison()
+
+    def value(self):
+        if self.peek("num"):
+            text = self.take()
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if self.peek("str"):
+            return re.sub(r"\\(.)", r"\1", self.take()[1:-1])
+        if self.peek("word", "true") or self.peek("word", "false"):
+            return self.take().lower() == "true"
+        raise ValueError("Expected a number, quoted string, true or false in filter")
+
+    def comparison(self):
+        name = self.take("word")
+        self.columns.append(name)
+        field = pc.field(name)
+        if self.peek("word", "is"):
+            self.take()
+            negate = self.peek("word", "not")
+            if negate:
+                self.take()
+            self.take("word", "null")
+            return field.is_valid() if negate else field.is_null()
+        if self.peek("word", "in"):
+            self.take()
+            self.take("op", "(")
+            values = [self.value()]
+            while self.peek("op", ","):
+                self.take()
+                values.append(self.value())
+            self.take("op", ")")
+            return field.isin(values)
+        op = self.take("op")
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unknown comparison '{op}' in filter")
+        return _COMPARISONS[op](field, self.value())
+
+
+def parse_where(text: str) -> pc.Expression:
+    """Parse a --where filter into an Arrow compute expression."""
+    return _Parser(text).parse()
+
+
+def where_columns(text: str) -> List[str]:
+    """Column names referenced by a --where filter."""
+    parser = _Parser(text)
+    parser.parse()
+    return parser.columns
+
+
+# ---- scans
+
+@dataclass
+class QueryResult:
+    table: pa.Table
+    matched: Optional[int]      # total matching rows, None when the scan stopped early
+    more: bool = False          # True when rows beyond the page exist
+
+
+def _dataset(file_path: Path) -> ds.Dataset:
+    ext = file_path.suffix.lower().replace(".", "")
+    if ext in DATASET_FORMATS:
+        return ds.dataset(file_path, format=DATASET_FORMATS[ext])
+    # Excel has no streaming scan; load it once and query it in memory
+    return ds.dataset(pa.Table.from_pandas(read_file(file_path), preserve_index=False))
+
+
+def run_query(file_path: Path, where: Optional[str] = None, columns: Optional[List[str]] = None,
+              sort: Optional[str] = None, descending: bool = False, limit: int = 20) -> QueryResult:
+    """
+    Scan a file with the filter and projection pushed down, returning at
+    most limit rows (the top limit by sort when it is given).
+    """
+    dataset = _dataset(file_path)
+    names = dataset.schema.names
+    wanted = list(columns) if columns else list(names)
+    referenced = wanted + ([sort] if sort else []) + (where_columns(where) if where else [])
+    missing = [c for c in dict.fromkeys(referenced) if c not in names]
+    if missing:
+        raise ValueError(f"Unknown column(s): {', '.join(missing)}. Available: {', '.join(names)}")
+
+    projection = wanted + ([sort] if sort and sort not in wanted else [])
+    scanner = dataset.scanner(columns=projection, filter=parse_where(where) if where else None)
+
+    if not sort:
+        batches, n = [], 0
+        for batch in scanner.to_batches():
+            batches.append(batch)
+            n += batch.num_rows
+            if n > limit:
+                table = pa.Table.from_batches(batches, scanner.projected_schema)
+                return QueryResult(table.slice(0, limit), matched=None, more=True)
+        table = pa.Table.from_batches(batches, scanner.projected_schema)
+        return QueryResult(table, matched=table.num_rows)
+
+    order = "descending" if descending else "ascending"
+    top: Optional[pa.Table] = None
+    matched = 0
+    for batch in scanner.to_batches():
+        if not batch.num_rows:
+            continue
+        matched += batch.num_rows
+        candidates = pa.Table.from_batches([batch])
+        if top is not None:
+            candidates = pa.concat_tables([top, candidates])
+        idx = pc.select_k_unstable(candidates, k=limit, sort_keys=[(sort, order)])
+        top = candidates.take(idx)
+    if top is None:
+        top = scanner.projected_schema.empty_table()
+    else:
+        # select_k leaves ties in arbitrary order; sort the final k rows
+        top = top.sort_by([(sort, order)])
+    return QueryResult(top.select(wanted), matched=matched, more=matched > top.num_rows)
@@ -1,15 +1,146 @@
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 import pandas as pd
 
+if TYPE_CHECKING:
+    import pyarrow as pa    # imported where used
+
 SUPPORTED_FORMATS = ["csv", "parquet", "xlsx", "xls"]
+CSV_SAMPLE_BYTES = 1 << 20   # bytes sampled to estimate a CSV row count
 
-def read_file(file_path: Path) -> pd.DataFrame:
+def _check_format(file_path: Path) -> str:
     ext = file_path.suffix.lower().replace(".", "")
     if ext not in SUPPORTED_FORMATS:
         raise ValueError(f"Unsupported format: {ext}")
+    return ext
+
+def read_file(file_path: Path) -> pd.DataFrame:
+    ext = _check_format(file_path)
     if ext == "csv":
         return pd.read_csv(file_path)
     elif ext == "parquet":
         return pd.read_parquet(file_path)
     else:
         return pd.read_excel(file_path)
+
+def read_head(file_path: Path, n_rows: int) -> pd.DataFrame:
+    """
+    Read only the first n_rows rows of a file.
+    CSV stops parsing after n_rows, Parquet reads from the first row
+    group(s) only, and XLSX is read in read-only (streaming) mode.
+    """
+    ext = _check_format(file_path)
+    if ext == "csv":
+        return pd.read_csv(file_path, nrows=n_rows)
+    elif ext == "parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(file_path)
+        batch = next(pf.iter_batches(batch_size=max(n_rows, 1)), None)
+        if batch is None:
+            return pf.schema_arrow.empty_table().to_pandas()
+        return batch.slice(0, n_rows).to_pandas()
+    elif ext == "xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h) for h in next(rows, ())]
+            data = [row for _, row in zip(range(n_rows), rows)]
+        finally:
+            wb.close()
+        return pd.DataFrame(data, columns=header)
+    else:
+        return pd.read_excel(file_path, nrows=n_rows)
+
+def _estimate_csv_rows(file_path: Path) -> Tuple[int, bool]:
+    """
+    Estimate the data row count from the line density of the first
+    CSV_SAMPLE_BYTES. A file no larger than the sample is counted exactly
+    with the CSV parser (lines are not rows when quoted fields hold newlines).
+    """
+    size = file_path.stat().st_size
+    if size <= CSV_SAMPLE_BYTES:
+        return (_count_csv_rows(file_path) if size else 0), True
+    with open(file_path, "rb") as f:
+        sample = f.read(CSV_SAMPLE_BYTES)
+    lines = sample.count(b"\n") + (0 if sample.endswith(b"\n") else 1)
+    return max(round(size * lines / len(sample)) - 1, 0), False
+
+def _count_csv_rows(file_path: Path) -> int:
+    """Exact data row count in one streaming pass (quoted newlines handled)."""
+    import pyarrow.csv as pacsv
+
+    return sum(batch.num_rows for batch in pacsv.open_csv(file_path))
+
+def count_rows(file_path: Path, exact: bool = False) -> Tuple[Optional[int], bool]:
+    """
+    Total number of data rows without loading the file.
+    Returns (count, is_exact). Parquet reads the footer metadata, XLSX the
+    sheet dimensions; CSV is estimated from a sample unless exact is set,
+    in which case the file is counted in a streaming pass.
+    """
+    ext = _check_format(file_path)
+    if ext == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(file_path).metadata.num_rows, True
+    elif ext == "csv":
+        if exact:
+            return _count_csv_rows(file_path), True
+        return _estimate_csv_rows(file_path)
+    elif ext == "xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            max_row = wb.active.max_row
+        finally:
+            wb.close()
+        return (max(max_row - 1, 0), True) if max_row is not None else (None, False)
+    return None, False
+
+def iter_batches(file_path: Path, columns: Optional[List[str]] = None,
+                 batch_size: int = 65_536) -> Iterator["pa.RecordBatch"]:
+    """
+    Stream a file as Arrow record batches (only the given columns if set).
+    CSV uses Arrow's incremental reader, Parquet reads batch by batch, and
+    XLSX is read in read-only mode.
+    """
+    import pyarrow as pa
+
+    ext = _check_format(file_path)
+    if ext == "csv":
+        import pyarrow.csv as pacsv
+
+        # Empty fields are nulls in string columns too, as pandas reads them
+        convert_options = pacsv.ConvertOptions(include_columns=columns, strings_can_be_null=True)
+        reader = pacsv.open_csv(file_path, convert_options=convert_options)
+        yield from reader
+    elif ext == "parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(file_path).iter_batches(batch_size=batch_size, columns=columns)
+    elif ext == "xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h) for h in next(rows, ())]
+            wanted = [i for i, h in enumerate(header) if columns is None or h in columns]
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == batch_size:
+                    yield pa.RecordBatch.from_arrays([pa.array([r[i] for r in chunk]) for i in wanted],
+                                                     names=[header[i] for i in wanted])
+                    chunk = []
+            if chunk:
+                yield pa.RecordBatch.from_arrays([pa.array([r[i] for r in chunk]) for i in wanted],
+                                                 names=[header[i] for i in wanted])
+        finally:
+            wb.close()
+    else:
+        yield pa.RecordBatch.from_pandas(read_file(file_path), preserve_index=False)
@@ -0,0 +1,142 @@
+# visualize_file/sketches.py
+"""
+Fixed-memory streaming sketches used by the column profiler.
+
+All three consume NumPy arrays a batch at a time:
+- HyperLogLog: approximate distinct count (2**p one-byte registers).
+- KLLSketch: approximate quantiles with O(k) retained items.
+- FrequentItems: Misra-Gries heavy hitters with a fixed number of counters.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def hash_values(values: np.ndarray) -> np.ndarray:
+    """64-bit hashes of an array of values (strings, numbers or objects)."""
+    return pd.util.hash_array(values, categorize=False)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter (about 1.04 / sqrt(2**p) relative error)."""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values: np.ndarray):
+        if not len(values):
+            return
+        h = hash_values(values)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = (h << np.uint64(self.p)) & _MASK64
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest > 0
+        bit_length[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = np.minimum(64 - bit_length + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)     # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch. Level h holds items of weight 2**h, and capacities
+    shrink geometrically towards the lower levels. When the sketch is full,
+    the lowest full level is sorted and every other item (random offset) is
+    promoted to the next level. Rank error is about 1.7 / k.
+    """
+
+    def __init__(self, k: int = 400, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compact(self, level: int):
+        buf = np.sort(self.levels[level])
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        even = len(buf) - len(buf) % 2
+        offset = int(self._rng.integers(0, 2))
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], buf[offset:even:2]])
+        self.levels[level] = buf[even:]
+
+    def update(self, values: np.ndarray):
+        if not len(values):
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        # Lazy compaction: only while the sketch as a whole is over capacity,
+        # and then only the lowest full level
+        while sum(map(len, self.levels)) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h in range(len(self.levels)) if len(self.levels[h]) >= self._capacity(h))
+            self._compact(level)
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        if not self.n:
+            return [math.nan] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(buf), 2.0 ** h) for h, buf in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs) * cumulative[-1]
+        idx = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[idx].tolist()
+
+
+class FrequentItems:
+    """
+    Misra-Gries frequent items with a fixed number of counters. Counts are
+    lower bounds; error is the most any count can be under (at most
+    n / (capacity + 1)), so only items counted above it are reported.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.counters: Dict[object, int] = {}
+        self.error = 0
+
+    def _reduce(self, values: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep at most capacity counters: subtract the (capacity+1)-th largest count from all."""
+        if len(counts) <= self.capacity:
+            return values, counts
+        threshold = np.partition(counts, -(self.capacity + 1))[-(self.capacity + 1)]
+        self.error += int(threshold)
+        keep = counts > threshold
+        return values[keep], counts[keep] - threshold
+
+    def update(self, values: np.ndarray, counts: np.ndarray):
+        """Add a batch of (distinct value, count) pairs, e.g. from a value_counts."""
+        values, counts = self._reduce(np.asarray(values, dtype=object), np.asarray(counts, dtype=np.int64))
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.counters[value] = self.counters.get(value, 0) + count
+        if len(self.counters) > self.capacity:
+            merged, merged_counts = self._reduce(
+                np.array(list(self.counters), dtype=object),
+                np.fromiter(self.counters.values(), dtype=np.int64, count=len(self.counters)),
+            )
+            self.counters = dict(zip(merged.tolist(), merged_counts.tolist()))
+
+    def top(self, n: int) -> List[Tuple[object, int]]:
+        """The n most frequent items whose frequency is certain to exceed the error bound."""
+        items = [(v, c) for v, c in self.counters.items() if c > self.error]
+        return sorted(items, key=lambda kv: -kv[1])[:n]
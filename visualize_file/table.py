@@ -1,19 +1,73 @@
+from typing import Optional
 from rich.console import Console
 from rich.table import Table
 import pandas as pd
 
 console = Console()
 
-def render_table(df: pd.DataFrame, max_rows: int = 20):
-    """Render DataFrame as a terminal table (first max_rows)."""
+def render_table(df: pd.DataFrame, max_rows: int = 20, total_rows: Optional[int] = None,
+                 exact: bool = True, first_row: Optional[int] = None):
+    """
+    Render DataFrame as a terminal table (first max_rows).
+    total_rows is the row count of the whole file when df is only its head
+    (defaults to len(df)); exact=False marks it as an estimate.
+    With first_row, df is a page starting at that row: rows are numbered
+    and no footer is printed.
+    """
     table = Table(show_header=True, header_style="bold magenta")
+    if first_row is not None:
+        table.add_column("#", style="dim", justify="right")
     for col in df.columns:
         table.add_column(str(col))
 
-    for _, row in df.head(max_rows).iterrows():
-        table.add_row(*[str(v) for v in row.values])
+    for i, row in enumerate(df.head(max_rows).itertuples(index=False)):
+        cells = [str(v) for v in row]
+        if first_row is not None:
+            cells.insert(0, str(first_row + i + 1))
+        table.add_row(*cells)
 
     console.print(table)
+    if first_row is not None:
+        return
 
-    if len(df) > max_rows:
-        console.print(f"... {len(df) - max_rows} more rows not shown", style="dim")
+    if total_rows is None:
+        total_rows = len(df)
+    if total_rows > max_rows:
+        if exact:
+            console.print(f"... {total_rows - max_rows} more rows not shown", style="dim")
+        else:
+            console.print(f"... ~{total_rows - max_rows} more rows not shown (estimated, use --count)",
+                          style="dim")
+
+def _fmt(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+def render_profile(profiles, file_name: str = ""):
+    """Render column profiles (see visualize_file.profile) as terminal tables."""
+    table = Table(show_header=True, header_style="bold magenta", title=file_name or None)
+    for col in ["column", "type", "null %", "min", "max", "mean", "distinct≈", "quantiles≈"]:
+        table.add_column(col)
+    for p in profiles:
+        quantiles = "\n".join(f"p{q * 100:g} {_fmt(v)}" for q, v in p.quantiles.items())
+        table.add_row(p.name, p.type, f"{p.null_rate * 100:.2f}", _fmt(p.min), _fmt(p.max),
+                      _fmt(p.mean), _fmt(p.distinct), quantiles)
+    console.print(table)
+
+    rows = profiles[0].rows if profiles else 0
+    note = " (rows, nulls, min/max from Parquet footer)" if any(p.from_footer for p in profiles) else ""
+    console.print(f"{rows} rows{note}", style="dim")
+
+    if any(p.top for p in profiles):
+        top = Table(show_header=True, header_style="bold magenta", title="Most frequent values")
+        for col in ["column", "value", "count", "share %"]:
+            top.add_column(col)
+        for p in profiles:
+            for value, count in p.top:
+                error = f" (+≤{p.top_error})" if p.top_error else ""
+                share = count / (p.rows - p.nulls) * 100 if p.rows > p.nulls else 0.0
+                top.add_row(p.name, _fmt(value), f"{count}{error}", f"{share:.2f}")
+        console.print(top)